@@ -1,11 +1,46 @@
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
+import math
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+from cachetools import TTLCache
+
+from .http_cache import CachingHTTPAdapter, http_cache_store
+from .records import HNStory, RedditPost, Repository
+from .signals import posts_fetched, repositories_fetched, stories_fetched
 
 logger = logging.getLogger(__name__)
 
+# GitHub search returns at most this many results per query
+GITHUB_SEARCH_MAX_RESULTS = 1000
+
+
+def create_session(headers: Dict) -> requests.Session:
+    """
+    Create a pooled HTTP session so upstream connections are reused across requests
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    pool = {"pool_connections": 4, "pool_maxsize": settings.UPSTREAM_POOL_MAXSIZE}
+    if settings.HTTP_CACHE_MODE == "off":
+        adapter = HTTPAdapter(**pool)
+    else:
+        adapter = CachingHTTPAdapter(
+            http_cache_store, mode=settings.HTTP_CACHE_MODE, **pool
+        )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class GitHubAPIClient:
     """
@@ -21,6 +56,12 @@ class GitHubAPIClient:
             "User-Agent": "CS-Student-Hub/1.0",
         }
 
+        self.session = create_session(self.headers)
+        # Remaining search API calls in the current minute, from response headers
+        self.search_rate_remaining: Optional[int] = None
+        # Last rate-limit headers per resource ("core", "search", ...)
+        self.rate_limits: Dict[str, Dict] = {}
+
         if not self.token:
             logger.warning("GITHUB_TOKEN not configured in settings")
 
@@ -36,9 +77,17 @@ class GitHubAPIClient:
 
         try:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = requests.get(
-                url, headers=self.headers, params=params, timeout=10
-            )
+            response = self.session.get(url, params=params, timeout=10)
+
+            resource = response.headers.get("x-ratelimit-resource")
+            if resource:
+                self.rate_limits[resource] = {
+                    "limit": int(response.headers.get("x-ratelimit-limit", 0)),
+                    "remaining": int(response.headers.get("x-ratelimit-remaining", 0)),
+                    "reset": int(response.headers.get("x-ratelimit-reset", 0)),
+                }
+            if resource == "search":
+                self.search_rate_remaining = self.rate_limits[resource]["remaining"]
 
             if response.status_code == 200:
                 return response.json()
@@ -56,10 +105,144 @@ class GitHubAPIClient:
         except requests.RequestException as e:
             logger.error(f"GitHub API request failed: {str(e)}")
             return None
+        except ValueError as e:
+            logger.error(f"GitHub API returned invalid JSON: {str(e)}")
+            return None
+
+    @staticmethod
+    def _parse_repository(repo: Dict) -> Repository:
+        return Repository.from_api(repo)
+
+    def _fetch_pages(self, params: Dict, pages: Iterable[int]) -> Iterator[Dict]:
+        """
+        Fetch search result pages concurrently, yielding them in page order
+
+        At most GITHUB_SEARCH_CONCURRENCY pages are in flight, fewer when the
+        search rate limit is close to running out.
+        """
+        concurrency = settings.GITHUB_SEARCH_CONCURRENCY
+        pages = iter(pages)
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                while True:
+                    budget = concurrency
+                    if self.search_rate_remaining is not None:
+                        budget = max(1, min(concurrency, self.search_rate_remaining))
+                    while len(in_flight) < budget:
+                        page = next(pages, None)
+                        if page is None:
+                            break
+                        in_flight.append(
+                            executor.submit(
+                                self._make_request,
+                                "search/repositories",
+                                dict(params, page=page),
+                            )
+                        )
+                    if not in_flight:
+                        return
+                    yield in_flight.popleft().result()
+            finally:
+                # The consumer stopped early, drop pages not started yet
+                for future in in_flight:
+                    future.cancel()
+
+    def _iter_results(
+        self, params: Dict, first: Dict, max_results: int
+    ) -> Iterator[Repository]:
+        per_page = params["per_page"]
+        total = min(first.get("total_count", 0), max_results)
+        remaining_pages = range(2, math.ceil(total / per_page) + 1)
+
+        count = 0
+        for data in chain([first], self._fetch_pages(params, remaining_pages)):
+            if not data or "items" not in data:
+                logger.warning(f"GitHub search stopped early for {params['q']!r}")
+                return
+            for repo in data["items"]:
+                if count >= max_results:
+                    return
+                yield self._parse_repository(repo)
+                count += 1
+            if len(data["items"]) < per_page:
+                return
+
+    def iter_search_repositories(
+        self,
+        query: str,
+        sort: str = "stars",
+        order: str = "desc",
+        max_results: int = GITHUB_SEARCH_MAX_RESULTS,
+    ) -> Iterator[Repository]:
+        """
+        Stream repositories matching a search query, page by page
+
+        Pages after the first are fetched concurrently and repositories are
+        yielded as soon as their page arrives, in result order. GitHub never
+        returns more than 1000 results for one query, see
+        iter_search_repositories_sliced to go past that.
+        """
+        max_results = min(max_results, GITHUB_SEARCH_MAX_RESULTS)
+        if max_results <= 0:
+            return
+        params = {
+            "q": query,
+            "sort": sort,
+            "order": order,
+            "per_page": min(max_results, 100),
+        }
+
+        first = self._make_request("search/repositories", dict(params, page=1))
+        if not first or "items" not in first:
+            return
+        yield from self._iter_results(params, first, max_results)
+
+    def iter_search_repositories_sliced(
+        self,
+        query: str,
+        since: date,
+        until: Optional[date] = None,
+        date_field: str = "created",
+        sort: str = "stars",
+        order: str = "desc",
+    ) -> Iterator[Repository]:
+        """
+        Stream all repositories matching a query between two dates
+
+        The date range is split in halves until each slice has no more than
+        1000 results, newest slice first. Results are ordered within a slice
+        only.
+        """
+        until = until or date.today()
+        slices = [(since, until)]
+
+        while slices:
+            start, end = slices.pop()
+            params = {
+                "q": f"{query} {date_field}:{start.isoformat()}..{end.isoformat()}",
+                "sort": sort,
+                "order": order,
+                "per_page": 100,
+            }
+            first = self._make_request("search/repositories", dict(params, page=1))
+            if not first or "items" not in first:
+                logger.warning(f"GitHub search stopped early for {params['q']!r}")
+                return
+
+            if first.get("total_count", 0) > GITHUB_SEARCH_MAX_RESULTS and end > start:
+                middle = start + timedelta(days=(end - start).days // 2)
+                # Pushed last so the newer half is searched first
+                slices.append((start, middle))
+                slices.append((middle + timedelta(days=1), end))
+                continue
+
+            yield from self._iter_results(params, first, GITHUB_SEARCH_MAX_RESULTS)
 
     def get_trending_repositories(
         self, language: str = "", days: int = 7, limit: int = 30
-    ) -> List[Dict]:
+    ) -> List[Repository]:
         """
         Get trending repositories from the last N days
         """
@@ -73,61 +256,119 @@ class GitHubAPIClient:
 
         query = " ".join(query_parts)
 
-        params = {"q": query, "sort": "stars", "order": "desc", "per_page": limit}
+        trending_repos = list(
+            self.iter_search_repositories(query, sort="stars", max_results=limit)
+        )
+        if trending_repos:
+            repositories_fetched.send_robust(
+                sender=self.__class__, repos=trending_repos
+            )
+
+        return trending_repos
+
+    def get_active_repositories(
+        self, language: str = "", days: int = 1, min_stars: int = 500, limit: int = 100
+    ) -> List[Repository]:
+        """
+        Get established repositories pushed to in the last N days
+
+        Feeds the star history so older repos with sudden momentum can show up
+        in velocity rankings, not only newly created ones.
+        """
+        since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+        query_parts = [f"pushed:>{since_date}", f"stars:>{min_stars}"]
+        if language:
+            query_parts.append(f"language:{language}")
+
+        params = {
+            "q": " ".join(query_parts),
+            "sort": "updated",
+            "order": "desc",
+            "per_page": max(1, min(limit, 100)),
+        }
 
         data = self._make_request("search/repositories", params)
         if not data or "items" not in data:
             return []
 
-        trending_repos = []
-        for repo in data["items"]:
-            trending_repos.append(
-                {
-                    "id": repo["id"],
-                    "name": repo["name"],
-                    "full_name": repo["full_name"],
-                    "description": repo["description"] or "No description available",
-                    "stars": repo["stargazers_count"],
-                    "forks": repo["forks_count"],
-                    "language": repo["language"] or "Unknown",
-                    "url": repo["html_url"],
-                    "created_at": repo["created_at"],
-                    "updated_at": repo["updated_at"],
-                    "topics": repo.get("topics", []),
-                }
+        repos = [self._parse_repository(repo) for repo in data["items"]]
+        repositories_fetched.send_robust(sender=self.__class__, repos=repos)
+        return repos
+
+    def get_recent_repositories(
+        self, days: int = 30, limit: int = 300
+    ) -> List[Repository]:
+        """
+        Get the most starred repositories created in the last N days
+        """
+        since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        repos = list(
+            self.iter_search_repositories(
+                f"created:>{since_date}", sort="stars", max_results=limit
             )
+        )
 
-        return trending_repos
+        if repos:
+            repositories_fetched.send_robust(sender=self.__class__, repos=repos)
+        return repos
 
-    def get_language_stats(self) -> Dict:
+    @staticmethod
+    def aggregate_language_stats(repos: List[Repository]) -> Dict:
         """
-        Get popular programming language statistics
+        Group repositories by language in one pass, most starred languages first
         """
-        # Get trending repos for different languages
-        languages = [
-            "Python",
-            "JavaScript",
-            "TypeScript",
-            "Java",
-            "Go",
-            "Rust",
-            "C++",
-            "C#",
-        ]
         language_stats = {}
+        for repo in repos:
+            language = repo["language"]
+            if language == "Unknown":
+                continue
 
-        for lang in languages:
-            repos = self.get_trending_repositories(language=lang, days=30, limit=10)
-            if repos:
-                total_stars = sum(repo["stars"] for repo in repos)
-                language_stats[lang] = {
-                    "repos_count": len(repos),
-                    "total_stars": total_stars,
-                    "avg_stars": total_stars // len(repos) if repos else 0,
-                    "top_repo": repos[0] if repos else None,
+            stats = language_stats.get(language)
+            if stats is None:
+                stats = language_stats[language] = {
+                    "repos_count": 0,
+                    "total_stars": 0,
+                    "top_repo": repo,
                 }
+            stats["repos_count"] += 1
+            stats["total_stars"] += repo["stars"]
+            if repo["stars"] > stats["top_repo"]["stars"]:
+                stats["top_repo"] = repo
+
+        for stats in language_stats.values():
+            stats["avg_stars"] = stats["total_stars"] // stats["repos_count"]
+            stats["top_repo"] = stats["top_repo"].to_dict()
+
+        return dict(
+            sorted(
+                language_stats.items(),
+                key=lambda item: item[1]["total_stars"],
+                reverse=True,
+            )
+        )
+
+    def get_language_stats(self) -> Dict:
+        """
+        Get popular programming language statistics
+
+        Aggregated from one paginated search of recent repositories rather than
+        a search per language, so every language present is covered for a fixed
+        number of search API calls (one per 100 repositories).
+        """
+        repos = self.get_recent_repositories(
+            days=30, limit=settings.LANGUAGE_STATS_REPOS
+        )
+        return self.aggregate_language_stats(repos)
 
-        return language_stats
+    def quota_left(self, resource: str = "core") -> Optional[float]:
+        """
+        Share of the ``resource`` rate limit left, None when unknown or reset since
+        """
+        rate = self.rate_limits.get(resource)
+        if not rate or not rate["limit"] or time.time() >= rate["reset"]:
+            return None
+        return rate["remaining"] / rate["limit"]
 
     def get_api_status(self) -> Dict:
         """
@@ -149,6 +390,186 @@ class GitHubAPIClient:
         }
 
 
+class GitHubGraphQLEnricher:
+    """
+    Batch enrichment of repositories through the GitHub GraphQL API
+
+    Dozens of repositories are fetched in one query, one aliased field per
+    repository, instead of several REST calls per repository. Details are
+    cached per repository for GITHUB_ENRICH_TTL seconds.
+    """
+
+    REPOSITORY_FIELDS = """
+    fragment RepositoryDetails on Repository {
+      primaryLanguage { name }
+      languages(first: 5, orderBy: {field: SIZE, direction: DESC}) {
+        totalSize
+        edges { size node { name } }
+      }
+      latestRelease { tagName name publishedAt url }
+      mentionableUsers { totalCount }
+      watchers { totalCount }
+      openIssues: issues(states: OPEN) { totalCount }
+      pushedAt
+    }
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url or settings.GITHUB_GRAPHQL_URL
+        self.token = settings.GITHUB_TOKEN
+        self.session = create_session(
+            {
+                "Authorization": f"bearer {self.token}",
+                "User-Agent": "CS-Student-Hub/1.0",
+            }
+        )
+        self.cache = TTLCache(maxsize=5000, ttl=settings.GITHUB_ENRICH_TTL)
+        self._cache_lock = threading.Lock()
+        self.rate_limit: Dict = {"total_cost": 0}
+
+    def _build_query(self, full_names: List[str]) -> Tuple[str, Dict]:
+        """
+        One aliased ``repository`` field per repo, owner/name passed as variables
+        """
+        variables = {}
+        declarations = []
+        fields = []
+        for i, full_name in enumerate(full_names):
+            owner, name = full_name.split("/", 1)
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepositoryDetails }}"
+            )
+
+        query = (
+            f"query({', '.join(declarations)}) {{\n"
+            + "\n".join(fields)
+            + "\nrateLimit { cost remaining limit resetAt }\n}\n"
+            + self.REPOSITORY_FIELDS
+        )
+        return query, variables
+
+    @staticmethod
+    def _parse_details(node: Optional[Dict]) -> Optional[Dict]:
+        if not node:
+            return None
+
+        languages = node.get("languages") or {}
+        total_size = languages.get("totalSize") or 0
+        release = node.get("latestRelease")
+        return {
+            "primary_language": (node.get("primaryLanguage") or {}).get("name"),
+            "languages": [
+                {
+                    "name": edge["node"]["name"],
+                    "share": round(edge["size"] / total_size, 3) if total_size else 0,
+                }
+                for edge in languages.get("edges", [])
+            ],
+            "latest_release": (
+                {
+                    "tag": release["tagName"],
+                    "name": release["name"],
+                    "published_at": release["publishedAt"],
+                    "url": release["url"],
+                }
+                if release
+                else None
+            ),
+            # GraphQL has no contributor count, users who can be mentioned
+            # (contributors and collaborators) is the closest available number
+            "contributors_count": node["mentionableUsers"]["totalCount"],
+            "watchers_count": node["watchers"]["totalCount"],
+            "open_issues_count": node["openIssues"]["totalCount"],
+            "pushed_at": node.get("pushedAt"),
+        }
+
+    def _fetch_batch(self, full_names: List[str]) -> Dict[str, Optional[Dict]]:
+        query, variables = self._build_query(full_names)
+        try:
+            response = self.session.post(
+                self.url, json={"query": query, "variables": variables}, timeout=15
+            )
+        except requests.RequestException as e:
+            logger.error(f"GitHub GraphQL request failed: {str(e)}")
+            return {}
+
+        if response.status_code != 200:
+            logger.error(
+                f"GitHub GraphQL error {response.status_code}: {response.text[:200]}"
+            )
+            return {}
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            # e.g. an HTML error page from a proxy answering with 200
+            logger.error(f"GitHub GraphQL returned invalid JSON: {str(e)}")
+            return {}
+
+        # Missing repositories come back as null data plus a NOT_FOUND error
+        for error in payload.get("errors", []):
+            if error.get("type") != "NOT_FOUND":
+                logger.warning(f"GitHub GraphQL error: {error.get('message')}")
+
+        data = payload.get("data") or {}
+        rate = data.get("rateLimit")
+        if rate:
+            self.rate_limit = {
+                "cost": rate["cost"],
+                "remaining": rate["remaining"],
+                "limit": rate["limit"],
+                "reset_at": rate["resetAt"],
+                "total_cost": self.rate_limit["total_cost"] + rate["cost"],
+            }
+
+        return {
+            full_name: self._parse_details(data.get(f"r{i}"))
+            for i, full_name in enumerate(full_names)
+            if f"r{i}" in data
+        }
+
+    def get_details(self, full_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Details per "owner/name", from the cache or batched GraphQL queries
+        """
+        details = {}
+        missing = []
+        with self._cache_lock:
+            for full_name in dict.fromkeys(full_names):
+                key = full_name.lower()
+                if key in self.cache:
+                    details[full_name] = self.cache[key]
+                else:
+                    missing.append(full_name)
+
+        if missing and not self.token:
+            logger.error("No GitHub token available")
+            return details
+
+        batch_size = settings.GITHUB_GRAPHQL_BATCH_SIZE
+        for start in range(0, len(missing), batch_size):
+            fetched = self._fetch_batch(missing[start : start + batch_size])
+            with self._cache_lock:
+                for full_name, repo_details in fetched.items():
+                    self.cache[full_name.lower()] = repo_details
+            details.update(fetched)
+
+        return details
+
+    def enrich(self, repos: List[Dict]) -> List[Dict]:
+        """
+        Copies of ``repos`` with a ``details`` field (None if unavailable)
+        """
+        details = self.get_details([repo["full_name"] for repo in repos])
+        return [dict(repo, details=details.get(repo["full_name"])) for repo in repos]
+
+    def get_rate_limit(self) -> Dict:
+        return dict(self.rate_limit)
+
+
 class RedditAPIClient:
     """
     Reddit API client for fetching trending posts from programming subreddits
@@ -161,6 +582,9 @@ class RedditAPIClient:
             "User-Agent": "python:cs-student-hub:v1.0.0 (by /u/csstudent)",
             "Accept": "application/json",
         }
+        self.session = create_session(self.headers)
+        # Reddit's rate-limit headers of the last response, see quota_left
+        self.rate_limit: Optional[Dict] = None
 
     def _make_request(
         self, endpoint: str, params: Optional[Dict] = None
@@ -175,12 +599,19 @@ class RedditAPIClient:
 
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
-            response = requests.get(
-                url, headers=self.headers, params=params, timeout=15
-            )
+            response = self.session.get(url, params=params, timeout=15)
 
             logger.info(f"Reddit API request: {url} - Status: {response.status_code}")
 
+            if "x-ratelimit-remaining" in response.headers:
+                # Reddit reports fractional counts and the seconds left in the window
+                self.rate_limit = {
+                    "remaining": float(response.headers["x-ratelimit-remaining"]),
+                    "used": float(response.headers.get("x-ratelimit-used", 0)),
+                    "reset": time.time()
+                    + float(response.headers.get("x-ratelimit-reset", 0)),
+                }
+
             if response.status_code == 200:
                 return response.json()
             else:
@@ -192,73 +623,141 @@ class RedditAPIClient:
         except requests.RequestException as e:
             logger.error(f"Reddit API request failed: {str(e)}")
             return None
+        except ValueError as e:
+            logger.error(f"Reddit API returned invalid JSON: {str(e)}")
+            return None
 
-    def get_subreddit_posts(
-        self, subreddit: str = "programming", sort: str = "hot", limit: int = 25
-    ) -> List[Dict]:
+    @staticmethod
+    def _parse_post(post_data: Dict, subreddit: str) -> Optional[RedditPost]:
         """
-        Get posts from a specific subreddit
-        sort options: hot, new, top, rising
+        Convert a listing child to a post, None for posts the dashboard skips
         """
-        # Fix: construct the endpoint correctly with r/ prefix
-        endpoint = f"r/{subreddit}/{sort}"
-        params = {"limit": min(limit, 100)}  # Reddit max is 100
+        # Skip pinned/stickied posts and ads
+        if post_data.get("stickied", False) or post_data.get("is_sponsored", False):
+            return None
 
-        data = self._make_request(endpoint, params)
-        if not data or "data" not in data:
-            logger.error(f"No data received from Reddit for r/{subreddit}")
-            return []
+        # Skip deleted/removed posts
+        if post_data.get("removed_by_category"):
+            return None
 
-        if "children" not in data["data"]:
-            logger.error(f"No children in Reddit data for r/{subreddit}")
-            return []
+        return RedditPost.from_api(post_data, subreddit)
 
-        posts = []
-        for item in data["data"]["children"]:
-            try:
-                post_data = item["data"]
+    def iter_listing(
+        self,
+        subreddit: str = "programming",
+        sort: str = "hot",
+        limit: Optional[int] = None,
+        stop_when: Optional[Callable[[Dict], bool]] = None,
+    ) -> Iterator[RedditPost]:
+        """
+        Stream posts of a subreddit listing, following Reddit's ``after`` cursor
 
-                # Skip pinned/stickied posts and ads
-                if post_data.get("stickied", False) or post_data.get(
-                    "is_sponsored", False
-                ):
+        Yields at most ``limit`` posts (all of the listing if None) and stops at
+        the first post for which ``stop_when`` returns True, e.g. a post older
+        than a cutoff on the "new" listing. Only one page is held at a time.
+        """
+        # Fix: construct the endpoint correctly with r/ prefix
+        endpoint = f"r/{subreddit}/{sort}"
+        after = None
+        count = 0
+
+        while limit is None or count < limit:
+            params = {"limit": 100 if limit is None else min(limit - count, 100)}
+            if after:
+                params.update(after=after, count=count)
+
+            data = self._make_request(endpoint, params)
+            if not data or "children" not in (data.get("data") or {}):
+                if after is None:
+                    logger.error(f"No data received from Reddit for r/{subreddit}")
+                return
+
+            for item in data["data"]["children"]:
+                try:
+                    post = self._parse_post(item["data"], subreddit)
+                except Exception as e:
+                    logger.warning(f"Error processing Reddit post: {str(e)}")
                     continue
-
-                # Skip deleted/removed posts
-                if post_data.get("removed_by_category"):
+                if post is None:
                     continue
+                if stop_when is not None and stop_when(post):
+                    return
+
+                yield post
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+
+            after = data["data"].get("after")
+            if not after:
+                return
+
+    def iter_listings(
+        self,
+        listings: List[Tuple[str, str]],
+        limit: Optional[int] = None,
+        stop_when: Optional[Callable[[Dict], bool]] = None,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream ``(subreddit, post)`` from several ``(subreddit, sort)`` listings at once
 
-                posts.append(
-                    {
-                        "id": post_data.get("id", ""),
-                        "title": post_data.get("title", "No title"),
-                        "author": post_data.get("author", "unknown"),
-                        "subreddit": post_data.get("subreddit", subreddit),
-                        "score": post_data.get("score", 0),
-                        "upvote_ratio": post_data.get("upvote_ratio", 0),
-                        "num_comments": post_data.get("num_comments", 0),
-                        "url": f"https://reddit.com{post_data.get('permalink', '')}",
-                        "external_url": post_data.get("url", ""),
-                        "selftext": (
-                            (post_data.get("selftext", "")[:200] + "...")
-                            if post_data.get("selftext", "")
-                            else ""
-                        ),
-                        "created_utc": post_data.get("created_utc", 0),
-                        "flair_text": post_data.get("link_flair_text", ""),
-                        "domain": post_data.get("domain", ""),
-                        "is_self": post_data.get("is_self", False),
-                    }
-                )
+        Each listing is read by its own worker (REDDIT_LISTING_CONCURRENCY at a
+        time) into a small bounded queue, so posts are yielded as they arrive
+        while memory stays around a page per listing.
+        """
+        results = queue.Queue(maxsize=100)
+        stopped = threading.Event()
+        done = object()
+
+        def put(entry) -> bool:
+            while not stopped.is_set():
+                try:
+                    results.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
+        def read(subreddit: str, sort: str):
+            try:
+                for post in self.iter_listing(subreddit, sort, limit, stop_when):
+                    if not put((subreddit, post)):
+                        return
             except Exception as e:
-                logger.warning(f"Error processing Reddit post: {str(e)}")
-                continue
+                logger.error(f"Failed to get posts from r/{subreddit}: {str(e)}")
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=settings.REDDIT_LISTING_CONCURRENCY)
+        try:
+            for subreddit, sort in listings:
+                executor.submit(read, subreddit, sort)
+
+            remaining = len(listings)
+            while remaining:
+                entry = results.get()
+                if entry is done:
+                    remaining -= 1
+                    continue
+                yield entry
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_subreddit_posts(
+        self, subreddit: str = "programming", sort: str = "hot", limit: int = 25
+    ) -> List[RedditPost]:
+        """
+        Get posts from a specific subreddit
+        sort options: hot, new, top, rising
+        """
+        posts = list(self.iter_listing(subreddit, sort, limit))
 
         logger.info(f"Successfully parsed {len(posts)} posts from r/{subreddit}")
+        posts_fetched.send_robust(sender=self.__class__, posts=posts)
         return posts
 
-    def get_programming_trending(self) -> List[Dict]:
+    def get_programming_trending(self) -> List[RedditPost]:
         """
         Get trending posts from multiple programming subreddits with better error handling
         """
@@ -273,26 +772,25 @@ class RedditAPIClient:
         ]
 
         all_posts = []
-        successful_subreddits = []
-        failed_subreddits = []
-
-        for subreddit in subreddits:
-            try:
-                posts = self.get_subreddit_posts(subreddit, "hot", 8)
-
-                if posts:  # If we got posts successfully
-                    successful_subreddits.append(subreddit)
-                    # Add subreddit info and filter for quality posts
-                    for post in posts:
-                        if post["score"] >= 5:  # Lower threshold for more posts
-                            post["source_subreddit"] = subreddit
-                            all_posts.append(post)
-                else:
-                    failed_subreddits.append(f"{subreddit} (no posts)")
-
-            except Exception as e:
-                logger.error(f"Failed to get posts from r/{subreddit}: {str(e)}")
-                failed_subreddits.append(f"{subreddit} (error: {str(e)[:50]})")
+        fetched = []
+        posts_per_subreddit = Counter()
+
+        # Listings are fetched concurrently rather than one subreddit at a time
+        for subreddit, post in self.iter_listings(
+            [(subreddit, "hot") for subreddit in subreddits], limit=8
+        ):
+            fetched.append(post)
+            posts_per_subreddit[subreddit] += 1
+            if post["score"] >= 5:  # Lower threshold for more posts
+                post.source_subreddit = subreddit
+                all_posts.append(post)
+
+        successful_subreddits = [s for s in subreddits if posts_per_subreddit[s]]
+        failed_subreddits = [
+            f"{s} (no posts)" for s in subreddits if not posts_per_subreddit[s]
+        ]
+        if fetched:
+            posts_fetched.send_robust(sender=self.__class__, posts=fetched)
 
         logger.info(
             f"Reddit trending: {len(successful_subreddits)} successful, {len(failed_subreddits)} failed"
@@ -337,6 +835,16 @@ class RedditAPIClient:
 
         return stats
 
+    def quota_left(self) -> Optional[float]:
+        """
+        Share of the rate limit left, None when unknown or reset since
+        """
+        rate = self.rate_limit
+        if not rate or time.time() >= rate["reset"]:
+            return None
+        total = rate["remaining"] + rate["used"]
+        return rate["remaining"] / total if total else None
+
     def get_api_status(self) -> Dict:
         """
         Check Reddit API status with a simple test request
@@ -373,6 +881,7 @@ class HackerNewsAPIClient:
             "User-Agent": "python:cs-student-hub:v1.0.0 (by /u/csstudent)",
             "Accept": "application/json",
         }
+        self.session = create_session(self.headers)
 
     def _make_request(self, endpoint: str) -> Optional[Dict]:
         """
@@ -381,7 +890,7 @@ class HackerNewsAPIClient:
         try:
             url = f"{self.base_url}/{endpoint}"
 
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
                 return response.json()
@@ -395,7 +904,7 @@ class HackerNewsAPIClient:
             logger.error(f"Hacker News API request failed: {str(e)}")
             return None
 
-    def get_story_details(self, story_id: int) -> Optional[Dict]:
+    def get_story_details(self, story_id: int) -> Optional[HNStory]:
         """
         Get details for a specific story
         """
@@ -403,18 +912,9 @@ class HackerNewsAPIClient:
         if not data:
             return None
 
-        return {
-            "id": data.get("id"),
-            "title": data.get("title", "No title"),
-            "url": data.get("url", ""),
-            "score": data.get("score", 0),
-            "by": data.get("by", "unknown"),
-            "time": data.get("time", 0),
-            "descendants": data.get("descendants", 0),  # comment count
-            "type": data.get("type", "story"),
-        }
+        return HNStory.from_api(data)
 
-    def get_top_stories(self, limit: int = 30) -> List[Dict]:
+    def get_top_stories(self, limit: int = 30) -> List[HNStory]:
         """
         Get top stories from Hacker News
         """
@@ -433,6 +933,7 @@ class HackerNewsAPIClient:
                 stories.append(story)
 
         logger.info(f"Successfully fetched {len(stories)} Hacker News stories")
+        stories_fetched.send_robust(sender=self.__class__, stories=stories)
         return stories
 
     def get_api_status(self) -> Dict:
@@ -454,5 +955,6 @@ class HackerNewsAPIClient:
 
 # Initialize all API clients
 github_client = GitHubAPIClient()
+github_enricher = GitHubGraphQLEnricher()
 reddit_client = RedditAPIClient()
 hackernews_client = HackerNewsAPIClient()
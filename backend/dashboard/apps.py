@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dashboard"
+
+    def ready(self):
+        # Connect ingestion receivers to the client signals
+        from . import dedup, keywords, search, timeseries  # noqa: F401
@@ -0,0 +1,147 @@
+"""
+Serialize-once broadcasting of dashboard updates over the channel layer
+
+Updates are JSON-encoded a single time by the sender and carried as text in the
+group event, so consumers forward the bytes as-is instead of re-encoding them
+per connection. With ``RedisPubSubChannelLayer`` each group send is one Redis
+PUBLISH that every worker process fans out locally to its own sockets.
+"""
+
+import json
+import re
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+DASHBOARD_GROUP = "dashboard"
+
+# Topics clients can subscribe to, e.g. "platform:github" or "language:python"
+TOPIC_KINDS = ("platform", "language", "subreddit")
+
+# Channel layer group names only allow ASCII letters, digits, "-", "_" and "."
+_GROUP_UNSAFE = re.compile(r"[^a-z0-9_.-]")
+_LANGUAGE_SYMBOLS = {"+": "plus", "#": "sharp"}
+
+
+def normalize_topic(topic: str) -> Optional[str]:
+    """
+    Normalize a "kind:value" topic, returns None if it is not a valid topic
+    """
+    if not isinstance(topic, str) or ":" not in topic:
+        return None
+
+    kind, value = topic.split(":", 1)
+    kind = kind.strip().lower()
+    value = value.strip().lower()
+    if kind == "platform":
+        # Item platforms are display names ("Hacker News"), topics use source keys
+        value = value.replace(" ", "")
+    if kind not in TOPIC_KINDS or not value:
+        return None
+    return f"{kind}:{value}"
+
+
+def topic_group(topic: str) -> str:
+    """
+    Channel layer group name for a normalized topic
+    """
+    kind, value = topic.split(":", 1)
+    for symbol, name in _LANGUAGE_SYMBOLS.items():
+        value = value.replace(symbol, name)
+    value = _GROUP_UNSAFE.sub("-", value)
+    return f"{DASHBOARD_GROUP}.{kind}.{value}"[:99]
+
+
+def topics_for_item(item: Dict) -> List[str]:
+    """
+    Topics a trending item belongs to, based on its platform, language and subreddit
+    """
+    topics = []
+    for kind in TOPIC_KINDS:
+        topic = normalize_topic(f"{kind}:{item.get(kind) or ''}")
+        if topic:
+            topics.append(topic)
+    return topics
+
+
+def changed_items(previous: Iterable[Dict], current: Iterable[Dict]) -> List[Dict]:
+    """
+    Items of ``current`` that are new or differ from their ``previous`` version
+    """
+    before = {item["id"]: item for item in previous}
+    return [item for item in current if before.get(item["id"]) != item]
+
+
+def encode_update(update_type: str, message: Any) -> str:
+    """
+    Encode an update in the wire format sent to dashboard WebSockets
+    """
+    return json.dumps({"type": update_type, "message": message})
+
+
+def build_event(update_type: str, message: Any, key: Optional[str] = None) -> dict:
+    """
+    Build the group event for an update, carrying the pre-encoded text
+
+    ``update_id`` lets a socket subscribed to several matching topics drop the
+    copies it receives through the other groups. Updates sharing a ``key`` (for
+    example the same trending item) replace each other in a slow client's queue;
+    without one the update type is the key, so the latest update of each type
+    wins.
+    """
+    return {
+        "type": "dashboard.update",
+        "update_type": update_type,
+        "update_id": uuid.uuid4().hex,
+        "key": key if key is not None else update_type,
+        "text": encode_update(update_type, message),
+    }
+
+
+async def abroadcast_update(
+    update_type: str,
+    message: Any,
+    topics: Optional[Iterable[str]] = None,
+    key: Optional[str] = None,
+):
+    """
+    Send an update to the sockets subscribed to any of ``topics`` (async version)
+
+    Without topics the update goes to every connected dashboard.
+    """
+    channel_layer = get_channel_layer()
+    event = build_event(update_type, message, key)
+
+    if topics is None:
+        groups = [DASHBOARD_GROUP]
+    else:
+        groups = {topic_group(t) for t in map(normalize_topic, topics) if t}
+
+    for group in groups:
+        await channel_layer.group_send(group, event)
+
+
+def broadcast_update(
+    update_type: str,
+    message: Any,
+    topics: Optional[Iterable[str]] = None,
+    key: Optional[str] = None,
+):
+    """
+    Send an update to the sockets subscribed to any of ``topics`` from sync code
+    """
+    async_to_sync(abroadcast_update)(update_type, message, topics, key)
+
+
+def broadcast_items(update_type: str, items: Iterable[Dict]):
+    """
+    Send each item only to the sockets subscribed to one of its topics
+
+    Keyed by item, so a slow client's queue keeps the latest version of each.
+    """
+    for item in items:
+        broadcast_update(
+            update_type, item, topics=topics_for_item(item), key=f"item:{item['id']}"
+        )
@@ -2,18 +2,67 @@
 WebSocket consumers for real-time dashboard updates
 """
 
+import asyncio
 import json
+import time
+from collections import Counter, OrderedDict, deque
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from .broadcast import DASHBOARD_GROUP, encode_update, normalize_topic, topic_group
+from .snapshot import get_snapshot
+
+MAX_SUBSCRIPTIONS = 50
+RESYNC_KEY = "__resync__"
+
+# Process-wide counters for the per-connection send queues
+send_stats = Counter()
+
+
+def get_send_stats() -> dict:
+    return {
+        "delivered": send_stats["delivered"],
+        "coalesced": send_stats["coalesced"],
+        "dropped": send_stats["dropped"],
+        "resyncs": send_stats["resyncs"],
+        "pending": send_stats["pending"],
+    }
 
 
 class DashboardConsumer(AsyncWebsocketConsumer):
+    """
+    Dashboard socket, every client joins the global ``dashboard`` group and can
+    subscribe to per-platform, per-language and per-subreddit topics:
+
+        {"action": "subscribe", "topics": ["platform:github", "language:python"]}
+        {"action": "unsubscribe", "topics": ["language:python"]}
+
+    Group updates go through a bounded per-connection queue drained by a sender
+    task. A pending update is replaced by a newer one with the same key, and a
+    client that falls too far behind has its queue dropped and gets a fresh
+    snapshot instead, so memory stays flat however slow the client is.
+
+    The queue only fills if ``send`` waits for a slow client. Uvicorn with its
+    ``websockets`` implementation (gunicorn.conf.py, DashboardUvicornWorker)
+    does: each send waits until the socket's write buffer drains below its
+    limit. Daphne returns as soon as the message is buffered, so under daphne
+    (the development server) a slow client buffers inside the server instead.
+    """
+
     async def connect(self):
         # Join dashboard group
-        self.room_group_name = "dashboard"
+        self.room_group_name = DASHBOARD_GROUP
+        self.topics = set()
+        self.recent_update_ids = deque(maxlen=64)
+        self.pending = OrderedDict()
+        self.pending_ready = asyncio.Event()
+        self.sender_task = None
 
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 
         await self.accept()
+        self.sender_task = asyncio.ensure_future(self.drain_pending())
 
         # Send welcome message
         await self.send(
@@ -26,23 +75,149 @@ class DashboardConsumer(AsyncWebsocketConsumer):
         )
 
     async def disconnect(self, close_code):
-        # Leave dashboard group
+        if self.sender_task is not None:
+            self.sender_task.cancel()
+        send_stats["dropped"] += len(self.pending)
+        send_stats["pending"] -= len(self.pending)
+        self.pending.clear()
+
+        # Leave dashboard group and every topic group
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        for topic in self.topics:
+            await self.channel_layer.group_discard(
+                topic_group(topic), self.channel_name
+            )
 
     async def receive(self, text_data):
-        # Handle messages from WebSocket
-        text_data_json = json.loads(text_data)
-        message = text_data_json["message"]
+        # Handle subscription messages from WebSocket
+        try:
+            data = json.loads(text_data)
+            action = data["action"]
+            topics = data.get("topics", [])
+            if not isinstance(topics, list):
+                raise ValueError("topics must be a list")
+        except (ValueError, KeyError, TypeError) as e:
+            await self.send_error(f"Invalid message: {str(e)}")
+            return
 
-        # Echo message back (for testing)
-        await self.send(
-            text_data=json.dumps({"type": "echo", "message": f"Echo: {message}"})
-        )
+        if action == "subscribe":
+            await self.subscribe(topics)
+        elif action == "unsubscribe":
+            await self.unsubscribe(topics)
+        else:
+            await self.send_error(f"Unknown action: {action}")
+
+    async def subscribe(self, topics):
+        invalid = []
+        for raw_topic in topics:
+            topic = normalize_topic(raw_topic)
+            if topic is None:
+                invalid.append(raw_topic)
+                continue
+            if topic in self.topics:
+                continue
+            if len(self.topics) >= MAX_SUBSCRIPTIONS:
+                await self.send_error(
+                    f"Subscription limit of {MAX_SUBSCRIPTIONS} topics reached"
+                )
+                break
+
+            self.topics.add(topic)
+            await self.channel_layer.group_add(topic_group(topic), self.channel_name)
+
+        await self.send_subscriptions(invalid)
+
+    async def unsubscribe(self, topics):
+        invalid = []
+        for raw_topic in topics:
+            topic = normalize_topic(raw_topic)
+            if topic is None:
+                invalid.append(raw_topic)
+                continue
+            if topic not in self.topics:
+                continue
+
+            self.topics.discard(topic)
+            await self.channel_layer.group_discard(
+                topic_group(topic), self.channel_name
+            )
+
+        await self.send_subscriptions(invalid)
+
+    async def send_subscriptions(self, invalid):
+        response = {"type": "subscriptions", "topics": sorted(self.topics)}
+        if invalid:
+            response["invalid_topics"] = invalid
+        await self.send(text_data=json.dumps(response))
+
+    async def send_error(self, message):
+        await self.send(text_data=json.dumps({"type": "error", "message": message}))
 
     # Receive message from room group
     async def dashboard_update(self, event):
-        message = event["message"]
-        update_type = event["update_type"]
+        # Sockets subscribed to several matching topics get one copy per group
+        update_id = event.get("update_id")
+        if update_id is not None:
+            if update_id in self.recent_update_ids:
+                return
+            self.recent_update_ids.append(update_id)
+
+        # Updates from dashboard.broadcast arrive already encoded once by the sender
+        text = event.get("text")
+        if text is None:
+            text = json.dumps(
+                {"type": event["update_type"], "message": event["message"]}
+            )
+
+        await self.enqueue(event.get("key") or event["update_type"], text)
+
+    async def enqueue(self, key, text):
+        now = time.monotonic()
+
+        if key in self.pending:
+            # Newer state for the same item replaces the one still waiting
+            self.pending[key] = (text, self.pending[key][1])
+            send_stats["coalesced"] += 1
+            return
+
+        if self.pending:
+            oldest_enqueued_at = next(iter(self.pending.values()))[1]
+            if (
+                len(self.pending) >= settings.WS_MAX_PENDING_UPDATES
+                or now - oldest_enqueued_at > settings.WS_MAX_LAG_SECONDS
+            ):
+                await self.resync()
+                return
+
+        self.pending[key] = (text, now)
+        send_stats["pending"] += 1
+        self.pending_ready.set()
+
+    async def resync(self):
+        """
+        Replace everything pending with one fresh snapshot of the dashboard
+        """
+        send_stats["dropped"] += len(self.pending)
+        send_stats["pending"] -= len(self.pending)
+        send_stats["resyncs"] += 1
+        self.pending.clear()
+
+        snapshot = await sync_to_async(get_snapshot)()
+        if snapshot is not None:
+            text = encode_update("snapshot", snapshot)
+        else:
+            text = encode_update("resync_required", "Reload /api/trending/")
+
+        self.pending[RESYNC_KEY] = (text, time.monotonic())
+        send_stats["pending"] += 1
+        self.pending_ready.set()
 
-        # Send message to WebSocket
-        await self.send(text_data=json.dumps({"type": update_type, "message": message}))
+    async def drain_pending(self):
+        while True:
+            await self.pending_ready.wait()
+            while self.pending:
+                _, (text, _) = self.pending.popitem(last=False)
+                send_stats["pending"] -= 1
+                await self.send(text_data=text)
+                send_stats["delivered"] += 1
+            self.pending_ready.clear()
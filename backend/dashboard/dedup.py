@@ -0,0 +1,194 @@
+"""
+Cross-platform duplicate detection through canonical URLs
+
+The same link shows up as a GitHub repository, a Reddit ``external_url`` and a
+Hacker News ``url``. URLs are canonicalized (scheme, ``www``, trailing slashes,
+tracking parameters, github.com/owner/repo sub-pages) into a hash key, so
+duplicates are found with one dict lookup per item.
+
+The index of items seen across refreshes is built where refreshes run and
+shared with every process through the cache, see dashboard/shared_state.py.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from . import shared_state
+from .signals import posts_fetched, repositories_fetched, stories_fetched
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "si",
+}
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Canonical form of a URL used as the duplicate key, None if it has no valid host
+
+    ``https://www.GitHub.com/Owner/Repo/tree/main?utm_source=x`` and
+    ``http://github.com/owner/repo/`` both become ``github.com/owner/repo``.
+    """
+    if not url:
+        return None
+
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        # e.g. "http://[abc/x": invalid IPv6 host
+        return None
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+
+    path = parts.path.rstrip("/")
+    if host == "github.com":
+        segments = [s for s in path.split("/") if s]
+        if len(segments) >= 2:
+            repo = segments[1]
+            if repo.endswith(".git"):
+                repo = repo[:-4]
+            return f"github.com/{segments[0].lower()}/{repo.lower()}"
+        path = path.lower()
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    canonical = f"{host}{path}"
+    if query:
+        canonical += f"?{urlencode(query)}"
+    return canonical
+
+
+def repo_url(repo: Dict) -> str:
+    return repo.get("url", "")
+
+
+def post_url(post: Dict) -> str:
+    # Self posts link to their own permalink, which never matches another source
+    return post.get("external_url") or post.get("url", "")
+
+
+def story_url(story: Dict) -> str:
+    return story.get("url", "")
+
+
+def group_ids(urls: Sequence[str]) -> Tuple[List[int], int]:
+    """
+    Assign the same group id to items whose URLs share a canonical form
+
+    Items without a usable URL get a group of their own. Returns the group id
+    per item and the number of groups. O(n) in the number of items.
+    """
+    groups = []
+    seen: Dict[str, int] = {}
+    next_group = 0
+    for url in urls:
+        key = canonicalize_url(url) if url else None
+        if key is None:
+            groups.append(next_group)
+            next_group += 1
+            continue
+
+        group = seen.get(key)
+        if group is None:
+            group = seen[key] = next_group
+            next_group += 1
+        groups.append(group)
+    return groups, next_group
+
+
+class CanonicalIndex(shared_state.SharedStore):
+    """
+    Bounded index of canonical URL -> items seen on each platform across refreshes
+
+    Updated incrementally as each source refresh lands, so a trending item can
+    point to its copies on other platforms even when they came from an earlier
+    refresh. The least recently seen URLs are evicted past ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[Tuple[str, str], Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, platform: str, items: Sequence[Dict], url_of):
+        now = time.time()
+        with self._lock:
+            for item in items:
+                key = canonicalize_url(url_of(item))
+                if key is None:
+                    continue
+
+                members = self._entries.get(key)
+                if members is None:
+                    members = self._entries[key] = {}
+                else:
+                    self._entries.move_to_end(key)
+                members[(platform, str(item["id"]))] = {
+                    "platform": platform,
+                    "id": item["id"],
+                    "url": item.get("url", ""),
+                    "score": item.get("stars", item.get("score", 0)),
+                    "seen_at": now,
+                }
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, url: str) -> List[Dict]:
+        """
+        Items from any platform that share the canonical form of ``url``
+        """
+        key = canonicalize_url(url) if url else None
+        if key is None:
+            return []
+        with self._lock:
+            return list(self._entries.get(key, {}).values())
+
+
+canonical_index = shared_state.register(
+    "canonical_index",
+    CanonicalIndex(max_entries=settings.CANONICAL_INDEX_MAX_ENTRIES),
+)
+
+
+@receiver(repositories_fetched)
+@shared_state.ingests("canonical_index")
+def index_repositories(sender, repos, **kwargs):
+    canonical_index.add("GitHub", repos, repo_url)
+
+
+@receiver(posts_fetched)
+@shared_state.ingests("canonical_index")
+def index_posts(sender, posts, **kwargs):
+    canonical_index.add("Reddit", posts, post_url)
+
+
+@receiver(stories_fetched)
+@shared_state.ingests("canonical_index")
+def index_stories(sender, stories, **kwargs):
+    canonical_index.add("Hacker News", stories, story_url)
@@ -0,0 +1,365 @@
+"""
+Persistent HTTP response cache shared by the upstream API sessions
+
+Responses to GET requests are stored in a SQLite database (WAL mode) so every
+worker process on a host, and the next process after a restart, reuses them
+instead of downloading them again. Freshness follows the upstream headers:
+``Cache-Control`` (``s-maxage``, ``max-age``, ``no-cache``, ``no-store``,
+``private``) and ``Expires``, with ``Age`` taken into account. Stale entries that carry an
+``ETag`` or ``Last-Modified`` are revalidated with a conditional request, and
+a 304 answer refreshes them without transferring the body again. Rate-limit
+headers are never stored: they describe the budget at the time of the request
+that carried them, and the clients' quota bookkeeping must only see live ones.
+
+HTTP_CACHE_MODE selects the behaviour:
+
+- ``off``: no caching (default)
+- ``on``: cache according to the upstream headers
+- ``record``: fetch everything from upstream and store every 200 response
+- ``replay``: answer only from the store, a miss is a connection error
+
+Record and replay make API client runs deterministic: record once against the
+real APIs, then replay the same responses offline.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "on", "record", "replay")
+
+# Hop-by-hop and body encoding headers are not replayed: stored bodies are
+# already decoded
+_DROPPED_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+# GitHub and Reddit report their rate-limit budget in these headers
+_RATE_LIMIT_PREFIX = "x-ratelimit-"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    vary TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    ``Cache-Control`` directives as a dict, e.g. {"max-age": "60", "public": None}
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(headers) -> Optional[float]:
+    """
+    Seconds a response stays fresh from now, None if it must not be stored
+
+    A shared cache prefers ``s-maxage`` over ``max-age``, and both over
+    ``Expires``, and must not store ``private`` responses. Responses without
+    any of them are stored but revalidated on every use.
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    try:
+        age = float(headers.get("Age") or 0)
+    except ValueError:
+        age = 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                return max(float(directives[name]) - age, 0.0)
+            except ValueError:
+                break
+
+    expires = _http_date(headers.get("Expires"))
+    if expires is not None:
+        date = _http_date(headers.get("Date")) or time.time()
+        return max(expires - date - age, 0.0)
+    return 0.0
+
+
+class HTTPCacheStore:
+    """
+    SQLite store of responses keyed by URL, safe to share between processes
+    """
+
+    def __init__(self, path: str, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that created them
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple]:
+        """
+        ``(status, headers, body, vary, expires_at)`` stored for ``key``
+        """
+        row = self.connection.execute(
+            "SELECT status, headers, body, vary, expires_at FROM responses "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        status, headers, body, vary, expires_at = row
+        return status, json.loads(headers), body, json.loads(vary), expires_at
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        headers: Dict,
+        body: bytes,
+        vary: Dict,
+        expires_at: float,
+    ):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    status,
+                    json.dumps(headers),
+                    body,
+                    json.dumps(vary),
+                    time.time(),
+                    expires_at,
+                ),
+            )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def touch(self, key: str, headers: Dict, expires_at: float):
+        """
+        Refresh a revalidated entry without rewriting its body
+        """
+        with self.connection:
+            self.connection.execute(
+                "UPDATE responses SET headers = ?, stored_at = ?, expires_at = ? "
+                "WHERE key = ?",
+                (json.dumps(headers), time.time(), expires_at, key),
+            )
+
+    def prune(self):
+        """
+        Keep the ``max_entries`` most recently stored responses
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM responses WHERE key NOT IN ("
+                "SELECT key FROM responses ORDER BY stored_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM responses")
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter answering GET requests from an HTTPCacheStore
+
+    Responses carry an ``X-Cache`` header: HIT, MISS, REVALIDATED or REPLAY.
+    Only MISS and REVALIDATED responses carry upstream rate-limit headers, the
+    live ones of the request just made.
+    """
+
+    def __init__(self, store: HTTPCacheStore, mode: str = "on", **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP cache mode {mode!r}")
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or self.mode == "off":
+            return super().send(request, **kwargs)
+
+        key = request.url
+        try:
+            entry = self.store.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache lookup failed for {key}: {str(e)}")
+            entry = None
+        if entry is not None and not self._vary_matches(request, entry[3]):
+            entry = None
+
+        if self.mode == "replay":
+            if entry is None:
+                raise requests.ConnectionError(
+                    f"No recorded response for {key}", request=request
+                )
+            return self._build_response(request, entry, "REPLAY")
+
+        if self.mode == "on" and entry is not None:
+            if entry[4] > time.time():
+                return self._build_response(request, entry, "HIT")
+            self._add_validators(request, entry[1])
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            headers = CaseInsensitiveDict(entry[1])
+            headers.update(self._stored_headers(response.headers))
+            headers = dict(headers.items())
+            lifetime = freshness_lifetime(response.headers) or 0.0
+            self._safely(self.store.touch, key, headers, time.time() + lifetime)
+            revalidated = self._build_response(
+                request, (entry[0], headers, entry[2], entry[3], None), "REVALIDATED"
+            )
+            revalidated.headers.update(
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower().startswith(_RATE_LIMIT_PREFIX)
+            )
+            return revalidated
+
+        if response.status_code == 200:
+            self._store(request, response)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    def _store(self, request, response):
+        if self.mode == "record":
+            # Recorded responses never expire, replay serves them as-is
+            expires_at = float("inf")
+        else:
+            lifetime = freshness_lifetime(response.headers)
+            if lifetime is None:
+                return
+            has_validator = "ETag" in response.headers or (
+                "Last-Modified" in response.headers
+            )
+            if lifetime <= 0 and not has_validator:
+                return
+            expires_at = time.time() + lifetime
+
+        vary = {
+            name: self._vary_value(request, name)
+            for name in parse_cache_control(response.headers.get("Vary"))
+            if name != "*"
+        }
+        self._safely(
+            self.store.set,
+            request.url,
+            response.status_code,
+            self._stored_headers(response.headers),
+            response.content,
+            vary,
+            expires_at,
+        )
+
+    @staticmethod
+    def _safely(operation, *args):
+        # A broken cache must never fail the request it sits in front of
+        try:
+            operation(*args)
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache write failed: {str(e)}")
+
+    @staticmethod
+    def _stored_headers(headers) -> Dict:
+        return {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+            and not name.lower().startswith(_RATE_LIMIT_PREFIX)
+        }
+
+    @staticmethod
+    def _vary_value(request, name: str) -> Optional[str]:
+        # Hashed, GitHub varies on Authorization and the token must not be
+        # written to disk
+        value = request.headers.get(name)
+        if value is None:
+            return None
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    @classmethod
+    def _vary_matches(cls, request, vary: Dict) -> bool:
+        return all(
+            cls._vary_value(request, name) == value for name, value in vary.items()
+        )
+
+    @staticmethod
+    def _add_validators(request, headers: Dict):
+        headers = CaseInsensitiveDict(headers)
+        if headers.get("ETag"):
+            request.headers["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            request.headers["If-Modified-Since"] = headers["Last-Modified"]
+
+    def _build_response(self, request, entry, cache_status: str):
+        status, headers, body, _, _ = entry
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else ""
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["X-Cache"] = cache_status
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = bytes(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+http_cache_store = HTTPCacheStore(
+    settings.HTTP_CACHE_PATH, max_entries=settings.HTTP_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,341 @@
+"""
+Streaming trending-keyword extraction with fixed-memory sketches
+
+Titles, descriptions and GitHub topics are tokenized as each source refresh
+lands (through the fetch signals). Keyword counts go into a ring of time
+windows, each holding a Count-Min sketch plus a bounded set of heavy-hitter
+candidates, so memory stays constant however many items flow through. Rising
+keywords are the candidates whose count in the current window is well above
+their average over the previous windows.
+
+Every item counts once per window, so the same repository showing up in each
+refresh does not inflate its keywords. The tracker is built where refreshes run
+and shared with every process through the cache, see dashboard/shared_state.py.
+"""
+
+import heapq
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import receiver
+
+from . import shared_state
+from .ranking import GITHUB, HACKERNEWS, REDDIT
+from .signals import posts_fetched, repositories_fetched, stories_fetched
+
+_PRIME = (1 << 31) - 1
+
+# fmt: off
+# Used when the nltk stopwords corpus is not installed
+_FALLBACK_STOPWORDS = {
+    "a", "about", "after", "all", "also", "am", "an", "and", "any", "are", "as",
+    "at", "be", "been", "before", "being", "between", "both", "but", "by", "can",
+    "could", "did", "do", "does", "doing", "down", "during", "each", "few", "for",
+    "from", "further", "had", "has", "have", "having", "he", "her", "here", "him",
+    "his", "how", "i", "if", "in", "into", "is", "it", "its", "itself", "just",
+    "me", "more", "most", "my", "no", "nor", "not", "now", "of", "off", "on",
+    "once", "only", "or", "other", "our", "out", "over", "own", "same", "she",
+    "should", "so", "some", "such", "than", "that", "the", "their", "them",
+    "then", "there", "these", "they", "this", "those", "through", "to", "too",
+    "under", "until", "up", "very", "was", "we", "were", "what", "when", "where",
+    "which", "while", "who", "whom", "why", "will", "with", "would", "you",
+    "your",
+}
+
+# Words that are everywhere on these platforms and never a topic
+_DOMAIN_STOPWORDS = {
+    "ask", "com", "github", "hn", "http", "https", "new", "show", "use", "using",
+    "via", "vs", "www", "yet",
+}
+# fmt: on
+
+_WORD = re.compile(r"[a-z][a-z0-9+#]*")
+
+
+def _load_stopwords() -> set:
+    try:
+        from nltk.corpus import stopwords
+
+        words = set(stopwords.words("english"))
+    except (ImportError, LookupError):
+        words = set(_FALLBACK_STOPWORDS)
+    return words | _DOMAIN_STOPWORDS
+
+
+STOPWORDS = _load_stopwords()
+
+
+def extract_keywords(texts: Iterable[str]) -> List[str]:
+    """
+    Distinct keywords of an item: words and two-word phrases without stopwords
+    """
+    keywords = []
+    for text in texts:
+        if not text:
+            continue
+        previous = None
+        for word in _WORD.findall(text.lower()):
+            if len(word) < 2 or word in STOPWORDS:
+                previous = None
+                continue
+            keywords.append(word)
+            if previous:
+                keywords.append(f"{previous} {word}")
+            previous = word
+    return list(dict.fromkeys(keywords))
+
+
+def repo_texts(repo: Dict) -> List[str]:
+    return [repo.get("name", ""), repo.get("description", ""), *repo.get("topics", [])]
+
+
+def post_texts(post: Dict) -> List[str]:
+    return [post.get("title", "")]
+
+
+def story_texts(story: Dict) -> List[str]:
+    return [story.get("title", "")]
+
+
+def _hashes(values: Sequence[str]) -> np.ndarray:
+    # Not hash(): it is salted per process, and sketches are shared
+    return np.fromiter(
+        (zlib.crc32(v.encode()) & _PRIME for v in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+
+
+class CountMinSketch:
+    """
+    Approximate counts in a fixed ``depth`` x ``width`` table, never undercounts
+    """
+
+    def __init__(self, width: int, depth: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.table = np.zeros((depth, width), dtype=np.int32)
+        self._a = rng.integers(1, _PRIME, size=(depth, 1), dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, size=(depth, 1), dtype=np.int64)
+        self._rows = np.arange(depth)[:, None]
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        return (self._a * hashes + self._b) % _PRIME % self.width
+
+    def add(self, hashes: np.ndarray, counts: np.ndarray):
+        columns = self._columns(hashes)
+        for row in range(len(self.table)):
+            np.add.at(self.table[row], columns[row], counts)
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        return self.table[self._rows, self._columns(hashes)].min(axis=0)
+
+    def clear(self):
+        self.table[:] = 0
+
+
+class KeywordTracker(shared_state.SharedStore):
+    """
+    Ring of per-window sketches with heavy-hitter candidates
+
+    Memory is ``windows`` x (sketch + ``capacity`` candidates) plus one bitmap
+    of ``seen_bits`` bits used to count each item once per window. Every sketch
+    hashes with its own seed, so collisions are independent across windows.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = 3600,
+        windows: int = 24,
+        sketch_width: int = 4096,
+        sketch_depth: int = 4,
+        capacity: int = 500,
+        seen_bits: int = 1 << 20,
+    ):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.sketches = [
+            CountMinSketch(sketch_width, sketch_depth, seed=window)
+            for window in range(windows)
+        ]
+        self.candidates: List[Dict[str, int]] = [{} for _ in range(windows)]
+        self.items = np.zeros(windows, dtype=np.int64)
+        self.epochs = np.full(windows, -1, dtype=np.int64)
+        self.head = 0
+        self.seen_bits = seen_bits
+        self.seen = np.zeros((seen_bits + 7) // 8, dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def _rotate(self, now: float):
+        """
+        Move the head to the window containing ``now``, clearing skipped windows
+        """
+        epoch = int(now // self.window_seconds)
+        current = self.epochs[self.head]
+        if epoch == current:
+            return
+        if current >= 0 and epoch < current:
+            return  # clock went back, keep counting into the current window
+
+        steps = (
+            len(self.sketches)
+            if current < 0
+            else min(epoch - current, len(self.sketches))
+        )
+        for _ in range(steps):
+            self.head = (self.head + 1) % len(self.sketches)
+            self.sketches[self.head].clear()
+            self.candidates[self.head] = {}
+            self.items[self.head] = 0
+            self.epochs[self.head] = -1
+        self.epochs[self.head] = epoch
+        self.seen[:] = 0
+
+    def ingest(
+        self,
+        platform: str,
+        items: Sequence[Dict],
+        texts_of: Callable[[Dict], List[str]],
+        now: Optional[float] = None,
+    ):
+        """
+        Count the keywords of the items not yet seen in the current window
+        """
+        now = time.time() if now is None else now
+        keys = [f"{platform}:{item['id']}" for item in items]
+        bits = _hashes(keys) % self.seen_bits
+        seen_bytes, masks = bits >> 3, (1 << (bits & 7)).astype(np.uint8)
+
+        with self._lock:
+            self._rotate(now)
+            new = (self.seen[seen_bytes] & masks) == 0
+            np.bitwise_or.at(self.seen, seen_bytes, masks)
+
+            counts = Counter()
+            for item, is_new in zip(items, new):
+                if is_new:
+                    counts.update(extract_keywords(texts_of(item)))
+            if not counts:
+                return
+
+            keywords = list(counts)
+            hashes = _hashes(keywords)
+            sketch = self.sketches[self.head]
+            sketch.add(hashes, np.fromiter(counts.values(), np.int32, len(counts)))
+            self.items[self.head] += int(new.sum())
+
+            candidates = self.candidates[self.head]
+            for keyword, estimate in zip(keywords, sketch.estimate(hashes)):
+                candidates[keyword] = int(estimate)
+            if len(candidates) > self.capacity:
+                self.candidates[self.head] = dict(
+                    heapq.nlargest(
+                        self.capacity, candidates.items(), key=lambda kv: kv[1]
+                    )
+                )
+
+    def _previous_windows(self) -> List[int]:
+        current = self.epochs[self.head]
+        return [
+            i
+            for i in range(len(self.sketches))
+            if i != self.head and 0 <= self.epochs[i] < current
+        ]
+
+    def rising(self, limit: int = 20, min_count: int = 3) -> List[Dict]:
+        """
+        Keywords growing fastest in the current window against previous windows
+        """
+        with self._lock:
+            keywords = [
+                k for k, c in self.candidates[self.head].items() if c >= min_count
+            ]
+            if not keywords:
+                return []
+
+            hashes = _hashes(keywords)
+            current = self.sketches[self.head].estimate(hashes).astype(np.float64)
+            previous = self._previous_windows()
+            if previous:
+                baseline = np.mean(
+                    [self.sketches[i].estimate(hashes) for i in previous], axis=0
+                )
+            else:
+                baseline = np.zeros(len(keywords))
+
+        # Poisson-style surprise: growth over baseline, damped for rare keywords
+        score = (current - baseline) / np.sqrt(baseline + 1)
+        order = np.argsort(-score, kind="stable")[:limit]
+        return [
+            {
+                "keyword": keywords[i],
+                "count": int(current[i]),
+                "baseline": round(float(baseline[i]), 2),
+                "growth": round(float((current[i] + 1) / (baseline[i] + 1)), 2),
+                "score": round(float(score[i]), 2),
+            }
+            for i in order
+            if score[i] > 0
+        ]
+
+    def top(self, limit: int = 20) -> List[Dict]:
+        """
+        Most frequent keywords of the current window
+        """
+        with self._lock:
+            best = heapq.nlargest(
+                limit, self.candidates[self.head].items(), key=lambda kv: kv[1]
+            )
+        return [{"keyword": keyword, "count": count} for keyword, count in best]
+
+    def keywords_for(self, texts: Iterable[str], limit: int = 3) -> List[str]:
+        """
+        An item's own keywords that are the most frequent in the current window
+        """
+        keywords = extract_keywords(texts)
+        if not keywords:
+            return []
+        with self._lock:
+            counts = self.sketches[self.head].estimate(_hashes(keywords))
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [keywords[i] for i in order if counts[i] > 1]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "windows_with_data": int((self.epochs >= 0).sum()),
+                "items_in_window": int(self.items[self.head]),
+                "candidates": len(self.candidates[self.head]),
+                "memory_bytes": sum(s.table.nbytes for s in self.sketches)
+                + self.seen.nbytes,
+            }
+
+
+keyword_tracker = shared_state.register(
+    "keyword_tracker", KeywordTracker(**settings.TRENDING_KEYWORDS)
+)
+
+
+@receiver(repositories_fetched)
+@shared_state.ingests("keyword_tracker")
+def ingest_repositories(sender, repos, **kwargs):
+    keyword_tracker.ingest(GITHUB, repos, repo_texts)
+
+
+@receiver(posts_fetched)
+@shared_state.ingests("keyword_tracker")
+def ingest_posts(sender, posts, **kwargs):
+    keyword_tracker.ingest(REDDIT, posts, post_texts)
+
+
+@receiver(stories_fetched)
+@shared_state.ingests("keyword_tracker")
+def ingest_stories(sender, stories, **kwargs):
+    keyword_tracker.ingest(HACKERNEWS, stories, story_texts)
@@ -0,0 +1,141 @@
+"""
+Measure WebSocket broadcast fan-out time against connection count
+
+Compares the legacy path (each consumer JSON-encodes the event itself) with the
+serialize-once path from dashboard.broadcast. The default ``local`` mode mirrors
+how RedisPubSubChannelLayer delivers inside one process: the event is
+serialized once for PUBLISH, then every subscribed consumer gets the same bytes
+on its own queue. ``settings`` mode goes through the configured channel layer.
+"""
+
+import asyncio
+import json
+import time
+
+from channels.layers import get_channel_layer
+from channels_redis.serializers import registry
+from django.core.management.base import BaseCommand
+
+from dashboard.broadcast import build_event
+
+
+def sample_update(items: int) -> dict:
+    """
+    A trending update roughly the size of a real /api/trending/ payload
+    """
+    return {
+        "trending_topics": [
+            {
+                "id": f"github_{i}",
+                "keyword": f"repository-{i}",
+                "platform": "GitHub",
+                "trend_score": i % 100,
+                "description": "x" * 100,
+                "language": "Python",
+                "url": f"https://github.com/owner/repository-{i}",
+            }
+            for i in range(items)
+        ]
+    }
+
+
+def render(event: dict) -> str:
+    """
+    What DashboardConsumer.dashboard_update puts on the wire for an event
+    """
+    text = event.get("text")
+    if text is None:
+        text = json.dumps({"type": event["update_type"], "message": event["message"]})
+    return text
+
+
+class Command(BaseCommand):
+    help = "Benchmark dashboard broadcast fan-out time against connection count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections",
+            default="100,1000,5000,10000",
+            help="Comma separated connection counts to measure",
+        )
+        parser.add_argument("--items", type=int, default=20)
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument(
+            "--layer",
+            choices=["local", "settings"],
+            default="local",
+            help="Emulated pub/sub local fan-out, or the CHANNEL_LAYERS layer",
+        )
+
+    def handle(self, *args, **options):
+        counts = [int(c) for c in options["connections"].split(",")]
+        message = sample_update(options["items"])
+        legacy_event = {
+            "type": "dashboard.update",
+            "update_type": "trending_update",
+            "message": message,
+        }
+        once_event = build_event("trending_update", message)
+
+        measure = self._measure_local
+        if options["layer"] == "settings":
+            measure = self._measure_layer
+
+        self.stdout.write(
+            f"{'connections':>12} {'legacy ms':>12} {'once ms':>12} {'speedup':>8}"
+        )
+        for count in counts:
+            legacy = asyncio.run(measure(count, legacy_event, options["rounds"]))
+            once = asyncio.run(measure(count, once_event, options["rounds"]))
+            self.stdout.write(
+                f"{count:>12} {legacy:>12.2f} {once:>12.2f} {legacy / once:>7.1f}x"
+            )
+
+    async def _measure_local(self, count, event, rounds):
+        serializer = registry.get_serializer("msgpack")
+        queues = [asyncio.Queue() for _ in range(count)]
+        done = asyncio.Event()
+        remaining = [count]
+
+        async def consumer(queue):
+            while True:
+                data = await queue.get()
+                render(serializer.deserialize(data))
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        tasks = [asyncio.create_task(consumer(queue)) for queue in queues]
+        timings = []
+        for _ in range(rounds):
+            remaining[0] = count
+            done.clear()
+            start = time.perf_counter()
+            data = serializer.serialize(event)
+            for queue in queues:
+                queue.put_nowait(data)
+            await done.wait()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        for task in tasks:
+            task.cancel()
+        return min(timings)
+
+    async def _measure_layer(self, count, event, rounds):
+        layer = get_channel_layer()
+        group = f"fanout-benchmark-{count}"
+        channels = [await layer.new_channel() for _ in range(count)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await layer.group_send(group, event)
+            for channel in channels:
+                render(await layer.receive(channel))
+            timings.append((time.perf_counter() - start) * 1000)
+
+        for channel in channels:
+            await layer.group_discard(group, channel)
+        return min(timings)
@@ -0,0 +1,158 @@
+"""
+Compare the memory cost of dict items with the record types in dashboard.records
+
+Builds the same synthetic GitHub, Reddit and Hacker News API payloads into
+plain dicts (the format the clients used to produce) and into slotted records,
+then reports the retained memory per item (tracemalloc, excluding the raw
+payloads both are built from) and the pickled size of the whole set, which is
+what a cached snapshot of the items costs.
+"""
+
+import gc
+import pickle
+import random
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from dashboard.records import HNStory, RedditPost, Repository
+
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Rust", "Go", "Java", "C++", None]
+SUBREDDITS = ["programming", "webdev", "Python", "javascript", "MachineLearning"]
+
+
+def github_payloads(count: int, rng: random.Random):
+    return [
+        {
+            "id": 10_000_000 + i,
+            "name": f"repository-{i}",
+            "full_name": f"owner-{i % 977}/repository-{i}",
+            "description": "A fast tool for doing things " * rng.randint(1, 4),
+            "stargazers_count": rng.randint(0, 100_000),
+            "forks_count": rng.randint(0, 10_000),
+            "language": rng.choice(LANGUAGES),
+            "html_url": f"https://github.com/owner-{i % 977}/repository-{i}",
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": "2026-01-02T00:00:00Z",
+            "topics": rng.sample(["cli", "ml", "web", "rust", "api", "llm"], 3),
+        }
+        for i in range(count)
+    ]
+
+
+def reddit_payloads(count: int, rng: random.Random):
+    return [
+        {
+            "id": f"t{i:07x}",
+            "title": f"Show and tell: project number {i}",
+            "author": f"user{i % 3001}",
+            "subreddit": rng.choice(SUBREDDITS),
+            "score": rng.randint(0, 5000),
+            "upvote_ratio": 0.93,
+            "num_comments": rng.randint(0, 800),
+            "permalink": f"/r/programming/comments/t{i:07x}/project/",
+            "url": f"https://example.com/post/{i}",
+            "selftext": "Some longer discussion text " * rng.randint(0, 12),
+            "created_utc": 1_760_000_000.0 + i,
+            "link_flair_text": rng.choice(["Discussion", "Project", None]),
+            "domain": "example.com",
+            "is_self": False,
+        }
+        for i in range(count)
+    ]
+
+
+def hackernews_payloads(count: int, rng: random.Random):
+    return [
+        {
+            "id": 40_000_000 + i,
+            "title": f"Launch HN: Startup {i} makes things faster",
+            "url": f"https://startup-{i}.example.com/",
+            "score": rng.randint(10, 2000),
+            "by": f"hn_user{i % 2003}",
+            "time": 1_760_000_000 + i,
+            "descendants": rng.randint(0, 600),
+            "type": "story",
+        }
+        for i in range(count)
+    ]
+
+
+def measure(build):
+    """
+    Retained bytes of what ``build()`` returns, and the object itself
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return retained, result
+
+
+class Command(BaseCommand):
+    help = "Benchmark memory of dict items against the slotted record types"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repos", type=int, default=20000)
+        parser.add_argument("--posts", type=int, default=10000)
+        parser.add_argument("--stories", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        sources = [
+            (
+                "Repository",
+                github_payloads(options["repos"], rng),
+                lambda raw: Repository.from_api(raw),
+            ),
+            (
+                "RedditPost",
+                reddit_payloads(options["posts"], rng),
+                lambda raw: RedditPost.from_api(raw, "programming"),
+            ),
+            (
+                "HNStory",
+                hackernews_payloads(options["stories"], rng),
+                HNStory.from_api,
+            ),
+        ]
+
+        self.stdout.write(
+            f"{'type':<12}{'items':>8}{'dict B/item':>14}{'record B/item':>15}"
+            f"{'saved':>8}"
+        )
+        totals = {"dict": 0, "record": 0}
+        all_dicts, all_records = [], []
+        for name, payloads, parse in sources:
+            # The dict format is exactly what the clients produced before records
+            dict_bytes, dicts = measure(
+                lambda: [parse(raw).to_dict() for raw in payloads]
+            )
+            record_bytes, records = measure(lambda: [parse(raw) for raw in payloads])
+            count = max(len(payloads), 1)
+            totals["dict"] += dict_bytes
+            totals["record"] += record_bytes
+            all_dicts.extend(dicts)
+            all_records.extend(records)
+
+            self.stdout.write(
+                f"{name:<12}{len(payloads):>8}{dict_bytes / count:>14.0f}"
+                f"{record_bytes / count:>15.0f}"
+                f"{1 - record_bytes / max(dict_bytes, 1):>8.0%}"
+            )
+
+        dict_pickle = len(pickle.dumps(all_dicts, protocol=pickle.HIGHEST_PROTOCOL))
+        record_pickle = len(pickle.dumps(all_records, protocol=pickle.HIGHEST_PROTOCOL))
+        self.stdout.write("")
+        self.stdout.write(
+            f"in memory: dicts {totals['dict'] / 1e6:.1f} MB, "
+            f"records {totals['record'] / 1e6:.1f} MB"
+        )
+        self.stdout.write(
+            f"pickled snapshot: dicts {dict_pickle / 1e6:.1f} MB, "
+            f"records {record_pickle / 1e6:.1f} MB"
+        )
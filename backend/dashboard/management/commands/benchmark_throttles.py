@@ -0,0 +1,122 @@
+"""
+Measure the per-request cost of DRF's throttles against the GCRA throttles
+
+Worker threads run throttle checks as fast as they can for a pool of client
+addresses, the way a busy API process evaluates AnonRateThrottle on every
+request. Reported are checks per second, latency percentiles and the share of
+requests throttled. DRF's history throttle goes through the default cache, the
+GCRA throttle needs it to be django_redis, e.g.:
+
+    ENVIRONMENT=production REDIS_URL=redis://localhost:6379/1 \\
+        python manage.py benchmark_throttles --rate 100000/hour
+
+Use a high --rate to measure clients under their limit (the local fast path),
+and a low one to measure the throttled path.
+"""
+
+import threading
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from dashboard.throttling import (
+    GCRAAnonRateThrottle,
+    GCRAThrottleMixin,
+    local_buckets,
+)
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[
+        min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark DRF's history throttle against the GCRA throttle"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", default="1000/hour")
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        if not GCRAAnonRateThrottle.uses_redis():
+            self.stderr.write(
+                "The default cache is not django_redis: GCRAAnonRateThrottle "
+                "falls back to DRF's behaviour and both rows measure the same thing"
+            )
+
+        factory = RequestFactory()
+        requests = []
+        for i in range(options["clients"]):
+            request = factory.get(
+                "/api/trending/", REMOTE_ADDR=f"10.0.{i // 250}.{i % 250}"
+            )
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        self.stdout.write(
+            f"{'throttle':<22}{'checks/s':>11}{'p50 us':>9}{'p99 us':>9}"
+            f"{'throttled':>11}"
+        )
+        for base in (AnonRateThrottle, GCRAAnonRateThrottle):
+            throttle_class = type(base.__name__, (base,), {"rate": options["rate"]})
+            self._reset(throttle_class, requests)
+            self._run(throttle_class, requests, options)
+
+    def _reset(self, throttle_class, requests):
+        throttle = throttle_class()
+        keys = [throttle.get_cache_key(request, None) for request in requests]
+        if (
+            issubclass(throttle_class, GCRAThrottleMixin)
+            and throttle_class.uses_redis()
+        ):
+            from django_redis import get_redis_connection
+
+            get_redis_connection("default").delete(*keys)
+        else:
+            cache.delete_many(keys)
+        local_buckets.entries.clear()
+
+    def _run(self, throttle_class, requests, options):
+        per_thread = options["requests"] // options["threads"]
+        latencies = [[] for _ in range(options["threads"])]
+        throttled = [0] * options["threads"]
+
+        def worker(index: int):
+            timings = latencies[index]
+            for i in range(per_thread):
+                request = requests[(index * per_thread + i) % len(requests)]
+                start = time.perf_counter()
+                allowed = throttle_class().allow_request(request, None)
+                timings.append(time.perf_counter() - start)
+                if not allowed:
+                    throttled[index] += 1
+
+        threads = [
+            threading.Thread(target=worker, args=(i,))
+            for i in range(options["threads"])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(t for thread_timings in latencies for t in thread_timings)
+        total = len(timings)
+        self.stdout.write(
+            f"{throttle_class.__name__:<22}{total / elapsed:>11.0f}"
+            f"{percentile(timings, 0.5) * 1e6:>9.0f}"
+            f"{percentile(timings, 0.99) * 1e6:>9.0f}"
+            f"{sum(throttled) / max(total, 1):>11.1%}"
+        )
@@ -0,0 +1,157 @@
+"""
+Load-test an HTTP endpoint of a running server
+
+Keeps ``--connections`` HTTP/1.1 keep-alive connections busy for
+``--duration`` seconds, each sending the next request as soon as the previous
+response is read, then reports requests/s, latency percentiles and errors.
+Used to compare serving modes (daphne against gunicorn with uvicorn workers,
+see gunicorn.conf.py) on the same host. ``--server-pid`` reports memory and
+CPU of that process and its children, i.e. all workers of a gunicorn master.
+"""
+
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .loadtest_websockets import read_process_stats
+
+
+def read_process_tree_stats(pid) -> dict:
+    """
+    read_process_stats summed over a process and its direct children
+    """
+    pids = [pid]
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+
+    totals = {"rss_mb": 0.0, "cpu_seconds": 0.0}
+    for stats in map(read_process_stats, pids):
+        if stats["rss_mb"] is None:
+            continue
+        totals["rss_mb"] += stats["rss_mb"]
+        totals["cpu_seconds"] += stats["cpu_seconds"]
+    return totals
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """
+    Read one response, return its status code
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by server")
+    status = int(status_line.split()[1])
+
+    length, chunked = 0, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status
+
+
+class Command(BaseCommand):
+    help = "Load-test an HTTP endpoint with concurrent keep-alive connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", required=True, help="e.g. http://127.0.0.1:8000/api/trending/"
+        )
+        parser.add_argument("--connections", type=int, default=100)
+        parser.add_argument("--duration", type=float, default=30.0)
+        parser.add_argument(
+            "--server-pid", type=int, help="Server process to report memory/CPU for"
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http":
+            raise CommandError("Only http:// URLs are supported")
+        for line in asyncio.run(self._run(url, options)):
+            self.stdout.write(line)
+
+    async def _run(self, url, options):
+        host, port = url.hostname, url.port or 80
+        path = url.path or "/"
+        if url.query:
+            path += f"?{url.query}"
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\n"
+            "Accept: application/json\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+
+        latencies, statuses, errors = [], {}, []
+        deadline = time.perf_counter() + options["duration"]
+
+        async def connection():
+            reader = writer = None
+            while time.perf_counter() < deadline:
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(host, port)
+                    start = time.perf_counter()
+                    writer.write(request)
+                    status = await read_response(reader)
+                    latencies.append(time.perf_counter() - start)
+                    statuses[status] = statuses.get(status, 0) + 1
+                except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                    errors.append(e)
+                    if writer is not None:
+                        writer.close()
+                    reader = writer = None
+            if writer is not None:
+                writer.close()
+
+        server_pid = options["server_pid"]
+        stats_before = read_process_tree_stats(server_pid) if server_pid else {}
+        start = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(options["connections"])))
+        elapsed = time.perf_counter() - start
+        stats_after = read_process_tree_stats(server_pid) if server_pid else {}
+
+        latencies.sort()
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+
+        report = [
+            f"requests:      {len(latencies)} in {elapsed:.1f} s "
+            f"({len(errors)} connection errors)",
+            f"throughput:    {len(latencies) / elapsed:.0f} requests/s",
+            f"latency:       p50 {percentile(0.5) * 1000:.1f} ms, "
+            f"p99 {percentile(0.99) * 1000:.1f} ms, "
+            f"max {percentile(1.0) * 1000:.1f} ms",
+            "status codes:  "
+            + ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items())),
+        ]
+        if server_pid:
+            report += [
+                f"server pid {server_pid} and children:",
+                f"  RSS {stats_after['rss_mb']:.1f} MB, "
+                f"CPU {stats_after['cpu_seconds'] - stats_before['cpu_seconds']:.2f} s",
+            ]
+        return report
@@ -0,0 +1,257 @@
+"""
+Load-test the dashboard WebSocket fan-out
+
+Opens many simulated clients against ``ws/dashboard/`` and drives
+``dashboard_update`` broadcasts at a fixed rate, then reports connect rate,
+time from broadcast to last delivery, and memory / CPU use.
+
+By default clients run in-process against the routing in dashboard/routing.py,
+using either the in-memory channel layer or the layer from settings (a local
+Redis). With ``--url`` clients open real sockets to a running server (daphne,
+uvicorn) and ``--server-pid`` reports that process's memory and CPU.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.broadcast import abroadcast_update
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def read_process_stats(pid) -> dict:
+    """
+    Resident memory (MB) and total CPU seconds of a process, from /proc
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss_kb = next(
+                int(line.split()[1]) for line in f if line.startswith("VmRSS:")
+            )
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / CLK_TCK
+    except (OSError, StopIteration, IndexError, ValueError):
+        return {"rss_mb": None, "cpu_seconds": None}
+    return {"rss_mb": round(rss_kb / 1024, 1), "cpu_seconds": cpu_seconds}
+
+
+class InProcessClient:
+    """
+    Simulated dashboard client talking to the ASGI app directly
+    """
+
+    def __init__(self, application):
+        from channels.testing import WebsocketCommunicator
+
+        self.communicator = WebsocketCommunicator(application, "/ws/dashboard/")
+
+    async def connect(self):
+        connected, _ = await self.communicator.connect(timeout=30)
+        if not connected:
+            raise ConnectionError("WebSocket connection rejected")
+        await self.communicator.receive_from(timeout=30)  # welcome message
+
+    async def receive(self):
+        return await self.communicator.receive_from(timeout=3600)
+
+    async def close(self):
+        await self.communicator.disconnect()
+
+
+class RemoteClient:
+    """
+    Simulated dashboard client on a real socket
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.socket = None
+
+    async def connect(self):
+        import websockets
+
+        self.socket = await websockets.connect(self.url, max_queue=None)
+        await self.socket.recv()  # welcome message
+
+    async def receive(self):
+        return await self.socket.recv()
+
+    async def close(self):
+        await self.socket.close()
+
+
+class Command(BaseCommand):
+    help = "Load-test dashboard WebSocket broadcasts with many simulated clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=1000)
+        parser.add_argument(
+            "--layer",
+            choices=["memory", "redis"],
+            default="memory",
+            help="In-memory channel layer, or the Redis layer from settings",
+        )
+        parser.add_argument(
+            "--rate", type=float, default=1.0, help="Broadcasts per second"
+        )
+        parser.add_argument("--broadcasts", type=int, default=10)
+        parser.add_argument("--payload-items", type=int, default=20)
+        parser.add_argument(
+            "--connect-concurrency",
+            type=int,
+            default=200,
+            help="Clients connecting at the same time",
+        )
+        parser.add_argument(
+            "--url",
+            help="Connect real sockets to a running server, e.g. "
+            "ws://127.0.0.1:8000/ws/dashboard/ (needs --layer redis)",
+        )
+        parser.add_argument(
+            "--server-pid", type=int, help="Server process to report memory/CPU for"
+        )
+
+    def handle(self, *args, **options):
+        if options["url"] and options["layer"] == "memory":
+            raise CommandError("--url needs --layer redis to reach the server")
+
+        if options["layer"] == "memory":
+            from channels.layers import channel_layers
+
+            settings.CHANNEL_LAYERS = {
+                "default": {
+                    "BACKEND": "channels.layers.InMemoryChannelLayer",
+                    "CONFIG": {"capacity": options["broadcasts"] + 10},
+                }
+            }
+            channel_layers.backends.clear()
+
+        report = asyncio.run(self._run(options))
+        for line in report:
+            self.stdout.write(line)
+
+    def _make_client(self, options):
+        if options["url"]:
+            return RemoteClient(options["url"])
+
+        from channels.routing import URLRouter
+
+        from dashboard.routing import websocket_urlpatterns
+
+        if not hasattr(self, "_application"):
+            self._application = URLRouter(websocket_urlpatterns)
+        return InProcessClient(self._application)
+
+    async def _run(self, options):
+        client_count = options["clients"]
+        broadcast_count = options["broadcasts"]
+        server_pid = options["server_pid"] or (None if options["url"] else os.getpid())
+
+        stats_before = read_process_stats(server_pid) if server_pid else {}
+        cpu_before = time.process_time()
+
+        # Connect clients in bounded batches
+        clients = []
+        semaphore = asyncio.Semaphore(options["connect_concurrency"])
+
+        async def connect_one():
+            async with semaphore:
+                client = self._make_client(options)
+                await client.connect()
+                clients.append(client)
+
+        connect_start = time.perf_counter()
+        results = await asyncio.gather(
+            *(connect_one() for _ in range(client_count)), return_exceptions=True
+        )
+        connect_seconds = time.perf_counter() - connect_start
+        connect_errors = [r for r in results if isinstance(r, Exception)]
+        stats_connected = read_process_stats(server_pid) if server_pid else {}
+
+        # last_delivery[seq] is when the slowest client got broadcast seq
+        sent_at = {}
+        last_delivery = {}
+        delivered = {seq: 0 for seq in range(broadcast_count)}
+
+        async def listen(client):
+            while True:
+                data = json.loads(await client.receive())
+                if data.get("type") != "loadtest":
+                    continue
+                seq = data["message"]["seq"]
+                delivered[seq] += 1
+                last_delivery[seq] = time.perf_counter()
+                if seq == broadcast_count - 1:
+                    return
+
+        listeners = [asyncio.ensure_future(listen(c)) for c in clients]
+        payload = [
+            {"id": i, "description": "x" * 100} for i in range(options["payload_items"])
+        ]
+
+        interval = 1.0 / options["rate"]
+        for seq in range(broadcast_count):
+            sent_at[seq] = time.perf_counter()
+            await abroadcast_update(
+                "loadtest", {"seq": seq, "items": payload}, key=f"loadtest-{seq}"
+            )
+            await asyncio.sleep(max(interval - (time.perf_counter() - sent_at[seq]), 0))
+
+        _, pending = await asyncio.wait(listeners, timeout=60)
+        for task in pending:
+            task.cancel()
+
+        stats_after = read_process_stats(server_pid) if server_pid else {}
+        cpu_seconds = time.process_time() - cpu_before
+
+        latencies = [
+            (last_delivery[seq] - sent_at[seq]) * 1000
+            for seq in range(broadcast_count)
+            if seq in last_delivery
+        ]
+        complete = sum(1 for count in delivered.values() if count == len(clients))
+
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+        report = [
+            f"clients connected:        {len(clients)}/{client_count} "
+            f"({len(connect_errors)} errors)",
+            f"connect rate:             {len(clients) / connect_seconds:.0f} clients/s",
+            f"broadcasts fully delivered: {complete}/{broadcast_count}",
+        ]
+        if latencies:
+            latencies.sort()
+            p95 = latencies[int(round(0.95 * (len(latencies) - 1)))]
+            report += [
+                "broadcast -> last delivery:",
+                f"  p50 {statistics.median(latencies):.1f} ms, "
+                f"p95 {p95:.1f} ms, max {latencies[-1]:.1f} ms",
+            ]
+        if server_pid and stats_after.get("rss_mb") is not None:
+            server_cpu = stats_after["cpu_seconds"] - stats_before["cpu_seconds"]
+            connection_mb = stats_connected["rss_mb"] - stats_before["rss_mb"]
+            report += [
+                f"server pid {server_pid}:",
+                f"  RSS {stats_before['rss_mb']} MB idle, "
+                f"{stats_connected['rss_mb']} MB connected, "
+                f"{stats_after['rss_mb']} MB after broadcasts",
+                f"  ~{connection_mb * 1024 / max(len(clients), 1):.1f} KB RSS "
+                "per connection",
+                f"  CPU {server_cpu:.2f} s",
+            ]
+        if not options["url"]:
+            report.append(
+                f"harness CPU (clients and server in-process): {cpu_seconds:.2f} s"
+            )
+        return report
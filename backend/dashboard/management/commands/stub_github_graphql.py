@@ -0,0 +1,198 @@
+"""
+Local stub of the GitHub GraphQL API for the repository enricher
+
+Answers the batched queries of GitHubGraphQLEnricher (api_clients.py) with
+deterministic repository details derived from each owner/name, so enrichment
+can be developed without a token or rate limit:
+
+    python manage.py stub_github_graphql --port 8765
+    GITHUB_GRAPHQL_URL=http://127.0.0.1:8765/graphql python manage.py runserver
+
+Repositories whose name starts with "missing" come back as null plus a
+NOT_FOUND error, like deleted repositories on GitHub. /bad-gateway answers 502
+and /html answers 200 with an HTML page, the two ways a proxy in front of the
+API fails. ``--self-test`` runs the enricher against the stub, checks batching,
+caching and those failure modes, and exits non-zero on any mismatch.
+"""
+
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from dashboard.api_clients import GitHubGraphQLEnricher
+
+HTML_PAGE = b"<html><body><h1>502 Bad Gateway</h1></body></html>"
+
+
+def stub_repository(owner: str, name: str) -> Dict:
+    """
+    Repository node with the RepositoryDetails fields, derived from its name
+    """
+    seed = zlib.crc32(f"{owner}/{name}".lower().encode())
+    return {
+        "primaryLanguage": {"name": "Python"},
+        "languages": {
+            "totalSize": 1000,
+            "edges": [
+                {"size": 750, "node": {"name": "Python"}},
+                {"size": 250, "node": {"name": "Shell"}},
+            ],
+        },
+        "latestRelease": {
+            "tagName": f"v{seed % 10}.{seed % 7}.0",
+            "name": f"{name} {seed % 10}.{seed % 7}",
+            "publishedAt": "2026-10-01T12:00:00Z",
+            "url": f"https://github.com/{owner}/{name}/releases/tag/v{seed % 10}",
+        },
+        "mentionableUsers": {"totalCount": seed % 500},
+        "watchers": {"totalCount": seed % 2000},
+        "openIssues": {"totalCount": seed % 300},
+        "pushedAt": "2026-10-18T08:00:00Z",
+    }
+
+
+def graphql_response(variables: Dict) -> Dict:
+    """
+    Response to an enricher query, one ``r<i>`` field per owner/name pair
+    """
+    data, errors = {}, []
+    i = 0
+    while f"o{i}" in variables:
+        owner, name = variables[f"o{i}"], variables[f"n{i}"]
+        if name.startswith("missing"):
+            data[f"r{i}"] = None
+            errors.append(
+                {
+                    "type": "NOT_FOUND",
+                    "path": [f"r{i}"],
+                    "message": f"Could not resolve to a Repository with the "
+                    f"name '{owner}/{name}'.",
+                }
+            )
+        else:
+            data[f"r{i}"] = stub_repository(owner, name)
+        i += 1
+
+    data["rateLimit"] = {
+        "cost": 1,
+        "remaining": 4999,
+        "limit": 5000,
+        "resetAt": "2026-10-19T00:00:00Z",
+    }
+    response = {"data": data}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.queries += 1
+
+        if self.path == "/bad-gateway":
+            self._send(502, HTML_PAGE, "text/html")
+        elif self.path == "/html":
+            self._send(200, HTML_PAGE, "text/html")
+        else:
+            variables = json.loads(body).get("variables") or {}
+            self._send(
+                200,
+                json.dumps(graphql_response(variables)).encode(),
+                "application/json",
+            )
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port: int = 0) -> ThreadingHTTPServer:
+    """
+    Serve the stub from a daemon thread, port 0 picks a free one
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubGraphQLHandler)
+    server.queries = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Command(BaseCommand):
+    help = "Serve a local GitHub GraphQL stub, or self-test the enricher against it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--self-test",
+            action="store_true",
+            help="Run the enricher against the stub on a free port and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["self_test"]:
+            self._self_test()
+            return
+
+        server = start_stub(options["port"])
+        self.stdout.write(
+            f"GitHub GraphQL stub on http://127.0.0.1:{server.server_port}/graphql"
+        )
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+    def _self_test(self):
+        server = start_stub()
+        base = f"http://127.0.0.1:{server.server_port}"
+        failures = []
+
+        def check(name: str, ok: bool):
+            self.stdout.write(f"{'ok  ' if ok else 'FAIL'} {name}")
+            if not ok:
+                failures.append(name)
+
+        names = ["octocat/hello-world", "django/django", "ghost/missing-repo"]
+        with override_settings(GITHUB_GRAPHQL_BATCH_SIZE=2):
+            enricher = GitHubGraphQLEnricher(url=f"{base}/graphql")
+            enricher.token = "stub"
+
+            details = enricher.get_details(names)
+            check("two batches for three repositories", server.queries == 2)
+            check(
+                "details parsed",
+                details.get("django/django")
+                == enricher._parse_details(stub_repository("django", "django")),
+            )
+            check(
+                "missing repository is None",
+                details.get("ghost/missing-repo", 0) is None,
+            )
+            check("rate limit recorded", enricher.get_rate_limit()["total_cost"] == 2)
+
+            enricher.get_details(names)
+            check("second call served from cache", server.queries == 2)
+
+            for path in ("html", "bad-gateway"):
+                failing = GitHubGraphQLEnricher(url=f"{base}/{path}")
+                failing.token = "stub"
+                try:
+                    result = failing.get_details(["octocat/hello-world"])
+                except Exception as e:
+                    result = e
+                check(f"/{path} gives no details and no exception", result == {})
+
+        server.shutdown()
+        if failures:
+            raise CommandError(f"{len(failures)} check(s) failed")
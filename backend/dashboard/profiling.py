@@ -0,0 +1,244 @@
+"""
+On-demand CPU and memory profiling for dashboard API views
+
+A request is profiled when a staff user sends the ``X-Profile`` header or when
+it falls into the configured sample fraction. Each capture stores a cProfile
+dump (loadable with ``pstats``) and a tracemalloc snapshot (loadable with
+``tracemalloc.Snapshot.load``) in a bounded directory on disk. Only staff
+users are told the id of a capture, in the ``X-Profile-Id`` response header.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.http import FileResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILED_VIEW_MODULE = "dashboard.views"
+CAPTURE_KINDS = {
+    "pstats": ".pstats",
+    "tracemalloc": ".tracemalloc",
+}
+
+
+class ProfileStore:
+    """
+    Bounded on-disk store for profiling captures, oldest captures are evicted first
+    """
+
+    def __init__(self, directory: str, max_captures: int = 50):
+        self.directory = Path(directory)
+        self.max_captures = max_captures
+        self._lock = threading.Lock()
+
+    def _path(self, capture_id: str, suffix: str) -> Path:
+        return self.directory / f"{capture_id}{suffix}"
+
+    def save(
+        self,
+        profiler: cProfile.Profile,
+        snapshot: Optional[tracemalloc.Snapshot],
+        metadata: Dict,
+    ) -> str:
+        """
+        Persist one capture and prune the store back to its size bound
+        """
+        capture_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        profiler.dump_stats(str(self._path(capture_id, CAPTURE_KINDS["pstats"])))
+        if snapshot is not None:
+            snapshot.dump(str(self._path(capture_id, CAPTURE_KINDS["tracemalloc"])))
+
+        metadata = dict(metadata, id=capture_id)
+        with open(self._path(capture_id, ".json"), "w") as f:
+            json.dump(metadata, f)
+
+        self._prune()
+        return capture_id
+
+    def _prune(self):
+        with self._lock:
+            captures = sorted(self.directory.glob("*.json"), key=os.path.getmtime)
+            for meta_path in captures[: max(len(captures) - self.max_captures, 0)]:
+                capture_id = meta_path.stem
+                for suffix in list(CAPTURE_KINDS.values()) + [".json"]:
+                    try:
+                        self._path(capture_id, suffix).unlink()
+                    except FileNotFoundError:
+                        pass
+
+    def list(self) -> List[Dict]:
+        """
+        Return capture metadata, newest first
+        """
+        if not self.directory.exists():
+            return []
+
+        captures = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                with open(meta_path) as f:
+                    captures.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable profile capture {meta_path}: {e}")
+
+        captures.sort(key=lambda c: c.get("started_at", 0), reverse=True)
+        return captures
+
+    def get_path(self, capture_id: str, kind: str) -> Optional[Path]:
+        """
+        Resolve the file for a capture, or None if it does not exist
+        """
+        suffix = CAPTURE_KINDS.get(kind)
+        if suffix is None or not capture_id.replace("-", "").isalnum():
+            return None
+
+        path = self._path(capture_id, suffix)
+        return path if path.exists() else None
+
+
+profile_store = ProfileStore(
+    settings.PROFILING_DIR, max_captures=settings.PROFILING_MAX_CAPTURES
+)
+
+
+def _is_staff(request) -> bool:
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+class ProfilingMiddleware:
+    """
+    Profile dashboard API views on demand (staff header) or by sampling
+
+    Only one request per process is profiled at a time, since cProfile and
+    tracemalloc are process-wide. Requests arriving while a capture is running
+    are served normally.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._busy = threading.Lock()
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _should_profile(self, request) -> bool:
+        if not settings.PROFILING_ENABLED:
+            return False
+
+        if request.META.get(PROFILE_HEADER):
+            return _is_staff(request)
+
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func.__module__ != PROFILED_VIEW_MODULE:
+            return None
+        if not self._should_profile(request):
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+
+        try:
+            return self._profile_view(request, view_func, view_args, view_kwargs)
+        finally:
+            self._busy.release()
+
+    def _profile_view(self, request, view_func, view_args, view_kwargs):
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile()
+        started_at = time.time()
+        start = time.perf_counter()
+
+        profiler.enable()
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+            # DRF responses render lazily, include serialization in the capture
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - start) * 1000
+            snapshot = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+        try:
+            capture_id = profile_store.save(
+                profiler,
+                snapshot,
+                {
+                    "path": request.path,
+                    "method": request.method,
+                    "view": getattr(view_func, "cls", view_func).__name__,
+                    "status_code": response.status_code,
+                    "started_at": started_at,
+                    "duration_ms": round(duration_ms, 2),
+                    "traced_bytes": current_bytes,
+                    "peak_traced_bytes": peak_bytes,
+                    "trigger": (
+                        "header" if request.META.get(PROFILE_HEADER) else "sample"
+                    ),
+                },
+            )
+            if _is_staff(request):
+                response["X-Profile-Id"] = capture_id
+            logger.info(f"Saved profile {capture_id} for {request.path}")
+        except OSError as e:
+            logger.error(f"Failed to save profile for {request.path}: {str(e)}")
+
+        return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """
+    List stored profiling captures (admin only)
+    """
+    captures = profile_store.list()
+    return Response(
+        {
+            "captures": captures,
+            "count": len(captures),
+            "max_captures": profile_store.max_captures,
+            "enabled": settings.PROFILING_ENABLED,
+            "sample_rate": settings.PROFILING_SAMPLE_RATE,
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_download(request, capture_id, kind):
+    """
+    Download the pstats or tracemalloc file of one capture (admin only)
+    """
+    path = profile_store.get_path(capture_id, kind)
+    if path is None:
+        return Response({"error": "Profile capture not found"}, status=404)
+
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
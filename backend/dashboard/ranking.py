@@ -0,0 +1,227 @@
+"""
+Vectorized cross-platform ranking for trending topics
+
+Candidates from every source are loaded into columnar NumPy arrays, so scoring
+and top-k selection cost a handful of array operations however many items are
+ranked. Scores are normalized per platform (log-scaled against the platform's
+best item), so GitHub stars and Reddit/HN points become comparable, then
+weighted, combined with engagement and decayed by age.
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+
+GITHUB = "GitHub"
+REDDIT = "Reddit"
+HACKERNEWS = "Hacker News"
+PLATFORMS = (GITHUB, REDDIT, HACKERNEWS)
+
+
+class Candidates:
+    """
+    Columnar view of ranking candidates across all platforms
+
+    Row ``i`` refers to ``sources[platform[i]][index[i]]``.
+    """
+
+    def __init__(self, repos: Sequence, posts: Sequence, stories: Sequence):
+        sizes = (len(repos), len(posts), len(stories))
+        self.platform = np.repeat(np.arange(len(PLATFORMS), dtype=np.int8), sizes)
+        self.index = np.concatenate([np.arange(n, dtype=np.int64) for n in sizes])
+
+        self.popularity = np.fromiter(
+            [r["stars"] for r in repos]
+            + [p["score"] for p in posts]
+            + [s["score"] for s in stories],
+            dtype=np.float64,
+            count=sum(sizes),
+        )
+        self.engagement = np.fromiter(
+            [r["forks"] for r in repos]
+            + [p["num_comments"] for p in posts]
+            + [s["descendants"] or 0 for s in stories],
+            dtype=np.float64,
+            count=sum(sizes),
+        )
+        self.created = np.concatenate(
+            [
+                _iso_to_epoch([r.get("created_at") for r in repos]),
+                np.fromiter(
+                    (p.get("created_utc") or 0 for p in posts), np.float64, len(posts)
+                ),
+                np.fromiter(
+                    (s.get("time") or 0 for s in stories), np.float64, len(stories)
+                ),
+            ]
+        )
+
+    def __len__(self):
+        return len(self.platform)
+
+
+def _iso_to_epoch(values: List[Optional[str]]) -> np.ndarray:
+    """
+    Convert GitHub "2024-01-01T00:00:00Z" timestamps to epoch seconds (0 if missing)
+    """
+    stamps = np.array([v[:19] if v else "NaT" for v in values], dtype="datetime64[s]")
+    epoch = stamps.astype(np.int64).astype(np.float64)
+    epoch[np.isnat(stamps)] = 0
+    return epoch
+
+
+def _per_platform_normalize(values: np.ndarray, platform: np.ndarray) -> np.ndarray:
+    """
+    Log-scale values and divide by the best value on the same platform
+    """
+    scaled = np.log1p(np.maximum(values, 0))
+    best = np.zeros(len(PLATFORMS))
+    np.maximum.at(best, platform, scaled)
+    best[best == 0] = 1.0
+    return scaled / best[platform]
+
+
+def score_candidates(
+    candidates: Candidates, config: Optional[Dict] = None, now: Optional[float] = None
+) -> np.ndarray:
+    """
+    Score every candidate, higher is more trending
+    """
+    config = config or settings.TRENDING_RANKING
+    now = time.time() if now is None else now
+
+    platform_weights = np.array(
+        [config["platform_weights"].get(p, 1.0) for p in PLATFORMS]
+    )
+    half_lives = np.array([config["half_life_hours"].get(p, 24.0) for p in PLATFORMS])
+
+    popularity = _per_platform_normalize(candidates.popularity, candidates.platform)
+    engagement = _per_platform_normalize(candidates.engagement, candidates.platform)
+
+    # Items without a timestamp are treated as brand new
+    created = np.where(candidates.created > 0, candidates.created, now)
+    age_hours = np.maximum(now - created, 0) / 3600.0
+    decay = np.exp2(-age_hours / half_lives[candidates.platform])
+
+    return (
+        platform_weights[candidates.platform]
+        * (
+            config["popularity_weight"] * popularity
+            + config["engagement_weight"] * engagement
+        )
+        * decay
+    )
+
+
+def merge_duplicates(scores: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """
+    Combine scores of rows sharing a group id onto the group's best row
+
+    The best row of each group gets the group's summed score, the other rows
+    get -inf so they are never selected on their own.
+    """
+    combined = np.bincount(groups, weights=scores)
+    order = np.lexsort((-scores, groups))
+    sorted_groups = groups[order]
+    is_best = np.ones(len(order), dtype=bool)
+    is_best[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    best_rows = order[is_best]
+
+    merged = np.full(len(scores), -np.inf)
+    merged[best_rows] = combined[groups[best_rows]]
+    return merged
+
+
+def top_k(
+    scores: np.ndarray,
+    platform: np.ndarray,
+    k: int,
+    max_per_platform: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Indices of the k best scores in descending order, using partial selection
+
+    With ``max_per_platform`` no platform takes more than that many slots.
+    """
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if max_per_platform:
+        # Partial selection of each platform's best, nothing else can make the cut
+        per_platform = min(k, max_per_platform)
+        pools = []
+        for p in range(len(PLATFORMS)):
+            rows = np.flatnonzero(platform == p)
+            if len(rows) > per_platform:
+                rows = rows[np.argpartition(-scores[rows], per_platform - 1)]
+                rows = rows[:per_platform]
+            pools.append(rows)
+        pool = np.concatenate(pools)
+    elif k < n:
+        pool = np.argpartition(-scores, k - 1)[:k]
+    else:
+        pool = np.arange(n)
+
+    pool = pool[np.isfinite(scores[pool])]
+    return pool[np.argsort(-scores[pool], kind="stable")][:k]
+
+
+def rank(
+    repos: Sequence,
+    posts: Sequence,
+    stories: Sequence,
+    config: Optional[Dict] = None,
+    groups: Optional[Sequence[int]] = None,
+) -> List[Tuple[str, int, float, List[Tuple[str, int]]]]:
+    """
+    Rank all sources together
+
+    Rows sharing a value in ``groups`` (one entry per repo, then post, then
+    story) are duplicates and compete as one item with their combined score.
+
+    Returns ``(platform, index into that source, trend_score, duplicates)`` for
+    the selected items, best first, with trend_score scaled to 0-100 and
+    duplicates listing the ``(platform, index)`` of the merged rows.
+    """
+    config = config or settings.TRENDING_RANKING
+    candidates = Candidates(repos, posts, stories)
+    scores = score_candidates(candidates, config)
+    if groups is not None:
+        groups = np.asarray(groups, dtype=np.int64)
+        scores = merge_duplicates(scores, groups)
+
+    selected = top_k(
+        scores, candidates.platform, config["limit"], config.get("max_per_platform")
+    )
+    if len(selected) == 0:
+        return []
+
+    if groups is not None:
+        # Rows of each selected group, from one sort instead of a scan per item
+        by_group = np.argsort(groups, kind="stable")
+        sorted_groups = groups[by_group]
+        starts = np.searchsorted(sorted_groups, groups[selected], side="left")
+        ends = np.searchsorted(sorted_groups, groups[selected], side="right")
+
+    best = scores[selected[0]] or 1.0
+    ranked = []
+    for position, i in enumerate(selected):
+        duplicates = []
+        if groups is not None:
+            duplicates = [
+                (PLATFORMS[candidates.platform[j]], int(candidates.index[j]))
+                for j in by_group[starts[position] : ends[position]]
+                if j != i
+            ]
+        ranked.append(
+            (
+                PLATFORMS[candidates.platform[i]],
+                int(candidates.index[i]),
+                round(float(scores[i] / best * 100), 1),
+                duplicates,
+            )
+        )
+    return ranked
@@ -0,0 +1,179 @@
+"""
+Compact record types for repositories, Reddit posts and Hacker News stories
+
+Records are slotted dataclasses: no per-instance ``__dict__``, and repeated
+short strings (languages, subreddits, domains) are interned, so the many items
+held by snapshots, the star history and the search index cost a fraction of
+the equivalent dicts. They implement the read-only ``Mapping`` interface, so
+code reading ``repo["stars"]`` or ``post.get("selftext")`` works unchanged,
+and DRF renders them as JSON objects. ``to_dict()`` is the conversion to the
+wire format for other serializers. Fields listed in ``_optional_fields`` are
+left out of the mapping while empty, as the dicts never had those keys.
+
+Records compare and hash by identity, like the other objects kept in sets and
+dict keys, rather than by the dict equality ``Mapping`` would give them.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+
+class Record(Mapping):
+    """
+    Read-only mapping view over a dataclass' fields
+    """
+
+    __slots__ = ()
+    _optional_fields: Tuple[str, ...] = ()
+
+    # Mapping.__eq__ would make records equal to dicts and unhashable
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def _keys(self) -> Tuple[str, ...]:
+        if not self._optional_fields:
+            return self._field_names
+        return tuple(
+            name
+            for name in self._field_names
+            if name not in self._optional_fields or getattr(self, name)
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self._keys()}
+
+    def __reduce__(self):
+        # Pickle as constructor arguments, without repeating field names
+        return (type(self), tuple(getattr(self, name) for name in self._field_names))
+
+    @classmethod
+    def _register(cls, record_cls):
+        record_cls._field_names = tuple(f.name for f in fields(record_cls))
+        return record_cls
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+@Record._register
+@dataclass(slots=True, eq=False)
+class Repository(Record):
+    id: int
+    name: str
+    full_name: str
+    description: str
+    stars: int
+    forks: int
+    language: str
+    url: str
+    created_at: str
+    updated_at: str
+    topics: Tuple[str, ...]
+
+    @classmethod
+    def from_api(cls, repo: Dict) -> "Repository":
+        """
+        Build from a GitHub REST repository object
+        """
+        return cls(
+            id=repo["id"],
+            name=repo["name"],
+            full_name=repo["full_name"],
+            description=repo["description"] or "No description available",
+            stars=repo["stargazers_count"],
+            forks=repo["forks_count"],
+            language=_intern(repo["language"]) or "Unknown",
+            url=repo["html_url"],
+            created_at=repo["created_at"],
+            updated_at=repo["updated_at"],
+            topics=tuple(_intern(t) for t in repo.get("topics", [])),
+        )
+
+
+@Record._register
+@dataclass(slots=True, eq=False)
+class RedditPost(Record):
+    id: str
+    title: str
+    author: str
+    subreddit: str
+    score: int
+    upvote_ratio: float
+    num_comments: int
+    url: str
+    external_url: str
+    selftext: str
+    created_utc: float
+    flair_text: str
+    domain: str
+    is_self: bool
+    # Set for the posts of the combined programming feed only
+    source_subreddit: str = ""
+
+    _optional_fields = ("source_subreddit",)
+
+    @classmethod
+    def from_api(cls, post_data: Dict, subreddit: str) -> "RedditPost":
+        """
+        Build from the ``data`` of a Reddit listing child
+        """
+        selftext = post_data.get("selftext", "")
+        return cls(
+            id=post_data.get("id", ""),
+            title=post_data.get("title", "No title"),
+            author=post_data.get("author", "unknown"),
+            subreddit=_intern(post_data.get("subreddit", subreddit)),
+            score=post_data.get("score", 0),
+            upvote_ratio=post_data.get("upvote_ratio", 0),
+            num_comments=post_data.get("num_comments", 0),
+            url=f"https://reddit.com{post_data.get('permalink', '')}",
+            external_url=post_data.get("url", ""),
+            selftext=(selftext[:200] + "...") if selftext else "",
+            created_utc=post_data.get("created_utc", 0),
+            flair_text=_intern(post_data.get("link_flair_text", "")),
+            domain=_intern(post_data.get("domain", "")),
+            is_self=post_data.get("is_self", False),
+        )
+
+
+@Record._register
+@dataclass(slots=True, eq=False)
+class HNStory(Record):
+    id: int
+    title: str
+    url: str
+    score: int
+    by: str
+    time: int
+    descendants: int
+    type: str
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "HNStory":
+        """
+        Build from a Hacker News item
+        """
+        return cls(
+            id=data.get("id"),
+            title=data.get("title", "No title"),
+            url=data.get("url", ""),
+            score=data.get("score", 0),
+            by=data.get("by", "unknown"),
+            time=data.get("time", 0),
+            descendants=data.get("descendants", 0),  # comment count
+            type=_intern(data.get("type", "story")),
+        )
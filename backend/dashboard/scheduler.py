@@ -0,0 +1,184 @@
+"""
+Adaptive refresh intervals for the upstream sources
+
+Every source (GitHub, Reddit, Hacker News and the language stats) is refreshed
+at its own interval, adapted after each refresh within the bounds configured
+in REFRESH_SOURCES:
+
+- change: how much of what was fetched differs from the previous refresh
+  (Jaccard distance of the item ids). A refresh that brings a lot of new data
+  shortens the interval, one that brings almost nothing lengthens it, so the
+  Hacker News front page ends up polled every few minutes while language
+  stats settle at hours.
+- quota: the share of the rate-limit budget left, when the source reports it.
+  Below REFRESH_QUOTA_RESERVE the interval can only grow, the more so the
+  deeper into the reserve the budget is, so what is left stays available to
+  user requests.
+- failures double the interval, up to the source's maximum.
+
+State is kept in the default cache so beat and every Celery worker share it.
+dashboard.tasks.dispatch_refreshes runs every REFRESH_TICK seconds and queues
+the refresh of each source that is due.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def change_ratio(previous: Iterable[str], current: Iterable[str]) -> float:
+    """
+    Share of the items of two refreshes that are in only one of them
+    """
+    previous, current = set(previous), set(current)
+    union = previous | current
+    if not union:
+        return 0.0
+    return 1 - len(previous & current) / len(union)
+
+
+class AdaptiveScheduler:
+    """
+    Per-source refresh intervals adapted to change rate and remaining quota
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, Dict],
+        fast_change: float = 0.3,
+        slow_change: float = 0.05,
+        speedup: float = 0.5,
+        slowdown: float = 1.5,
+        quota_reserve: float = 0.2,
+    ):
+        self.sources = sources
+        self.fast_change = fast_change
+        self.slow_change = slow_change
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.quota_reserve = quota_reserve
+
+    @staticmethod
+    def _key(source: str) -> str:
+        return f"dashboard:schedule:{source}"
+
+    def state(self, source: str) -> Dict:
+        """
+        Current schedule of a source, its configured initial interval if none yet
+        """
+        state = cache.get(self._key(source))
+        if state is None:
+            state = {
+                "interval": float(self.sources[source]["interval"]),
+                "next_run": 0.0,
+                "ids": None,
+                "change": None,
+                "quota": None,
+                "failures": 0,
+            }
+        return state
+
+    def _save(self, source: str, state: Dict):
+        # Outlives the longest interval, so an idle source keeps its history
+        cache.set(
+            self._key(source), state, timeout=self.sources[source]["max_interval"] * 4
+        )
+
+    def _clamp(self, source: str, interval: float) -> float:
+        bounds = self.sources[source]
+        return float(min(max(interval, bounds["min_interval"]), bounds["max_interval"]))
+
+    def due_sources(self, now: Optional[float] = None) -> List[str]:
+        """
+        Sources whose refresh is due, each claimed until its interval passes
+
+        The claim keeps a refresh from being queued again on every tick while
+        it runs; record() replaces it with the adapted schedule.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for source in self.sources:
+            state = self.state(source)
+            if state["next_run"] > now:
+                continue
+            state["next_run"] = now + state["interval"]
+            self._save(source, state)
+            due.append(source)
+        return due
+
+    def record(
+        self,
+        source: str,
+        ids: Optional[Iterable[str]],
+        quota: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict:
+        """
+        Adapt the interval of a source after a refresh and schedule the next one
+
+        ``ids`` identify the items fetched, None when the refresh failed;
+        ``quota`` is the share of the source's rate limit left, if known.
+        """
+        now = time.time() if now is None else now
+        state = self.state(source)
+        previous_interval = interval = state["interval"]
+
+        if ids is None:
+            state["failures"] += 1
+            state["change"] = None
+            interval *= 2
+        else:
+            ids = sorted(set(ids))
+            state["failures"] = 0
+            if state["ids"] is None:
+                state["change"] = None
+            else:
+                state["change"] = change_ratio(state["ids"], ids)
+                if state["change"] >= self.fast_change:
+                    interval *= self.speedup
+                elif state["change"] <= self.slow_change:
+                    interval *= self.slowdown
+            state["ids"] = ids
+
+        state["quota"] = quota
+        if quota is not None and quota < self.quota_reserve:
+            # From 1x at the reserve to 2x with the budget exhausted
+            interval = max(interval, previous_interval) * (
+                2 - max(quota, 0.0) / self.quota_reserve
+            )
+
+        state["interval"] = self._clamp(source, interval)
+        state["next_run"] = now + state["interval"]
+        self._save(source, state)
+
+        change = "n/a" if state["change"] is None else f"{state['change']:.0%}"
+        budget = "n/a" if quota is None else f"{quota:.0%}"
+        logger.info(
+            f"Refreshed {source}: change {change}, quota left {budget}, "
+            f"next in {state['interval']:.0f}s (was {previous_interval:.0f}s)"
+        )
+        return state
+
+    def schedule(self) -> Dict[str, Dict]:
+        """
+        Interval, next run and last measurements of every source
+        """
+        return {
+            source: {key: value for key, value in state.items() if key != "ids"}
+            for source, state in ((s, self.state(s)) for s in self.sources)
+        }
+
+
+scheduler = AdaptiveScheduler(
+    settings.REFRESH_SOURCES,
+    fast_change=settings.REFRESH_FAST_CHANGE,
+    slow_change=settings.REFRESH_SLOW_CHANGE,
+    speedup=settings.REFRESH_SPEEDUP,
+    slowdown=settings.REFRESH_SLOWDOWN,
+    quota_reserve=settings.REFRESH_QUOTA_RESERVE,
+)
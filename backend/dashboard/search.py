@@ -0,0 +1,235 @@
+"""
+In-memory full-text search over the items the hub has already fetched
+
+An inverted index (term -> {document: term frequency}) is updated as each
+source refresh lands, through the fetch signals, so searching never goes
+upstream. Results are scored with BM25; titles, names and topics count double.
+
+The index is bounded: the least recently refreshed documents are evicted once
+``max_documents`` is reached. It is built where refreshes run and shared with
+every process through the cache, see dashboard/shared_state.py.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import receiver
+
+from . import shared_state
+from .ranking import GITHUB, HACKERNEWS, PLATFORMS, REDDIT
+from .signals import posts_fetched, repositories_fetched, stories_fetched
+
+# Accepted values of the ``platform`` query parameter
+PLATFORM_ALIASES = {
+    "github": GITHUB,
+    "reddit": REDDIT,
+    "hackernews": HACKERNEWS,
+    "hn": HACKERNEWS,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens, keeping "+" and "#" so c++ and c# stay searchable
+    """
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _fields(*weighted: Tuple[Iterable[str], int]) -> Counter:
+    terms = Counter()
+    for texts, weight in weighted:
+        for text in texts:
+            for token in tokenize(text):
+                terms[token] += weight
+    return terms
+
+
+def repo_terms(repo: Dict) -> Counter:
+    return _fields(
+        ([repo.get("name", ""), *repo.get("topics", [])], 2),
+        ([repo.get("full_name", ""), repo.get("description", "")], 1),
+        ([repo.get("language", "")], 1),
+    )
+
+
+def post_terms(post: Dict) -> Counter:
+    return _fields(
+        ([post.get("title", "")], 2),
+        ([post.get("selftext", ""), post.get("flair_text") or ""], 1),
+        ([post.get("subreddit", "")], 1),
+    )
+
+
+def story_terms(story: Dict) -> Counter:
+    return _fields(([story.get("title", "")], 2))
+
+
+class SearchIndex(shared_state.SharedStore):
+    """
+    Incrementally maintained inverted index with BM25 scoring
+
+    Each document gets a slot in NumPy columns (length, platform). Postings are
+    kept as ``{slot: term frequency}`` dicts for cheap updates and turned into
+    arrays on first use after a change, so a query scores every matching
+    document with a few vector operations.
+    """
+
+    # Posting arrays are rebuilt on demand from the postings
+    LOCAL_FIELDS = ("_lock", "_arrays")
+
+    def __init__(self, max_documents: int = 50000):
+        self.max_documents = max_documents
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self.slots: "OrderedDict[str, int]" = OrderedDict()  # least recent first
+        self.items: List[Optional[Dict]] = [None] * max_documents
+        self.terms: List[Optional[Counter]] = [None] * max_documents
+        self.lengths = np.zeros(max_documents, dtype=np.float64)
+        self.platforms = np.full(max_documents, -1, dtype=np.int8)
+        self.total_length = 0
+        self._free = list(range(max_documents - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _reset_local(self):
+        self._arrays = {}
+
+    def _remove(self, key: str) -> int:
+        slot = self.slots.pop(key)
+        for term in self.terms[slot]:
+            posting = self.postings[term]
+            del posting[slot]
+            if not posting:
+                del self.postings[term]
+            self._arrays.pop(term, None)
+
+        self.total_length -= self.lengths[slot]
+        self.items[slot] = None
+        self.terms[slot] = None
+        self.lengths[slot] = 0
+        self.platforms[slot] = -1
+        return slot
+
+    def add(
+        self,
+        platform: str,
+        items: Sequence[Dict],
+        terms_of: Callable[[Dict], Counter],
+    ):
+        """
+        Index (or re-index) the items of one source refresh
+        """
+        code = PLATFORMS.index(platform)
+        # Tokenize outside the lock, searches only wait for the posting updates
+        prepared = [
+            (f"{platform}:{item['id']}", item, terms_of(item)) for item in items
+        ]
+
+        with self._lock:
+            for key, item, terms in prepared:
+                if key in self.slots:
+                    slot = self._remove(key)
+                elif self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = self._remove(next(iter(self.slots)))
+
+                length = sum(terms.values())
+                self.slots[key] = slot
+                self.items[slot] = item
+                self.terms[slot] = terms
+                self.lengths[slot] = length
+                self.platforms[slot] = code
+                self.total_length += length
+                for term, frequency in terms.items():
+                    self.postings.setdefault(term, {})[slot] = frequency
+                    self._arrays.pop(term, None)
+
+    def _posting_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self.postings[term]
+            arrays = self._arrays[term] = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float64, count=len(posting)),
+            )
+        return arrays
+
+    def search(
+        self, query: str, platform: Optional[str] = None, limit: int = 20
+    ) -> List[Dict]:
+        """
+        Best matching items for a query, each with its platform and relevance
+        """
+        terms = set(tokenize(query))
+        if not terms or limit <= 0:
+            return []
+
+        with self._lock:
+            terms = [term for term in terms if term in self.postings]
+            if not terms:
+                return []
+            count = len(self.slots)
+            average_length = self.total_length / count
+            scores = np.zeros(self.max_documents)
+
+            for term in terms:
+                slots, frequencies = self._posting_arrays(term)
+                df = len(slots)
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                norm = K1 * (1 - B + B * self.lengths[slots] / average_length)
+                scores[slots] += idf * frequencies * (K1 + 1) / (frequencies + norm)
+
+            if platform:
+                scores[self.platforms != PLATFORMS.index(platform)] = 0
+
+            matches = np.flatnonzero(scores)
+            if len(matches) > limit:
+                matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+            matches = matches[np.argsort(-scores[matches], kind="stable")]
+
+            return [
+                dict(
+                    self.items[slot],
+                    platform=PLATFORMS[self.platforms[slot]],
+                    relevance=round(float(scores[slot]), 3),
+                )
+                for slot in matches
+            ]
+
+
+search_index = shared_state.register(
+    "search_index", SearchIndex(max_documents=settings.SEARCH_INDEX_MAX_DOCUMENTS)
+)
+
+
+@receiver(repositories_fetched)
+@shared_state.ingests("search_index")
+def index_repositories(sender, repos, **kwargs):
+    search_index.add(GITHUB, repos, repo_terms)
+
+
+@receiver(posts_fetched)
+@shared_state.ingests("search_index")
+def index_posts(sender, posts, **kwargs):
+    search_index.add(REDDIT, posts, post_terms)
+
+
+@receiver(stories_fetched)
+@shared_state.ingests("search_index")
+def index_stories(sender, stories, **kwargs):
+    search_index.add(HACKERNEWS, stories, story_terms)
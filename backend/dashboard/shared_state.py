@@ -0,0 +1,204 @@
+"""
+In-memory stores shared by every process through the cache
+
+The star history (dashboard/timeseries.py), the search index
+(dashboard/search.py), the keyword sketches (dashboard/keywords.py) and the
+canonical URL index (dashboard/dedup.py) are fed by the fetch signals in
+whichever process fetches. In production that is the Celery worker running the
+scheduled refreshes (dashboard/tasks.py), while requests are answered by
+several gunicorn workers that are recycled every GUNICORN_MAX_REQUESTS
+requests. So the stores are built where refreshes run and
+published with a version, and every other process loads the published copy:
+
+- ``updating()`` wraps a refresh. It takes a lock shared by all processes,
+  loads the latest published copy of every store, lets the fetch signals feed
+  them, and publishes the stores that changed. Refreshes in several worker
+  processes build on each other instead of overwriting each other.
+- Signal receivers decorated with ``ingests()`` only feed their store inside
+  ``updating()``, so an ad hoc upstream call in a web worker cannot make its
+  results differ from the other workers'.
+- ``sync()`` is called before reading. It compares the published versions with
+  the loaded ones (one small cache read, at most every
+  SHARED_STATE_SYNC_INTERVAL seconds) and loads the copies that changed.
+"""
+
+import functools
+import logging
+import pickle
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "dashboard:shared:lock"
+
+
+class SharedStore:
+    """
+    Mixin for a store that can be published and loaded as a whole
+
+    Attributes in LOCAL_FIELDS stay per process; ``_reset_local`` rebuilds the
+    derived ones after a load. Subclasses guard their state with ``_lock``.
+    """
+
+    LOCAL_FIELDS = ("_lock",)
+
+    def dump_state(self) -> bytes:
+        # Pickled under the lock, ingestion updates arrays in place
+        with self._lock:
+            state = {
+                name: value
+                for name, value in vars(self).items()
+                if name not in self.LOCAL_FIELDS
+            }
+            blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        # Fast level: preallocated arrays are mostly empty and shrink a lot
+        return zlib.compress(blob, 1)
+
+    def load_state(self, blob: bytes):
+        state = pickle.loads(zlib.decompress(blob))
+        with self._lock:
+            vars(self).update(state)
+            self._reset_local()
+
+    def _reset_local(self):
+        pass
+
+
+_stores: Dict[str, SharedStore] = {}
+_versions: Dict[str, str] = {}
+_changed = set()
+_sync = {"checked_at": float("-inf")}
+_updating = {"depth": 0}
+_local_lock = threading.Lock()
+
+
+def _key(name: str) -> str:
+    return f"dashboard:shared:{name}"
+
+
+def register(name: str, store: SharedStore) -> SharedStore:
+    """
+    Share ``store`` under ``name``
+    """
+    _stores[name] = store
+    return store
+
+
+def is_updating() -> bool:
+    return _updating["depth"] > 0
+
+
+def ingests(name: str) -> Callable:
+    """
+    Decorate a signal receiver feeding store ``name``, see the module docstring
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not is_updating():
+                return None
+            result = handler(*args, **kwargs)
+            _changed.add(name)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def sync(force: bool = False):
+    """
+    Load the stores whose published version differs from the loaded one
+    """
+    now = time.monotonic()
+    if not force and now - _sync["checked_at"] < settings.SHARED_STATE_SYNC_INTERVAL:
+        return
+    _sync["checked_at"] = now
+
+    try:
+        versions = cache.get_many([f"{_key(name)}:version" for name in _stores])
+        for name, store in _stores.items():
+            version = versions.get(f"{_key(name)}:version")
+            if version is None or version == _versions.get(name):
+                continue
+            blob = cache.get(_key(name))
+            if blob is None:
+                continue
+            store.load_state(blob)
+            _versions[name] = version
+    except Exception as e:
+        logger.error(f"Failed to load shared stores: {str(e)}")
+
+
+def publish():
+    """
+    Publish the stores changed by the current refresh under new versions
+    """
+    for name in list(_changed):
+        _changed.discard(name)
+        start = time.perf_counter()
+        blob = _stores[name].dump_state()
+        version = uuid.uuid4().hex
+        # Data before version: a reader seeing the new version finds the new data
+        cache.set(_key(name), blob, timeout=None)
+        cache.set(f"{_key(name)}:version", version, timeout=None)
+        _versions[name] = version
+        logger.info(
+            f"Published {name}: {len(blob)} bytes in "
+            f"{(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+
+
+def _acquire(wait: bool):
+    """
+    Take the cross-process lock (django_redis) or this process' lock otherwise
+    """
+    timeout = settings.SHARED_STATE_LOCK_TIMEOUT
+    if hasattr(cache, "lock"):
+        lock = cache.lock(LOCK_KEY, timeout=timeout)
+        acquired = lock.acquire(blocking=wait, blocking_timeout=timeout)
+    else:
+        lock = _local_lock
+        acquired = lock.acquire(wait, timeout if wait else -1)
+    return lock if acquired else None
+
+
+@contextmanager
+def updating(wait: bool = True) -> Iterator[bool]:
+    """
+    Run a refresh against the latest shared stores and publish what it changed
+
+    Yields whether the lock was taken. Without it (busy with ``wait=False``,
+    or timed out) the body still runs but feeds no store.
+    """
+    try:
+        lock = _acquire(wait)
+    except Exception as e:
+        logger.error(f"Failed to lock shared stores: {str(e)}")
+        lock = None
+    if lock is None:
+        yield False
+        return
+
+    try:
+        sync(force=True)
+        _updating["depth"] += 1
+        try:
+            yield True
+        finally:
+            _updating["depth"] -= 1
+        publish()
+    finally:
+        try:
+            lock.release()
+        except Exception as e:
+            logger.warning(f"Shared store lock released late: {str(e)}")
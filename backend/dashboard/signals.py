@@ -0,0 +1,19 @@
+"""
+Signals sent by the API clients when a source refresh lands
+
+Ingestion stages (star history, indexes, sketches) connect receivers in
+DashboardConfig.ready() instead of being called from each view. The clients
+send with ``send_robust``: a failing stage is logged by Django and never fails
+the fetch or the other stages.
+"""
+
+from django.dispatch import Signal
+
+# kwargs: repos (list of repository dicts)
+repositories_fetched = Signal()
+
+# kwargs: posts (list of Reddit post dicts)
+posts_fetched = Signal()
+
+# kwargs: stories (list of Hacker News story dicts)
+stories_fetched = Signal()
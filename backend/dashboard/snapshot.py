@@ -0,0 +1,71 @@
+"""
+Latest trending snapshot, shared through the two-tier cache (dashboard/tiered_cache.py)
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .tiered_cache import tiered_cache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_KEY = "dashboard:trending_snapshot"
+
+
+def _is_fresh(entry: Dict) -> bool:
+    ttl = entry.get("ttl", settings.TRENDING_SNAPSHOT_TTL)
+    return time.time() - entry["stored_at"] < ttl
+
+
+def get_snapshot() -> Optional[Dict]:
+    """
+    Return the latest snapshot, from process memory first and the shared cache second
+    """
+    entry = tiered_cache.get(SNAPSHOT_CACHE_KEY)
+    if not entry or not _is_fresh(entry):
+        return None
+    return entry["payload"]
+
+
+def has_data(payload: Dict) -> bool:
+    """
+    Whether a payload holds fetched items, i.e. not every platform failed
+    """
+    platforms = payload.get("platforms", {}).values()
+    return bool(payload.get("trending_topics")) and any(
+        platform.get("status") == "connected" for platform in platforms
+    )
+
+
+def store_snapshot(payload: Dict, ttl: Optional[int] = None) -> bool:
+    """
+    Publish a freshly built snapshot to every process through the shared cache
+
+    It is served for ``ttl`` seconds, TRENDING_SNAPSHOT_TTL by default. A
+    payload without data is not stored, so an upstream outage is not served
+    from the cache; returns whether it was.
+    """
+    if not has_data(payload):
+        logger.warning("Not storing a trending snapshot without data")
+        return False
+    ttl = ttl or settings.TRENDING_SNAPSHOT_TTL
+    tiered_cache.set(
+        SNAPSHOT_CACHE_KEY,
+        {"payload": payload, "stored_at": time.time(), "ttl": ttl},
+        timeout=ttl,
+    )
+    return True
+
+
+def load_snapshot() -> bool:
+    """
+    Pull the shared snapshot into process memory, returns whether one was found
+    """
+    try:
+        return get_snapshot() is not None
+    except Exception as e:
+        logger.error(f"Failed to load trending snapshot from cache: {str(e)}")
+        return False
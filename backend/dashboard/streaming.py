@@ -0,0 +1,81 @@
+"""
+Newline-delimited JSON (NDJSON) streaming responses
+
+Each record is written as one JSON line as soon as it is produced, so clients
+can render partial results before the slowest upstream source has answered.
+Under ASGI the records are produced in a worker thread and streamed through an
+async iterator, since Django buffers synchronous iterators there.
+"""
+
+import json
+from typing import Any, Dict, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate ``Accept: application/x-ndjson`` instead of returning 406
+    """
+
+    media_type = NDJSON_CONTENT_TYPE
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data: Any, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, cls=DjangoJSONEncoder) + "\n").encode()
+
+
+def wants_stream(request) -> bool:
+    """
+    Whether a DRF request asked for streaming via ?stream=1 or its Accept header
+    """
+    if request.GET.get("stream", "") in ("1", "true"):
+        return True
+    renderer = getattr(request, "accepted_renderer", None)
+    return isinstance(renderer, NDJSONRenderer)
+
+
+def _encode(record: Dict) -> str:
+    return json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+async def _aiter_lines(records: Iterator[Dict]):
+    done = object()
+    next_record = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            record = await next_record(records, done)
+            if record is done:
+                return
+            yield _encode(record)
+    finally:
+        await sync_to_async(records.close, thread_sensitive=False)()
+
+
+def _iter_lines(records: Iterator[Dict]):
+    for record in records:
+        yield _encode(record)
+
+
+def ndjson_response(request, records: Iterator[Dict]) -> StreamingHttpResponse:
+    """
+    Stream ``records`` (a generator of dicts) as NDJSON
+    """
+    http_request = getattr(request, "_request", request)
+    if isinstance(http_request, ASGIRequest):
+        content = _aiter_lines(records)
+    else:
+        content = _iter_lines(records)
+
+    response = StreamingHttpResponse(content, content_type=NDJSON_CONTENT_TYPE)
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream until it completes
+    response["X-Accel-Buffering"] = "no"
+    return response
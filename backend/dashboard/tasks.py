@@ -0,0 +1,154 @@
+"""
+Celery tasks refreshing the upstream sources on their adaptive schedule
+
+Beat runs dispatch_refreshes every REFRESH_TICK seconds, which queues
+refresh_source for each source due in dashboard.scheduler. A refresh fetches
+one source, records how much it changed and how much rate limit is left, and
+republishes the trending snapshot with the latest result of every source, so
+views and dashboards get new data as soon as it is fetched. With
+REFRESH_BY_BEAT the views serve only that snapshot and never fetch themselves.
+
+    celery -A project worker --beat
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+
+from . import shared_state
+from .api_clients import github_client, reddit_client
+from .broadcast import broadcast_items, broadcast_update, changed_items
+from .scheduler import scheduler
+from .snapshot import get_snapshot, store_snapshot
+from .timeseries import sample_star_history, star_history
+from .trending import PENDING_RESULT, SOURCE_FETCHERS, assemble_trending_payload
+
+logger = logging.getLogger(__name__)
+
+SOURCE_RESULT_KEY = "dashboard:source:{}"
+
+# Every successful refresh republishes the snapshot and each source refreshes
+# at least every max_interval, so it only expires if every source keeps failing
+SNAPSHOT_TTL = 2 * max(
+    bounds["max_interval"] for bounds in settings.REFRESH_SOURCES.values()
+)
+
+
+def _github_search_quota() -> Optional[float]:
+    # Trending repositories and language stats both go through the search API
+    return github_client.quota_left("search")
+
+
+QUOTAS: Dict[str, Callable[[], Optional[float]]] = {
+    "github": _github_search_quota,
+    "reddit": reddit_client.quota_left,
+    "hackernews": lambda: None,
+    "language_stats": _github_search_quota,
+}
+
+
+def fetch_source(source: str) -> Tuple[Optional[object], Optional[List[str]]]:
+    """
+    Fetch one source, return its result and the ids of what it returned
+
+    Ids are None when the fetch failed or came back empty, which the scheduler
+    treats as a failure rather than as everything having changed.
+    """
+    try:
+        if source == "language_stats":
+            stats = github_client.get_language_stats()
+            # Rank included, so a reordering counts as a change
+            return stats, [f"{rank}:{name}" for rank, name in enumerate(stats)] or None
+
+        items, error, status = result = SOURCE_FETCHERS[source]()
+    except Exception as e:
+        logger.error(f"Refreshing {source} failed: {str(e)}")
+        return None, None
+
+    if error or not items:
+        return result, None
+    return result, [str(item["id"]) for item in items]
+
+
+def publish_snapshot(broadcast: bool = True):
+    """
+    Assemble the trending snapshot from the latest result of every source
+    """
+    # Duplicates across sources come from the canonical index, which other
+    # workers' refreshes may have published since
+    shared_state.sync()
+    keys = {SOURCE_RESULT_KEY.format(name): name for name in scheduler.sources}
+    latest = {keys[key]: value for key, value in cache.get_many(keys).items()}
+
+    results = {name: latest.get(name) or PENDING_RESULT for name in SOURCE_FETCHERS}
+    payload = assemble_trending_payload(results, latest.get("language_stats") or {})
+    previous = get_snapshot() or {}
+    if not store_snapshot(payload, ttl=SNAPSHOT_TTL) or not broadcast:
+        return
+
+    # Changed items go to their topic groups only; every dashboard gets the
+    # small untargeted summary of platform statuses and language stats
+    broadcast_items(
+        "trending_item",
+        changed_items(previous.get("trending_topics", []), payload["trending_topics"]),
+    )
+    broadcast_update(
+        "trending_summary",
+        {
+            key: value
+            for key, value in payload.items()
+            if key not in ("trending_topics", "api_notes")
+        },
+    )
+
+
+def sample_languages():
+    """
+    Sample the star history of every configured language that is due
+
+    Stops once the search quota reaches the reserve kept for user requests.
+    """
+    for language in star_history.languages:
+        quota = _github_search_quota()
+        if quota is not None and quota < scheduler.quota_reserve:
+            logger.info("Star history sampling deferred, search quota in reserve")
+            return
+        try:
+            sample_star_history(language)
+        except Exception as e:
+            logger.error(f"Sampling star history for '{language}' failed: {str(e)}")
+
+
+@shared_task(ignore_result=True)
+def refresh_source(source: str):
+    """
+    Refresh one source and schedule its next refresh
+    """
+    with shared_state.updating():
+        result, ids = fetch_source(source)
+        if source == "github" and ids is not None:
+            sample_languages()
+    state = scheduler.record(source, ids, QUOTAS[source]())
+    if ids is None:
+        return
+
+    cache.set(
+        SOURCE_RESULT_KEY.format(source),
+        result,
+        timeout=scheduler.sources[source]["max_interval"] * 2,
+    )
+    # Republished even when unchanged, which restarts the snapshot's SNAPSHOT_TTL;
+    # dashboards only hear about actual changes
+    publish_snapshot(broadcast=state["change"] != 0)
+
+
+@shared_task(ignore_result=True)
+def dispatch_refreshes():
+    """
+    Queue the refresh of every source that is due
+    """
+    for source in scheduler.due_sources():
+        refresh_source.delay(source)
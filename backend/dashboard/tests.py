@@ -1,3 +1,642 @@
-from django.test import TestCase
+import asyncio
+import importlib.util
+import io
+import tempfile
+import unittest
+from collections import OrderedDict, deque
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import redis
+import requests
+from decouple import config
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from rest_framework.request import Request
+
+from . import ranking
+from .search import SearchIndex, story_terms, tokenize
+from .throttling import GCRA_SCRIPT, GCRAAnonRateThrottle, LocalBuckets
+from .consumers import RESYNC_KEY, DashboardConsumer, send_stats
+from .http_cache import CachingHTTPAdapter, HTTPCacheStore, freshness_lifetime
+from .keywords import CountMinSketch, KeywordTracker, _hashes, story_texts
+from .profiling import profile_store
+from .records import RedditPost
+from .scheduler import AdaptiveScheduler, change_ratio
+
+
+class SlowSocketTests(SimpleTestCase):
+    """
+    Send queue of DashboardConsumer when ``send`` waits for a slow client, as
+    under the uvicorn workers
+    """
+
+    def make_consumer(self):
+        consumer = DashboardConsumer()
+        consumer.recent_update_ids = deque(maxlen=64)
+        consumer.pending = OrderedDict()
+        consumer.pending_ready = asyncio.Event()
+        consumer.sent = []
+        consumer.writable = asyncio.Event()
+
+        async def send(text_data=None, **kwargs):
+            # Blocks like a full transport write buffer until the client reads
+            await consumer.writable.wait()
+            consumer.sent.append(text_data)
+
+        consumer.send = send
+        return consumer
+
+    @staticmethod
+    def update(key, value):
+        return {"update_type": "trending_item", "key": key, "text": f"{key}={value}"}
+
+    def test_pending_updates_for_the_same_key_coalesce(self):
+        async def scenario():
+            consumer = self.make_consumer()
+            sender = asyncio.ensure_future(consumer.drain_pending())
+
+            await consumer.dashboard_update(self.update("item:1", 1))
+            await asyncio.sleep(0)  # the sender takes it and blocks in send
+            for value in range(2, 6):
+                await consumer.dashboard_update(self.update("item:2", value))
+            self.assertEqual(list(consumer.pending), ["item:2"])
+
+            consumer.writable.set()
+            await asyncio.sleep(0.01)
+            sender.cancel()
+            return consumer.sent
+
+        coalesced = send_stats["coalesced"]
+        self.assertEqual(asyncio.run(scenario()), ["item:1=1", "item:2=5"])
+        self.assertEqual(send_stats["coalesced"] - coalesced, 3)
+
+    @override_settings(WS_MAX_PENDING_UPDATES=3)
+    def test_client_too_far_behind_is_resynced(self):
+        async def scenario():
+            consumer = self.make_consumer()
+            sender = asyncio.ensure_future(consumer.drain_pending())
+
+            with mock.patch("dashboard.consumers.get_snapshot", return_value=None):
+                for i in range(6):
+                    await consumer.dashboard_update(self.update(f"item:{i}", 1))
+                    await asyncio.sleep(0)
+            self.assertEqual(list(consumer.pending), [RESYNC_KEY, "item:5"])
+
+            consumer.writable.set()
+            await asyncio.sleep(0.01)
+            sender.cancel()
+            return consumer.sent
+
+        dropped = send_stats["dropped"]
+        sent = asyncio.run(scenario())
+        # The update in flight, then the resync instead of the dropped backlog
+        self.assertEqual(sent[0], "item:0=1")
+        self.assertIn("resync_required", sent[1])
+        self.assertEqual(sent[2], "item:5=1")
+        self.assertEqual(send_stats["dropped"] - dropped, 3)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0)
+class ProfilingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(profile_store, "directory", Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self):
+        return self.client.get("/api/search/?q=python", HTTP_HOST="localhost")
+
+    def test_capture_id_is_not_sent_to_anonymous_users(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(len(profile_store.list()), 1)
+
+    def test_capture_id_is_sent_to_staff(self):
+        staff = User.objects.create_user("staff", password="x", is_staff=True)
+        self.client.force_login(staff)
+        self.assertIn("X-Profile-Id", self.get())
+
+
+RANKING_CONFIG = {
+    "limit": 10,
+    "max_per_platform": None,
+    "platform_weights": {"GitHub": 1.0, "Reddit": 1.0, "Hacker News": 1.0},
+    "popularity_weight": 1.0,
+    "engagement_weight": 0.0,
+    "half_life_hours": {"GitHub": 168.0, "Reddit": 12.0, "Hacker News": 8.0},
+}
+
+
+def repo(stars):
+    return {"stars": stars, "forks": 0, "created_at": None}
+
+
+def post(score):
+    return {"score": score, "num_comments": 0, "created_utc": None}
+
+
+def story(score):
+    return {"score": score, "descendants": None, "time": None}
+
+
+class RankingTests(SimpleTestCase):
+    def rank(self, repos=(), posts=(), stories=(), groups=None, **config):
+        return ranking.rank(
+            repos, posts, stories, dict(RANKING_CONFIG, **config), groups=groups
+        )
+
+    def test_best_first_within_and_across_platforms(self):
+        ranked = self.rank(
+            repos=[repo(10), repo(1000), repo(100)],
+            posts=[post(50)],
+            platform_weights={"GitHub": 1.0, "Reddit": 2.0, "Hacker News": 1.0},
+        )
+        self.assertEqual(
+            [(platform, index) for platform, index, _, _ in ranked],
+            [("Reddit", 0), ("GitHub", 1), ("GitHub", 2), ("GitHub", 0)],
+        )
+        self.assertEqual(ranked[0][2], 100.0)
+
+    def test_older_items_decay(self):
+        now = 1_700_000_000
+        ranked = ranking.score_candidates(
+            ranking.Candidates(
+                [],
+                [],
+                [dict(story(100), time=now), dict(story(100), time=now - 8 * 3600)],
+            ),
+            RANKING_CONFIG,
+            now=now,
+        )
+        self.assertAlmostEqual(ranked[1] / ranked[0], 0.5)
+
+    def test_max_per_platform(self):
+        ranked = self.rank(
+            repos=[repo(1000), repo(900), repo(800)],
+            posts=[post(1), post(2)],
+            max_per_platform=2,
+        )
+        platforms = [platform for platform, _, _, _ in ranked]
+        self.assertEqual(platforms.count("GitHub"), 2)
+        self.assertEqual(platforms.count("Reddit"), 2)
+        self.assertNotIn(("GitHub", 2), [(p, i) for p, i, _, _ in ranked])
+
+    def test_limit(self):
+        self.assertEqual(len(self.rank(repos=[repo(n) for n in range(20)], limit=5)), 5)
+
+    def test_duplicates_compete_as_one_item(self):
+        ranked = self.rank(
+            repos=[repo(100), repo(90)],
+            posts=[post(80)],
+            # The second repository and the post link to the same page
+            groups=[0, 1, 1],
+        )
+        # Shown once, as its best-scored row (the only Reddit post normalizes to
+        # 1), and ahead of the bigger repository thanks to the combined score
+        self.assertEqual(len(ranked), 2)
+        platform, index, _, duplicates = ranked[0]
+        self.assertEqual((platform, index), ("Reddit", 0))
+        self.assertEqual(duplicates, [("GitHub", 1)])
+        self.assertEqual(ranked[1][:2], ("GitHub", 0))
+
+    def test_top_k(self):
+        scores = np.array([1.0, 5.0, 3.0, 4.0, -np.inf])
+        platform = np.array([0, 0, 1, 1, 2], dtype=np.int8)
+        self.assertEqual(list(ranking.top_k(scores, platform, 3)), [1, 3, 2])
+        self.assertEqual(list(ranking.top_k(scores, platform, 10)), [1, 3, 2, 0])
+        self.assertEqual(
+            list(ranking.top_k(scores, platform, 10, max_per_platform=1)), [1, 3]
+        )
+        self.assertEqual(len(ranking.top_k(scores, platform, 0)), 0)
+
+
+class SearchIndexTests(SimpleTestCase):
+    def make_index(self, max_documents=100):
+        index = SearchIndex(max_documents=max_documents)
+        index.add(
+            ranking.HACKERNEWS,
+            [
+                {"id": 1, "title": "Python web framework"},
+                {"id": 2, "title": "Python python tips"},
+                {"id": 3, "title": "Rust web"},
+            ],
+            story_terms,
+        )
+        return index
+
+    def test_bm25_scores(self):
+        # Titles count double: lengths 6, 6 and 4, python in 2 of 3 documents,
+        # idf = ln(1 + 1.5 / 2.5); the document repeating the term wins
+        results = self.make_index().search("python")
+        self.assertEqual([r["id"] for r in results], [2, 1])
+        self.assertEqual([r["relevance"] for r in results], [0.779, 0.624])
+        self.assertEqual(results[0]["platform"], ranking.HACKERNEWS)
+
+    def test_every_query_term_contributes(self):
+        results = self.make_index().search("rust web")
+        self.assertEqual([r["id"] for r in results], [3, 1])
+
+    def test_no_match_and_limit(self):
+        index = self.make_index()
+        self.assertEqual(index.search("java"), [])
+        self.assertEqual(index.search(""), [])
+        self.assertEqual(len(index.search("python", limit=1)), 1)
+        self.assertEqual(index.search("python", limit=0), [])
+
+    def test_platform_filter(self):
+        index = self.make_index()
+        index.add(ranking.REDDIT, [{"id": 9, "title": "python"}], story_terms)
+        results = index.search("python", platform=ranking.REDDIT)
+        self.assertEqual([(r["platform"], r["id"]) for r in results], [("Reddit", 9)])
+
+    def test_reindexing_replaces_the_document(self):
+        index = self.make_index()
+        index.add(ranking.HACKERNEWS, [{"id": 3, "title": "Go web"}], story_terms)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.search("rust"), [])
+        self.assertEqual([r["id"] for r in index.search("go")], [3])
+
+    def test_least_recently_indexed_documents_are_evicted(self):
+        index = self.make_index(max_documents=3)
+        index.add(ranking.HACKERNEWS, [{"id": 4, "title": "Python"}], story_terms)
+        self.assertEqual(len(index), 3)
+        # Document 1 was evicted, the first indexed
+        self.assertEqual({r["id"] for r in index.search("python")}, {2, 4})
+
+    def test_tokenize_keeps_language_names(self):
+        self.assertEqual(
+            tokenize("C++ and C# vs. Go!"), ["c++", "and", "c#", "vs", "go"]
+        )
+
+
+class CountMinSketchTests(SimpleTestCase):
+    def test_estimates_never_undercount_and_stay_within_the_error_bound(self):
+        # 2000 keys with counts 1..2000 in a 512 x 4 sketch: estimates exceed
+        # the true count by at most e / width x total with probability
+        # 1 - e^-depth (98%)
+        sketch = CountMinSketch(width=512, depth=4, seed=7)
+        keys = [f"keyword-{i}" for i in range(2000)]
+        counts = np.arange(1, 2001, dtype=np.int32)
+        sketch.add(_hashes(keys), counts)
+
+        over = sketch.estimate(_hashes(keys)) - counts
+        bound = np.e / 512 * counts.sum()
+        self.assertTrue((over >= 0).all())
+        self.assertGreaterEqual((over <= bound).mean(), 0.98)
+
+    def test_seeds_give_independent_rows(self):
+        hashes = _hashes(["python"])
+        a = CountMinSketch(4096, 4, seed=0)._columns(hashes)
+        b = CountMinSketch(4096, 4, seed=1)._columns(hashes)
+        self.assertFalse((a == b).all())
+
+
+class KeywordTrackerTests(SimpleTestCase):
+    HOUR = 3600
+    START = 1_700_000_000 // HOUR * HOUR
+
+    def stories(self, title, count, first_id=0):
+        return [{"id": first_id + i, "title": title} for i in range(count)]
+
+    def make_tracker(self):
+        tracker = KeywordTracker(
+            window_seconds=self.HOUR, windows=4, sketch_width=1024, capacity=50
+        )
+        # Python is steady over three hours, rust shows up in the last one
+        for hour in range(3):
+            tracker.ingest(
+                ranking.HACKERNEWS,
+                self.stories("python tips", 5, first_id=hour * 100),
+                story_texts,
+                now=self.START + hour * self.HOUR,
+            )
+        tracker.ingest(
+            ranking.HACKERNEWS,
+            self.stories("rust release", 10, first_id=1000),
+            story_texts,
+            now=self.START + 2 * self.HOUR + 60,
+        )
+        return tracker
+
+    def test_rising_keywords(self):
+        rising = self.make_tracker().rising(limit=10, min_count=3)
+        keywords = [entry["keyword"] for entry in rising]
+        self.assertEqual(set(keywords[:3]), {"rust", "release", "rust release"})
+        self.assertNotIn("python", keywords)
+        rust = rising[keywords.index("rust")]
+        self.assertEqual((rust["count"], rust["baseline"]), (10, 0.0))
+
+    def test_min_count(self):
+        self.assertEqual(self.make_tracker().rising(min_count=11), [])
+
+    def test_items_count_once_per_window(self):
+        tracker = self.make_tracker()
+        now = self.START + 2 * self.HOUR + 120
+        tracker.ingest(
+            ranking.HACKERNEWS, self.stories("rust release", 10, 1000), story_texts, now
+        )
+        self.assertEqual(tracker.top(limit=1), [{"keyword": "rust", "count": 10}])
+
+        # The next window counts them again
+        tracker.ingest(
+            ranking.HACKERNEWS,
+            self.stories("rust release", 10, 1000),
+            story_texts,
+            now + self.HOUR,
+        )
+        self.assertEqual(tracker.top(limit=1), [{"keyword": "rust", "count": 10}])
+        self.assertEqual(tracker.stats()["items_in_window"], 10)
+
+
+def redis_connection():
+    connection = redis.Redis.from_url(
+        config("REDIS_URL", default="redis://localhost:6379/1"),
+        socket_connect_timeout=0.2,
+    )
+    try:
+        connection.ping()
+    except redis.RedisError:
+        return None
+    return connection
+
+
+REDIS = redis_connection()
+
+
+@unittest.skipUnless(REDIS, "Redis is not reachable at REDIS_URL")
+class GCRAScriptTests(SimpleTestCase):
+    """
+    The Lua script at 5 requests/minute: one every 12s, bursts of 5
+    """
+
+    INTERVAL = 12_000_000
+    TOLERANCE = 60_000_000
+
+    def setUp(self):
+        self.key = "gcra:test:client"
+        REDIS.delete(self.key)
+        self.addCleanup(REDIS.delete, self.key)
+        self.script = REDIS.register_script(GCRA_SCRIPT)
+
+    def call(self, pending=0):
+        return self.script(
+            keys=[self.key], args=[self.INTERVAL, self.TOLERANCE, pending]
+        )
+
+    def test_burst_boundary(self):
+        for _ in range(5):
+            self.assertEqual(self.call()[0], 1)
+        allowed, _, retry_after = self.call()
+        self.assertEqual(allowed, 0)
+        self.assertAlmostEqual(retry_after / 1e6, 12, delta=0.5)
+
+    def test_requests_admitted_locally_are_charged(self):
+        for _ in range(3):
+            self.call()
+        self.assertEqual(self.call(pending=2)[0], 0)
+
+
+class GCRAThrottleTests(SimpleTestCase):
+    class Throttle(GCRAAnonRateThrottle):
+        rate = "5/min"
+
+    def setUp(self):
+        patcher = mock.patch.object(self.Throttle, "uses_redis", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.throttle = self.Throttle()
+        self.throttle.buckets = LocalBuckets()
+
+    def allow(self, script):
+        request = Request(RequestFactory().get("/", REMOTE_ADDR="10.0.0.1"))
+        with mock.patch.object(self.Throttle, "get_script", return_value=script):
+            return self.throttle.allow_request(request, None)
+
+    def test_fails_open_when_redis_is_down(self):
+        with self.assertLogs("dashboard.throttling", "WARNING"):
+            self.assertTrue(
+                self.allow(mock.Mock(side_effect=redis.ConnectionError("down")))
+            )
+
+    def test_denied_request_waits_for_retry_after(self):
+        self.assertFalse(
+            self.allow(mock.Mock(return_value=[0, 60_000_000, 12_000_000]))
+        )
+        self.assertEqual(self.throttle.wait(), 12.0)
+
+    @override_settings(THROTTLE_LOCAL_HEADROOM=0.5, THROTTLE_LOCAL_MAX_PENDING=10)
+    def test_clients_well_under_their_limit_skip_redis(self):
+        # One request of a 5-request burst used: after the next the client is
+        # at 2/5 of its burst, under the headroom, after the one after at 3/5
+        script = mock.Mock(return_value=[1, 12_000_000, 0])
+        for _ in range(3):
+            self.assertTrue(self.allow(script))
+        self.assertEqual(script.call_count, 2)
+        # The request admitted locally is charged with the next Redis call
+        self.assertEqual(script.call_args.kwargs["args"][2], 1)
+
+
+class FreshnessTests(SimpleTestCase):
+    def test_cache_control(self):
+        cases = [
+            ({"Cache-Control": "max-age=60"}, 60.0),
+            ({"Cache-Control": "max-age=60, s-maxage=10"}, 10.0),
+            ({"Cache-Control": "max-age=60", "Age": "45"}, 15.0),
+            ({"Cache-Control": "max-age=60", "Age": "90"}, 0.0),
+            ({"Cache-Control": "no-cache, max-age=60"}, 0.0),
+            ({"Cache-Control": "no-store"}, None),
+            ({"Cache-Control": "private, max-age=60"}, None),
+            ({}, 0.0),
+        ]
+        for headers, lifetime in cases:
+            with self.subTest(headers=headers):
+                self.assertEqual(freshness_lifetime(headers), lifetime)
+
+    def test_expires_relative_to_date(self):
+        headers = {
+            "Date": "Mon, 19 Oct 2026 10:00:00 GMT",
+            "Expires": "Mon, 19 Oct 2026 10:05:00 GMT",
+        }
+        self.assertEqual(freshness_lifetime(headers), 300.0)
+
+
+class CachingHTTPAdapterTests(SimpleTestCase):
+    URL = "https://api.example.com/items"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.adapter = CachingHTTPAdapter(
+            HTTPCacheStore(str(Path(directory.name) / "cache.sqlite3"))
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.upstream = []  # responses the next upstream calls return
+        self.requests = []  # requests that reached upstream
+
+        def send(adapter, request, **kwargs):
+            self.requests.append(request)
+            return self.upstream.pop(0)
+
+        patcher = mock.patch.object(HTTPAdapter, "send", send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def respond(self, status=200, body=b'{"items": []}', **headers):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(
+            {name.replace("_", "-"): value for name, value in headers.items()}
+        )
+        response._content = body if status == 200 else b""
+        response.raw = io.BytesIO()
+        self.upstream.append(response)
+
+    def test_fresh_response_is_served_from_the_store(self):
+        self.respond(Cache_Control="max-age=60", x_ratelimit_remaining="41")
+        first = self.session.get(self.URL)
+        second = self.session.get(self.URL)
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.json(), {"items": []})
+        # Rate-limit headers describe the upstream call, never a stored copy
+        self.assertEqual(first.headers["x-ratelimit-remaining"], "41")
+        self.assertNotIn("x-ratelimit-remaining", second.headers)
+
+    def test_stale_response_is_revalidated_with_its_etag(self):
+        self.respond(Cache_Control="no-cache", ETag='"v1"')
+        self.respond(status=304, Cache_Control="max-age=60", x_ratelimit_remaining="40")
+        self.session.get(self.URL)
+        revalidated = self.session.get(self.URL)
+
+        self.assertEqual(self.requests[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertEqual(revalidated.headers["X-Cache"], "REVALIDATED")
+        self.assertEqual(revalidated.json(), {"items": []})
+        self.assertEqual(revalidated.headers["x-ratelimit-remaining"], "40")
+
+        # The 304 made it fresh for another minute
+        self.assertEqual(self.session.get(self.URL).headers["X-Cache"], "HIT")
+        self.assertEqual(len(self.requests), 2)
+
+    def test_private_and_no_store_responses_are_not_stored(self):
+        for cache_control in ("private, max-age=60", "no-store"):
+            with self.subTest(cache_control=cache_control):
+                self.respond(Cache_Control=cache_control)
+                self.respond(Cache_Control=cache_control)
+                self.assertEqual(self.session.get(self.URL).headers["X-Cache"], "MISS")
+                self.assertEqual(self.session.get(self.URL).headers["X-Cache"], "MISS")
+
+    def test_errors_are_not_stored(self):
+        self.respond(status=500, Cache_Control="max-age=60")
+        self.respond(Cache_Control="max-age=60")
+        self.assertEqual(self.session.get(self.URL).status_code, 500)
+        self.assertEqual(self.session.get(self.URL).status_code, 200)
+
+
+class SchedulerTests(SimpleTestCase):
+    SOURCES = {
+        "hackernews": {"interval": 600, "min_interval": 60, "max_interval": 3600}
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.scheduler = AdaptiveScheduler(self.SOURCES)
+
+    def interval_after(self, ids, quota=None):
+        return self.scheduler.record("hackernews", ids, quota, now=0)["interval"]
+
+    def test_change_ratio(self):
+        self.assertEqual(change_ratio([], []), 0.0)
+        self.assertEqual(change_ratio("abc", "abc"), 0.0)
+        self.assertEqual(change_ratio("ab", "cd"), 1.0)
+        self.assertEqual(change_ratio("abc", "abd"), 0.5)
+
+    def test_first_refresh_keeps_the_interval(self):
+        self.assertEqual(self.interval_after("abc"), 600)
+        self.assertIsNone(self.scheduler.state("hackernews")["change"])
+
+    def test_interval_follows_the_change_rate(self):
+        self.interval_after("abcdefghij")
+        self.assertEqual(self.interval_after("abcdefghij"), 900)  # no change
+        self.assertEqual(self.interval_after("abcdefghiz"), 900)  # in between
+        self.assertEqual(self.interval_after("vwxyz"), 450)  # all new
+
+    def test_interval_stays_within_bounds(self):
+        for letter in "abcdefghij":
+            interval = self.interval_after(letter)
+        self.assertEqual(interval, 60)
+        for _ in range(12):
+            interval = self.interval_after("j")
+        self.assertEqual(interval, 3600)
+
+    def test_failures_double_the_interval(self):
+        self.assertEqual(self.interval_after(None), 1200)
+        self.assertEqual(self.interval_after(None), 2400)
+        self.assertEqual(self.scheduler.state("hackernews")["failures"], 2)
+        self.interval_after("abc")
+        self.assertEqual(self.scheduler.state("hackernews")["failures"], 0)
+
+    def test_quota_reserve_only_lengthens_the_interval(self):
+        self.interval_after("abc")
+        # All new data would halve it, but a quarter of the reserve is left
+        self.assertEqual(self.interval_after("xyz", quota=0.05), 1050)
+        self.assertEqual(self.interval_after("abc", quota=0.0), 2100)
+        # Above the reserve the quota plays no part
+        self.assertEqual(self.interval_after("xyz", quota=0.5), 1050)
+
+    def test_due_sources_are_claimed_for_an_interval(self):
+        self.assertEqual(self.scheduler.due_sources(now=1000), ["hackernews"])
+        self.assertEqual(self.scheduler.due_sources(now=1300), [])
+        self.assertEqual(self.scheduler.due_sources(now=1600), ["hackernews"])
+
+        self.scheduler.record("hackernews", "abc", now=1600)
+        self.assertEqual(self.scheduler.due_sources(now=2100), [])
+        self.assertEqual(self.scheduler.due_sources(now=2200), ["hackernews"])
+
+
+@unittest.skipUnless(importlib.util.find_spec("celery"), "Celery not installed")
+class DispatchRefreshesTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_queues_each_due_source_once(self):
+        from . import tasks
+
+        with mock.patch.object(tasks.refresh_source, "delay") as delay:
+            tasks.dispatch_refreshes()
+            tasks.dispatch_refreshes()
+        queued = [call.args[0] for call in delay.call_args_list]
+        self.assertEqual(sorted(queued), sorted(tasks.scheduler.sources))
+
+
+class RecordTests(SimpleTestCase):
+    def test_records_hash_and_compare_by_identity(self):
+        post = RedditPost.from_api({"id": "a1", "title": "Rust"}, "rust")
+        twin = RedditPost.from_api({"id": "a1", "title": "Rust"}, "rust")
+        self.assertEqual(len({post, twin}), 2)
+        self.assertEqual(post, post)
+        self.assertNotEqual(post, twin)
+        self.assertNotEqual(post, post.to_dict())
+
+    def test_empty_source_subreddit_is_left_out(self):
+        post = RedditPost.from_api({"id": "a1"}, "rust")
+        self.assertNotIn("source_subreddit", post)
+        self.assertIsNone(post.get("source_subreddit"))
+
+        post.source_subreddit = "rust"
+        self.assertEqual(post["source_subreddit"], "rust")
+        self.assertEqual(post.to_dict()["source_subreddit"], "rust")
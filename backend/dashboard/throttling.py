@@ -0,0 +1,196 @@
+"""
+GCRA rate throttles backed by one atomic Redis call
+
+DRF's SimpleRateThrottle keeps a list of request timestamps per client in the
+cache and reads, trims and rewrites the whole list on every request: with a
+1000/hour rate that is a pickled list of up to 1000 floats moved twice per
+request. The Generic Cell Rate Algorithm needs a single number per client,
+the theoretical arrival time (TAT) of its next request, and is updated in one
+Lua script so concurrent workers never race.
+
+Clients that are clearly under their limit skip Redis entirely: after a sync
+each process may admit up to THROTTLE_LOCAL_MAX_PENDING requests on its own
+while the last known state shows the client below THROTTLE_LOCAL_HEADROOM of
+its burst, and charges them to Redis with the next call. Overshoot is bounded
+by workers x max pending per sync interval.
+
+Without a Redis cache backend the throttles behave like DRF's.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: client key
+# ARGV: emission interval, burst tolerance, already admitted locally (all in
+# microseconds except the count)
+# Returns {allowed, TAT - now, retry after}, in microseconds of Redis' clock
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local pending = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+-- Requests admitted locally were already served and are charged regardless
+tat = tat + interval * pending
+
+local allowed = 0
+local retry_after = 0
+if tat + interval - tolerance <= now then
+    tat = tat + interval
+    allowed = 1
+else
+    retry_after = tat + interval - tolerance - now
+end
+
+if tat > now then
+    redis.call('SET', KEYS[1], tat, 'PX', math.ceil((tat - now) / 1000))
+end
+return {allowed, tat - now, retry_after}
+"""
+
+
+class LocalBuckets:
+    """
+    Per-process view of each client's GCRA state, for the local fast path
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        # key -> [tat, synced_at, pending], times from time.monotonic()
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.lock = threading.Lock()
+
+    def try_admit(
+        self,
+        key: str,
+        interval: float,
+        tolerance: float,
+        headroom: float,
+        max_pending: int,
+        sync_interval: float,
+    ) -> bool:
+        """
+        Admit a request without Redis if the client is clearly under its limit
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[2] >= max_pending:
+                return False
+            tat, synced_at, pending = entry
+            if now - synced_at > sync_interval:
+                return False
+            # Share of the burst the client would have used after this request
+            used = (max(tat, now) + interval - now) / tolerance if tolerance else 1.0
+            if used > headroom:
+                return False
+            entry[0] = max(tat, now) + interval
+            entry[2] = pending + 1
+            return True
+
+    def take_pending(self, key: str) -> int:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return 0
+            pending, entry[2] = entry[2], 0
+            return pending
+
+    def sync(self, key: str, tat_from_now: float):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            pending = entry[2] if entry is not None else 0
+            self.entries[key] = [now + tat_from_now, now, pending]
+
+
+local_buckets = LocalBuckets()
+
+
+class GCRAThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's timestamp history with GCRA in Redis
+    """
+
+    cache_format = "gcra:%(scope)s:%(ident)s"
+    buckets = local_buckets
+    _script = None
+
+    @classmethod
+    def uses_redis(cls) -> bool:
+        return settings.CACHES["default"]["BACKEND"].startswith("django_redis.")
+
+    @classmethod
+    def get_script(cls):
+        if GCRAThrottleMixin._script is None:
+            from django_redis import get_redis_connection
+
+            GCRAThrottleMixin._script = get_redis_connection("default").register_script(
+                GCRA_SCRIPT
+            )
+        return GCRAThrottleMixin._script
+
+    def allow_request(self, request, view):
+        if self.rate is None or not self.uses_redis():
+            return super().allow_request(request, view)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        # A client may burst its whole allowance, then one request per interval
+        interval = self.duration / self.num_requests
+        tolerance = self.duration
+        self.retry_after: Optional[float] = None
+
+        if self.buckets.try_admit(
+            self.key,
+            interval,
+            tolerance,
+            settings.THROTTLE_LOCAL_HEADROOM,
+            settings.THROTTLE_LOCAL_MAX_PENDING,
+            settings.THROTTLE_LOCAL_SYNC_INTERVAL,
+        ):
+            return True
+
+        pending = self.buckets.take_pending(self.key)
+        try:
+            allowed, tat_from_now, retry_after = self.get_script()(
+                keys=[self.key],
+                args=[round(interval * 1e6), round(tolerance * 1e6), pending],
+            )
+        except Exception as e:
+            # Fail open: an unreachable Redis must not take the API down
+            logger.warning(f"Throttle check failed for {self.key}: {str(e)}")
+            return True
+
+        self.buckets.sync(self.key, tat_from_now / 1e6)
+        if allowed:
+            return True
+        self.retry_after = retry_after / 1e6
+        return self.throttle_failure()
+
+    def wait(self):
+        if getattr(self, "retry_after", None) is None:
+            return super().wait()
+        return self.retry_after
+
+
+class GCRAAnonRateThrottle(GCRAThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class GCRAUserRateThrottle(GCRAThrottleMixin, UserRateThrottle):
+    pass
@@ -0,0 +1,167 @@
+"""
+Two-tier cache: a per-process LRU in front of the shared Django cache
+
+Hot keys such as the trending snapshot are read far more often than they
+change. Reads are served from a bounded in-process ``cachetools.TTLCache``,
+so they skip the Redis round trip and the unpickling. Values are stored in the
+shared cache under versioned keys; each write bumps the key's version and
+publishes it on a Redis pub/sub channel so every worker drops its stale local
+copy right away. The local TTL bounds staleness if an invalidation is missed.
+
+With a non-Redis cache backend (LocMemCache in development) there is nothing
+to subscribe to and only the local TTL applies.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "dashboard:cache-invalidation"
+
+
+class TieredCache:
+    """
+    Process-local LRU/TTL tier over a Django cache alias, with versioned keys
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        maxsize: int = 256,
+        local_ttl: float = 60.0,
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        self.alias = alias
+        self.channel = channel
+        self.local = TTLCache(maxsize=maxsize, ttl=local_ttl)  # key -> (version, value)
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _uses_redis(self) -> bool:
+        return settings.CACHES[self.alias]["BACKEND"].startswith("django_redis.")
+
+    @staticmethod
+    def _version_key(key: str) -> str:
+        return f"{key}:version"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self.local.get(key)
+        if entry is not None:
+            return entry[1]
+
+        self._ensure_listener()
+        version = self.shared.get(self._version_key(key))
+        if version is None:
+            return default
+        value = self.shared.get(f"{key}:v{version}")
+        if value is None:
+            return default
+
+        with self._lock:
+            current = self.local.get(key)
+            if current is None or current[0] < version:
+                self.local[key] = (version, value)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None):
+        """
+        Store a new version of ``key`` and tell every worker to drop older ones
+        """
+        version = self._next_version(key)
+        self.shared.set(f"{key}:v{version}", value, timeout=timeout)
+        self.shared.set(self._version_key(key), version, timeout=timeout)
+
+        with self._lock:
+            self.local[key] = (version, value)
+        self._publish(key, version)
+
+    def delete(self, key: str):
+        self.shared.delete(self._version_key(key))
+        with self._lock:
+            self.local.pop(key, None)
+        self._publish(key, None)
+
+    def _next_version(self, key: str) -> int:
+        # The counter never expires, so versions keep increasing even after
+        # the versioned values themselves have timed out
+        counter = f"{key}:counter"
+        try:
+            return self.shared.incr(counter)
+        except ValueError:
+            self.shared.add(counter, 0, timeout=None)
+            return self.shared.incr(counter)
+
+    def invalidate_local(self, key: str, version: Optional[int] = None):
+        """
+        Drop the local copy of ``key`` if it is older than ``version`` (or always)
+        """
+        with self._lock:
+            entry = self.local.get(key)
+            if entry is not None and (version is None or entry[0] < version):
+                del self.local[key]
+
+    def _publish(self, key: str, version: Optional[int]):
+        if not self._uses_redis():
+            return
+        try:
+            from django_redis import get_redis_connection
+
+            get_redis_connection(self.alias).publish(
+                self.channel, json.dumps({"key": key, "version": version})
+            )
+        except Exception as e:
+            logger.error(f"Failed to publish cache invalidation for {key}: {str(e)}")
+
+    def _ensure_listener(self):
+        if self._listener is not None or not self._uses_redis():
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="tiered-cache-invalidation", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        from django_redis import get_redis_connection
+
+        backoff = 1.0
+        while True:
+            try:
+                pubsub = get_redis_connection(self.alias).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(self.channel)
+                # Invalidations may have been missed while not subscribed
+                with self._lock:
+                    self.local.clear()
+                backoff = 1.0
+
+                for message in pubsub.listen():
+                    data = json.loads(message["data"])
+                    self.invalidate_local(data["key"], data["version"])
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation listener disconnected, retrying in "
+                    f"{backoff:.0f}s: {str(e)}"
+                )
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+tiered_cache = TieredCache(
+    maxsize=settings.LOCAL_CACHE_MAXSIZE, local_ttl=settings.LOCAL_CACHE_TTL
+)
@@ -0,0 +1,255 @@
+"""
+Array-backed star/fork history per GitHub repository, for velocity rankings
+
+Every refresh that lands writes one column into fixed-size NumPy matrices
+(repositories x samples); repositories that were not part of the refresh get
+NaN in that column. Both dimensions are bounded, so memory stays constant: the
+oldest column is overwritten once the window is full, and the least recently
+seen repositories are evicted once the row capacity is reached.
+
+History is built where refreshes run and shared with every process through
+the cache, see dashboard/shared_state.py. Besides every repository list a
+refresh fetches, ``sample_star_history`` samples new and established active
+repositories for "all languages" and the STAR_HISTORY_LANGUAGES, never for
+arbitrary request filters.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import receiver
+
+from . import shared_state
+from .api_clients import github_client
+from .signals import repositories_fetched
+
+
+class StarHistory(shared_state.SharedStore):
+    """
+    Bounded star and fork time series for up to ``max_repos`` repositories
+
+    Sampling is tracked for "" (all languages) and ``languages`` only.
+    """
+
+    LOCAL_FIELDS = ("_lock", "languages")
+
+    def __init__(
+        self,
+        max_repos: int = 20000,
+        window: int = 48,
+        min_interval: float = 300.0,
+        max_age_hours: float = 72.0,
+        languages: Sequence[str] = (),
+    ):
+        self.max_repos = max_repos
+        self.window = window
+        self.min_interval = min_interval
+        self.max_age_hours = max_age_hours
+        self.languages = ("",) + tuple(
+            language.strip().lower() for language in languages if language.strip()
+        )
+
+        self.stars = np.full((max_repos, window), np.nan, dtype=np.float32)
+        self.forks = np.full((max_repos, window), np.nan, dtype=np.float32)
+        self.times = np.full(window, np.nan, dtype=np.float64)
+        self.last_seen = np.zeros(max_repos, dtype=np.float64)
+        self.head = -1  # column of the latest sample
+
+        self.rows: Dict[int, int] = {}
+        self.repos: List[Optional[Dict]] = [None] * max_repos
+        # Last sample per entry of ``languages``
+        self.sampled_at: Dict[str, float] = {}
+        self._free = list(range(max_repos - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _allocate_rows(self, count: int):
+        """
+        Make sure ``count`` rows are free, evicting the least recently seen repos
+        """
+        missing = count - len(self._free)
+        if missing <= 0:
+            return
+
+        used = np.flatnonzero(self.last_seen > 0)
+        evict = used[np.argpartition(self.last_seen[used], missing - 1)[:missing]]
+        for row in evict:
+            del self.rows[self.repos[row]["id"]]
+            self.repos[row] = None
+            self.last_seen[row] = 0
+            self.stars[row] = np.nan
+            self.forks[row] = np.nan
+            self._free.append(int(row))
+
+    def record(self, repos: Sequence[Dict], timestamp: Optional[float] = None):
+        """
+        Append one sample for each repository in a refresh
+        """
+        if not repos:
+            return
+        now = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            # Refreshes close together share a column instead of eating the window
+            if self.head < 0 or now - self.times[self.head] >= self.min_interval:
+                self.head = (self.head + 1) % self.window
+                self.times[self.head] = now
+                self.stars[:, self.head] = np.nan
+                self.forks[:, self.head] = np.nan
+
+            new_ids = {repo["id"] for repo in repos if repo["id"] not in self.rows}
+            self._allocate_rows(min(len(new_ids), self.max_repos))
+
+            rows = np.empty(len(repos), dtype=np.int64)
+            for i, repo in enumerate(repos):
+                row = self.rows.get(repo["id"])
+                if row is None:
+                    if not self._free:
+                        rows = rows[:i]
+                        break
+                    row = self._free.pop()
+                    self.rows[repo["id"]] = row
+                self.repos[row] = repo
+                rows[i] = row
+
+            self.stars[rows, self.head] = [repo["stars"] for repo in repos[: len(rows)]]
+            self.forks[rows, self.head] = [repo["forks"] for repo in repos[: len(rows)]]
+            self.last_seen[rows] = now
+
+    def needs_sample(self, language: str = "", now: Optional[float] = None) -> bool:
+        """
+        Whether ``language`` is sampled and its last sample is older than
+        ``min_interval``
+        """
+        language = language.lower()
+        if language not in self.languages:
+            return False
+        now = time.time() if now is None else now
+        sampled_at = self.sampled_at.get(language, float("-inf"))
+        return now - sampled_at >= self.min_interval
+
+    def mark_sampled(self, language: str = "", now: Optional[float] = None):
+        language = language.lower()
+        with self._lock:
+            # Also drops languages removed from the configuration since
+            self.sampled_at = {
+                name: at
+                for name, at in self.sampled_at.items()
+                if name in self.languages
+            }
+            if language in self.languages:
+                self.sampled_at[language] = time.time() if now is None else now
+
+    def velocities(self, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Stars/hour, forks/hour and star acceleration (stars/hour^2) for every row
+
+        Velocity compares the first and last sample inside the retention window;
+        acceleration compares the velocity of the newer half with the older half.
+        Rows with fewer than two samples get zero.
+        """
+        now = time.time() if now is None else now
+
+        # Columns in chronological order, limited to the retention window
+        order = (np.arange(self.window) + self.head + 1) % self.window
+        times = self.times[order]
+        stars = self.stars[:, order]
+        forks = self.forks[:, order]
+        in_window = ~np.isnan(times) & (times >= now - self.max_age_hours * 3600)
+        valid = ~np.isnan(stars) & in_window
+
+        columns = np.arange(self.window)
+        first = np.argmax(valid, axis=1)
+        last = self.window - 1 - np.argmax(valid[:, ::-1], axis=1)
+        # Latest valid column at or before the midpoint between first and last
+        last_valid_upto = np.maximum.accumulate(np.where(valid, columns, -1), axis=1)
+        rows = np.arange(len(valid))
+        mid = last_valid_upto[rows, (first + last) // 2]
+
+        has_history = valid.any(axis=1) & (last > first)
+        hours = np.where(has_history, (times[last] - times[first]) / 3600.0, 1.0)
+
+        star_velocity = (stars[rows, last] - stars[rows, first]) / hours
+        fork_velocity = (forks[rows, last] - forks[rows, first]) / hours
+
+        older_hours = np.maximum((times[mid] - times[first]) / 3600.0, 1e-9)
+        newer_hours = np.maximum((times[last] - times[mid]) / 3600.0, 1e-9)
+        has_halves = has_history & (mid > first) & (last > mid)
+        older = (stars[rows, mid] - stars[rows, first]) / older_hours
+        newer = (stars[rows, last] - stars[rows, mid]) / newer_hours
+        acceleration = np.where(has_halves, (newer - older) / (hours / 2), 0.0)
+
+        return {
+            "stars_per_hour": np.where(has_history, star_velocity, 0.0),
+            "forks_per_hour": np.where(has_history, fork_velocity, 0.0),
+            "acceleration": np.nan_to_num(acceleration),
+        }
+
+    def top_by_velocity(self, limit: int = 30, language: str = "") -> List[Dict]:
+        """
+        Tracked repositories with the highest star velocity, best first
+        """
+        with self._lock:
+            metrics = self.velocities()
+            score = metrics["stars_per_hour"].copy()
+            score[self.last_seen == 0] = -np.inf
+            if language:
+                wanted = language.lower()
+                for row, repo in enumerate(self.repos):
+                    if repo is not None and repo["language"].lower() != wanted:
+                        score[row] = -np.inf
+
+            candidates = np.flatnonzero(np.isfinite(score))
+            if len(candidates) > limit:
+                candidates = candidates[
+                    np.argpartition(-score[candidates], limit - 1)[:limit]
+                ]
+            candidates = candidates[np.argsort(-score[candidates], kind="stable")]
+
+            return [
+                dict(
+                    self.repos[row],
+                    stars_per_hour=round(float(metrics["stars_per_hour"][row]), 2),
+                    forks_per_hour=round(float(metrics["forks_per_hour"][row]), 2),
+                    star_acceleration=round(float(metrics["acceleration"][row]), 3),
+                )
+                for row in candidates
+            ]
+
+
+star_history = shared_state.register(
+    "star_history",
+    StarHistory(
+        max_repos=settings.STAR_HISTORY_MAX_REPOS,
+        window=settings.STAR_HISTORY_WINDOW,
+        min_interval=settings.STAR_HISTORY_MIN_INTERVAL,
+        max_age_hours=settings.STAR_HISTORY_MAX_AGE_HOURS,
+        languages=settings.STAR_HISTORY_LANGUAGES,
+    ),
+)
+
+
+def sample_star_history(language: str = "", days: int = 7) -> bool:
+    """
+    Fetch new and established active repositories of ``language`` if it is due
+
+    Two search calls; returns whether they were made. Run inside
+    shared_state.updating() so the fetched repositories are recorded.
+    """
+    if not star_history.needs_sample(language):
+        return False
+    github_client.get_trending_repositories(language=language, days=days, limit=100)
+    github_client.get_active_repositories(language=language)
+    star_history.mark_sampled(language)
+    return True
+
+
+@receiver(repositories_fetched)
+@shared_state.ingests("star_history")
+def record_star_history(sender, repos, **kwargs):
+    star_history.record(repos)
@@ -0,0 +1,323 @@
+"""
+Trending topics aggregation across GitHub, Reddit and Hacker News
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import dedup, keywords, ranking
+from .api_clients import github_client, reddit_client, hackernews_client
+
+logger = logging.getLogger(__name__)
+
+
+def repo_topic(repo: Dict, trend_score: float) -> Dict:
+    return {
+        "id": f"github_{repo['id']}",
+        "keyword": repo["name"],
+        "platform": "GitHub",
+        "trend_score": trend_score,
+        "posts_count": repo["forks"],
+        "description": (
+            repo["description"][:100] + "..."
+            if len(repo["description"]) > 100
+            else repo["description"]
+        ),
+        "language": repo["language"],
+        "url": repo["url"],
+        "stars": repo["stars"],
+        "type": "repository",
+    }
+
+
+def post_topic(post: Dict, trend_score: float) -> Dict:
+    return {
+        "id": f"reddit_{post['id']}",
+        "keyword": (
+            post["title"][:50] + "..." if len(post["title"]) > 50 else post["title"]
+        ),
+        "platform": "Reddit",
+        "trend_score": trend_score,
+        "posts_count": post["num_comments"],
+        "description": post.get("selftext", f"Discussion in r/{post['subreddit']}"),
+        "language": post.get("flair_text", "Discussion"),
+        "url": post["url"],
+        "score": post["score"],
+        "subreddit": post["subreddit"],
+        "type": "discussion",
+    }
+
+
+def story_topic(story: Dict, trend_score: float) -> Dict:
+    return {
+        "id": f"hackernews_{story['id']}",
+        "keyword": (
+            story["title"][:50] + "..." if len(story["title"]) > 50 else story["title"]
+        ),
+        "platform": "Hacker News",
+        "trend_score": trend_score,
+        "posts_count": story["descendants"],
+        "description": f"Tech news story by {story['by']}",
+        "language": "Tech News",
+        "url": (
+            story["url"]
+            if story["url"]
+            else f"https://news.ycombinator.com/item?id={story['id']}"
+        ),
+        "score": story["score"],
+        "author": story["by"],
+        "type": "news",
+    }
+
+
+def rank_trending_topics(
+    repos: List[Dict], posts: List[Dict], stories: List[Dict]
+) -> List[Dict]:
+    """
+    Rank repositories, posts and stories together with dashboard.ranking
+
+    Items linking to the same canonical URL are merged into one topic with
+    their engagement combined, and list their copies under ``also_on``.
+    """
+    sources = {
+        ranking.GITHUB: (repos, repo_topic),
+        ranking.REDDIT: (posts, post_topic),
+        ranking.HACKERNEWS: (stories, story_topic),
+    }
+    texts_of = {
+        ranking.GITHUB: keywords.repo_texts,
+        ranking.REDDIT: keywords.post_texts,
+        ranking.HACKERNEWS: keywords.story_texts,
+    }
+    urls = (
+        [dedup.repo_url(r) for r in repos]
+        + [dedup.post_url(p) for p in posts]
+        + [dedup.story_url(s) for s in stories]
+    )
+    groups, _ = dedup.group_ids(urls)
+
+    topics = []
+    for platform, index, trend_score, duplicates in ranking.rank(
+        repos, posts, stories, groups=groups
+    ):
+        items, to_topic = sources[platform]
+        topic = to_topic(items[index], trend_score)
+        topic["keywords"] = keywords.keyword_tracker.keywords_for(
+            texts_of[platform](items[index])
+        )
+
+        also_on = {}
+        for dup_platform, dup_index in duplicates:
+            item = sources[dup_platform][0][dup_index]
+            topic["posts_count"] += _engagement(dup_platform, item)
+            also_on[(dup_platform, str(item["id"]))] = {
+                "platform": dup_platform,
+                "id": item["id"],
+                "url": item["url"],
+                "score": item.get("stars", item.get("score", 0)),
+            }
+
+        # Copies seen in earlier refreshes of other sources
+        for member in dedup.canonical_index.lookup(
+            urls[_row(sources, platform, index)]
+        ):
+            key = (member["platform"], str(member["id"]))
+            if member["platform"] != platform and key not in also_on:
+                also_on[key] = {k: v for k, v in member.items() if k != "seen_at"}
+
+        if also_on:
+            topic["also_on"] = list(also_on.values())
+        topics.append(topic)
+    return topics
+
+
+def _engagement(platform: str, item: Dict) -> int:
+    if platform == ranking.GITHUB:
+        return item["forks"]
+    if platform == ranking.REDDIT:
+        return item["num_comments"]
+    return item["descendants"] or 0
+
+
+def _row(sources: Dict, platform: str, index: int) -> int:
+    """
+    Position of a source item in the concatenated repos + posts + stories order
+    """
+    offset = 0
+    for name in ranking.PLATFORMS:
+        if name == platform:
+            return offset + index
+        offset += len(sources[name][0])
+    raise KeyError(platform)
+
+
+def fetch_github() -> Tuple[List[Dict], Optional[str], Dict]:
+    # Get trending repositories (last 7 days), failures propagate to the view
+    trending_repos = github_client.get_trending_repositories(days=7, limit=20)
+    status = {
+        "status": "connected",
+        "last_fetch": "just now",
+        "repos_count": len(trending_repos),
+        "rate_limit_remaining": github_client.get_api_status()["rate_limit"][
+            "remaining"
+        ],
+    }
+    return trending_repos, None, status
+
+
+def fetch_reddit() -> Tuple[List[Dict], Optional[str], Dict]:
+    # Try to get Reddit posts, but don't fail if Reddit is down
+    reddit_posts = []
+    reddit_error = None
+    try:
+        reddit_posts = reddit_client.get_programming_trending()
+        logger.info(f"Successfully fetched {len(reddit_posts)} Reddit posts")
+    except Exception as e:
+        reddit_error = str(e)
+        logger.error(
+            f"Reddit API failed, continuing without Reddit data: {reddit_error}"
+        )
+
+    reddit_status = {
+        "status": "connected" if reddit_posts and not reddit_error else "error",
+        "last_fetch": "just now" if reddit_posts else "failed",
+        "posts_count": len(reddit_posts),
+        "subreddits_monitored": 7 if reddit_posts else 0,
+    }
+    if reddit_error:
+        reddit_status["error"] = reddit_error[:100]
+    return reddit_posts, reddit_error, reddit_status
+
+
+def fetch_hackernews() -> Tuple[List[Dict], Optional[str], Dict]:
+    # Try to get Hacker News stories
+    hackernews_stories = []
+    hackernews_error = None
+    try:
+        hackernews_stories = hackernews_client.get_top_stories(limit=15)
+        logger.info(
+            f"Successfully fetched {len(hackernews_stories)} Hacker News stories"
+        )
+    except Exception as e:
+        hackernews_error = str(e)
+        logger.error(
+            f"Hacker News API failed, continuing without HN data: {hackernews_error}"
+        )
+
+    hackernews_status = {
+        "status": (
+            "connected" if hackernews_stories and not hackernews_error else "error"
+        ),
+        "last_fetch": "just now" if hackernews_stories else "failed",
+        "stories_count": len(hackernews_stories),
+    }
+    if hackernews_error:
+        hackernews_status["error"] = hackernews_error[:100]
+    return hackernews_stories, hackernews_error, hackernews_status
+
+
+SOURCE_FETCHERS = {
+    "github": fetch_github,
+    "reddit": fetch_reddit,
+    "hackernews": fetch_hackernews,
+}
+
+
+def iter_trending_records() -> Iterator[Dict]:
+    """
+    Fetch all sources concurrently, yielding a record as each one is ready
+
+    Yields a "platform" record per source (its status and its own items ranked
+    alone), a "language_stats" record, and finally a "summary" record holding
+    the complete /api/trending/ payload.
+    """
+    results = {}
+    language_stats = {}
+
+    with ThreadPoolExecutor(max_workers=len(SOURCE_FETCHERS) + 1) as executor:
+        futures = {
+            executor.submit(fetch): name for name, fetch in SOURCE_FETCHERS.items()
+        }
+        futures[executor.submit(github_client.get_language_stats)] = "language_stats"
+
+        for future in as_completed(futures):
+            name = futures[future]
+            if name == "language_stats":
+                language_stats = future.result()
+                yield {"type": "language_stats", "language_stats": language_stats}
+                continue
+
+            items, error, status = results[name] = future.result()
+            sources = {key: [] for key in SOURCE_FETCHERS}
+            sources[name] = items
+            yield {
+                "type": "platform",
+                "platform": name,
+                "status": status,
+                "items": rank_trending_topics(
+                    sources["github"], sources["reddit"], sources["hackernews"]
+                ),
+            }
+
+    yield {
+        "type": "summary",
+        **assemble_trending_payload(results, language_stats),
+    }
+
+
+# Result of a source not fetched yet, as (items, error, status)
+PENDING_RESULT = ([], None, {"status": "pending", "last_fetch": "not yet"})
+
+
+def pending_trending_payload() -> Dict:
+    """
+    Payload served before the first scheduled refresh, with REFRESH_BY_BEAT
+    """
+    return assemble_trending_payload(
+        {name: PENDING_RESULT for name in SOURCE_FETCHERS}, {}
+    )
+
+
+def assemble_trending_payload(results: Dict, language_stats: Dict) -> Dict:
+    """
+    Build the /api/trending/ payload from the fetched sources
+    """
+    trending_repos, _, github_status = results["github"]
+    reddit_posts, reddit_error, reddit_status = results["reddit"]
+    hackernews_stories, hackernews_error, hackernews_status = results["hackernews"]
+
+    # Rank all sources together and format only the selected items
+    trending_topics = rank_trending_topics(
+        trending_repos, reddit_posts, hackernews_stories
+    )
+
+    return {
+        "trending_topics": trending_topics,
+        "platforms": {
+            "github": github_status,
+            "reddit": reddit_status,
+            "hackernews": hackernews_status,
+        },
+        "language_stats": language_stats,
+        "total_repos_analyzed": len(trending_repos),
+        "total_posts_analyzed": len(reddit_posts),
+        "total_stories_analyzed": len(hackernews_stories),
+        "last_updated": "just now",
+        "api_notes": {
+            "reddit": ("Reddit API can be inconsistent" if reddit_error else None),
+            "hackernews": (
+                "Hacker News API is generally reliable" if hackernews_error else None
+            ),
+        },
+    }
+
+
+def build_trending_payload() -> Dict:
+    """
+    Fetch all sources and assemble the /api/trending/ response payload
+    """
+    for record in iter_trending_records():
+        if record["type"] == "summary":
+            del record["type"]
+            return record
@@ -1,10 +1,13 @@
 from django.urls import path
-from . import views
+from . import profiling, views
 
 urlpatterns = [
     # Status and main endpoints
     path("status/", views.api_status, name="api_status"),
+    path("health/", views.health_check, name="health_check"),
     path("trending/", views.trending_topics, name="trending_topics"),
+    path("trending/keywords/", views.trending_keywords, name="trending_keywords"),
+    path("search/", views.search, name="search"),
     # GitHub endpoints
     path("github/repos/", views.github_repositories, name="github_repositories"),
     path("github/languages/", views.github_languages, name="github_languages"),
@@ -13,4 +16,11 @@ urlpatterns = [
     path("reddit/subreddits/", views.reddit_subreddits, name="reddit_subreddits"),
     # Hacker News endpoints
     path("hackernews/stories/", views.hackernews_stories, name="hackernews_stories"),
+    # Profiling captures (admin only)
+    path("profiling/", profiling.profile_list, name="profile_list"),
+    path(
+        "profiling/<str:capture_id>/<str:kind>/",
+        profiling.profile_download,
+        name="profile_download",
+    ),
 ]
@@ -1,10 +1,31 @@
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
-from .api_clients import github_client, reddit_client, hackernews_client
+from .api_clients import (
+    github_client,
+    github_enricher,
+    reddit_client,
+    hackernews_client,
+)
+from . import shared_state
+from .consumers import get_send_stats
+from .keywords import keyword_tracker
+from .search import PLATFORM_ALIASES, search_index
+from .snapshot import get_snapshot, store_snapshot
+from .timeseries import sample_star_history, star_history
+from .streaming import NDJSONRenderer, ndjson_response, wants_stream
+from .trending import (
+    build_trending_payload,
+    iter_trending_records,
+    pending_trending_payload,
+)
+from .warmup import get_warmup_state
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -59,184 +80,73 @@ def api_status(request):
                 "reddit": reddit_status,
                 "hackernews": hackernews_status,
             },
+            "websocket": get_send_stats(),
         }
     )
 
 
 @api_view(["GET"])
-def trending_topics(request):
+def health_check(request):
     """
-    Get trending topics from GitHub repositories, Reddit posts, and Hacker News stories
+    Readiness probe, reports 503 until this worker has finished warm-up
     """
-    try:
-        # Get trending repositories (last 7 days)
-        trending_repos = github_client.get_trending_repositories(days=7, limit=20)
-
-        # Try to get Reddit posts, but don't fail if Reddit is down
-        reddit_posts = []
-        reddit_error = None
-        try:
-            reddit_posts = reddit_client.get_programming_trending()
-            logger.info(f"Successfully fetched {len(reddit_posts)} Reddit posts")
-        except Exception as e:
-            reddit_error = str(e)
-            logger.error(
-                f"Reddit API failed, continuing without Reddit data: {reddit_error}"
-            )
-
-        # Try to get Hacker News stories
-        hackernews_stories = []
-        hackernews_error = None
-        try:
-            hackernews_stories = hackernews_client.get_top_stories(limit=15)
-            logger.info(
-                f"Successfully fetched {len(hackernews_stories)} Hacker News stories"
-            )
-        except Exception as e:
-            hackernews_error = str(e)
-            logger.error(
-                f"Hacker News API failed, continuing without HN data: {hackernews_error}"
-            )
+    warmup = get_warmup_state()
+    return Response(
+        {"status": "ready" if warmup["ready"] else "warming_up", "warmup": warmup},
+        status=200 if warmup["ready"] else 503,
+    )
 
-        # Get language statistics
-        language_stats = github_client.get_language_stats()
 
-        # Transform trending repos into trending topics format
-        trending_topics = []
+def trending_records():
+    """
+    Records of the streaming /api/trending/ mode, see iter_trending_records
+    """
+    payload = get_snapshot()
+    if payload is None and settings.REFRESH_BY_BEAT:
+        payload = pending_trending_payload()
+    if payload is not None:
+        yield {"type": "summary", **payload}
+        return
 
-        # Add GitHub repos (adjust limit based on what other APIs returned)
-        github_limit = (
-            6
-            if (reddit_posts and hackernews_stories)
-            else 8 if (reddit_posts or hackernews_stories) else 15
-        )
-        for repo in trending_repos[:github_limit]:
-            trending_topics.append(
-                {
-                    "id": f"github_{repo['id']}",
-                    "keyword": repo["name"],
-                    "platform": "GitHub",
-                    "trend_score": min(repo["stars"] / 10, 100),
-                    "posts_count": repo["forks"],
-                    "description": (
-                        repo["description"][:100] + "..."
-                        if len(repo["description"]) > 100
-                        else repo["description"]
-                    ),
-                    "language": repo["language"],
-                    "url": repo["url"],
-                    "stars": repo["stars"],
-                    "type": "repository",
-                }
-            )
+    try:
+        with shared_state.updating():
+            for record in iter_trending_records():
+                if record["type"] == "summary":
+                    store_snapshot({k: v for k, v in record.items() if k != "type"})
+                yield record
+    except Exception as e:
+        logger.error(f"Error streaming trending data: {str(e)}")
+        yield {
+            "type": "error",
+            "error": "Failed to fetch trending data",
+            "message": str(e),
+        }
 
-        # Add Reddit posts if available
-        reddit_limit = 5 if hackernews_stories else 7
-        for post in reddit_posts[:reddit_limit]:
-            trending_topics.append(
-                {
-                    "id": f"reddit_{post['id']}",
-                    "keyword": (
-                        post["title"][:50] + "..."
-                        if len(post["title"]) > 50
-                        else post["title"]
-                    ),
-                    "platform": "Reddit",
-                    "trend_score": min(post["score"] / 5, 100),
-                    "posts_count": post["num_comments"],
-                    "description": post.get(
-                        "selftext", f"Discussion in r/{post['subreddit']}"
-                    ),
-                    "language": post.get("flair_text", "Discussion"),
-                    "url": post["url"],
-                    "score": post["score"],
-                    "subreddit": post["subreddit"],
-                    "type": "discussion",
-                }
-            )
 
-        # Add Hacker News stories if available
-        for story in hackernews_stories[:4]:
-            trending_topics.append(
-                {
-                    "id": f"hackernews_{story['id']}",
-                    "keyword": (
-                        story["title"][:50] + "..."
-                        if len(story["title"]) > 50
-                        else story["title"]
-                    ),
-                    "platform": "Hacker News",
-                    "trend_score": min(
-                        story["score"] / 3, 100
-                    ),  # HN scores are generally lower
-                    "posts_count": story["descendants"],
-                    "description": f"Tech news story by {story['by']}",
-                    "language": "Tech News",
-                    "url": (
-                        story["url"]
-                        if story["url"]
-                        else f"https://news.ycombinator.com/item?id={story['id']}"
-                    ),
-                    "score": story["score"],
-                    "author": story["by"],
-                    "type": "news",
-                }
-            )
+@api_view(["GET"])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer])
+def trending_topics(request):
+    """
+    Get trending topics from GitHub repositories, Reddit posts, and Hacker News stories
 
-        # Platform status with detailed status for all platforms
-        reddit_status = {
-            "status": "connected" if reddit_posts and not reddit_error else "error",
-            "last_fetch": "just now" if reddit_posts else "failed",
-            "posts_count": len(reddit_posts),
-            "subreddits_monitored": 7 if reddit_posts else 0,
-        }
-        if reddit_error:
-            reddit_status["error"] = reddit_error[:100]
-
-        hackernews_status = {
-            "status": (
-                "connected" if hackernews_stories and not hackernews_error else "error"
-            ),
-            "last_fetch": "just now" if hackernews_stories else "failed",
-            "stories_count": len(hackernews_stories),
-        }
-        if hackernews_error:
-            hackernews_status["error"] = hackernews_error[:100]
-
-        platforms = {
-            "github": {
-                "status": "connected",
-                "last_fetch": "just now",
-                "repos_count": len(trending_repos),
-                "rate_limit_remaining": github_client.get_api_status()["rate_limit"][
-                    "remaining"
-                ],
-            },
-            "reddit": reddit_status,
-            "hackernews": hackernews_status,
-        }
+    With ?stream=1 or Accept: application/x-ndjson, each platform is streamed
+    as an NDJSON record as soon as it is fetched, followed by a summary record.
+    """
+    if wants_stream(request):
+        return ndjson_response(request, trending_records())
 
-        return Response(
-            {
-                "trending_topics": trending_topics,
-                "platforms": platforms,
-                "language_stats": language_stats,
-                "total_repos_analyzed": len(trending_repos),
-                "total_posts_analyzed": len(reddit_posts),
-                "total_stories_analyzed": len(hackernews_stories),
-                "last_updated": "just now",
-                "api_notes": {
-                    "reddit": (
-                        "Reddit API can be inconsistent" if reddit_error else None
-                    ),
-                    "hackernews": (
-                        "Hacker News API is generally reliable"
-                        if hackernews_error
-                        else None
-                    ),
-                },
-            }
-        )
+    try:
+        payload = get_snapshot()
+        if payload is None and settings.REFRESH_BY_BEAT:
+            # Beat publishes the snapshot (dashboard/tasks.py); fetching here
+            # would bypass its schedule and quota reserve
+            payload = pending_trending_payload()
+        elif payload is None:
+            with shared_state.updating():
+                payload = build_trending_payload()
+            store_snapshot(payload)
+
+        return Response(payload)
 
     except Exception as e:
         logger.error(f"Error fetching trending data: {str(e)}")
@@ -268,6 +178,75 @@ def trending_topics(request):
         )
 
 
+@api_view(["GET"])
+def trending_keywords(request):
+    """
+    Rising and most frequent keywords across recently fetched items
+    """
+    try:
+        limit = min(int(request.GET.get("limit", 20)), 100)
+        min_count = int(request.GET.get("min_count", 3))
+        if limit < 1 or min_count < 1:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"error": "'limit' and 'min_count' must be positive integers"}, status=400
+        )
+
+    shared_state.sync()
+    return Response(
+        {
+            "rising": keyword_tracker.rising(limit=limit, min_count=min_count),
+            "top": keyword_tracker.top(limit=limit),
+            "window": keyword_tracker.stats(),
+            "filters": {"limit": limit, "min_count": min_count},
+        }
+    )
+
+
+@api_view(["GET"])
+def search(request):
+    """
+    Full-text search over the repositories, posts and stories already fetched
+    """
+    query = request.GET.get("q", "").strip()
+    platform = request.GET.get("platform", "").strip().lower()
+    try:
+        limit = min(int(request.GET.get("limit", 20)), 100)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return Response({"error": "'limit' must be a positive integer"}, status=400)
+
+    if not query:
+        return Response({"error": "Missing search query 'q'"}, status=400)
+    if platform and platform not in PLATFORM_ALIASES:
+        return Response(
+            {
+                "error": f"Unknown platform '{platform}'",
+                "platforms": sorted(PLATFORM_ALIASES),
+            },
+            status=400,
+        )
+
+    shared_state.sync()
+    start = time.perf_counter()
+    results = search_index.search(
+        query, platform=PLATFORM_ALIASES.get(platform), limit=limit
+    )
+    took_ms = (time.perf_counter() - start) * 1000
+
+    return Response(
+        {
+            "results": results,
+            "count": len(results),
+            "indexed_documents": len(search_index),
+            "took_ms": round(took_ms, 2),
+            "filters": {"q": query, "platform": platform, "limit": limit},
+        }
+    )
+
+
 @api_view(["GET"])
 def github_repositories(request):
     """
@@ -276,24 +255,47 @@ def github_repositories(request):
     try:
         language = request.GET.get("language", "")
         days = int(request.GET.get("days", 7))
-        limit = int(request.GET.get("limit", 30))
+        sort = request.GET.get("sort", "stars")
+        enrich = request.GET.get("enrich", "") in ("1", "true")
+        try:
+            limit = min(int(request.GET.get("limit", 30)), 100)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response({"error": "'limit' must be a positive integer"}, status=400)
+
+        if sort == "velocity":
+            # With REFRESH_BY_BEAT the github refresh samples; otherwise the
+            # first request after the history interval does, and while it runs
+            # other workers read the history last published
+            if not settings.REFRESH_BY_BEAT and star_history.needs_sample(language):
+                with shared_state.updating(wait=False) as sampling:
+                    if sampling:
+                        sample_star_history(language, days)
+            shared_state.sync()
+            repos = star_history.top_by_velocity(limit=limit, language=language)
+        else:
+            repos = github_client.get_trending_repositories(
+                language=language, days=days, limit=limit
+            )
 
-        repos = github_client.get_trending_repositories(
-            language=language, days=days, limit=limit
-        )
+        response = {
+            "repositories": repos,
+            "count": len(repos),
+            "filters": {
+                "language": language or "all",
+                "days": days,
+                "limit": limit,
+                "sort": sort,
+                "enrich": enrich,
+            },
+            "github_api_status": github_client.get_api_status(),
+        }
+        if enrich:
+            response["repositories"] = github_enricher.enrich(repos)
+            response["graphql_rate_limit"] = github_enricher.get_rate_limit()
 
-        return Response(
-            {
-                "repositories": repos,
-                "count": len(repos),
-                "filters": {
-                    "language": language or "all",
-                    "days": days,
-                    "limit": limit,
-                },
-                "github_api_status": github_client.get_api_status(),
-            }
-        )
+        return Response(response)
 
     except Exception as e:
         logger.error(f"Error fetching GitHub repositories: {str(e)}")
@@ -331,10 +333,16 @@ def reddit_posts(request):
     """
     Get trending posts from Reddit programming communities
     """
+    try:
+        limit = min(int(request.GET.get("limit", 25)), 100)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return Response({"error": "'limit' must be a positive integer"}, status=400)
+
     try:
         subreddit = request.GET.get("subreddit", "programming")
         sort = request.GET.get("sort", "hot")
-        limit = int(request.GET.get("limit", 25))
 
         posts = reddit_client.get_subreddit_posts(
             subreddit=subreddit, sort=sort, limit=limit
@@ -0,0 +1,65 @@
+"""
+Worker warm-up run by the ASGI and WSGI entry points before serving traffic
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from . import shared_state
+from .api_clients import github_client, reddit_client, hackernews_client
+from .snapshot import load_snapshot
+
+logger = logging.getLogger(__name__)
+
+_state = {
+    "ready": False,
+    "snapshot_loaded": False,
+    "duration_ms": None,
+}
+
+
+def warm_up():
+    """
+    Load the latest snapshot and the shared stores, open pooled upstream connections
+
+    Runs synchronously so the server does not start accepting requests on this
+    worker until it is done. Failures are logged and never prevent startup.
+    """
+    start = time.perf_counter()
+
+    _state["snapshot_loaded"] = load_snapshot()
+    # Registers the shared stores before the URLconf imports them
+    from . import dedup, keywords, search, timeseries  # noqa: F401
+
+    shared_state.sync(force=True)
+
+    if settings.WARMUP_CONNECTIONS:
+        # A HEAD on each host only opens the pooled TLS connection: no API
+        # call, no rate-limit cost, even when every worker restarts together
+        for client in (github_client, reddit_client, hackernews_client):
+            try:
+                client.session.head(client.base_url, timeout=5)
+            except Exception as e:
+                logger.warning(
+                    f"Warm-up request failed for {type(client).__name__}: {str(e)}"
+                )
+
+    _state["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    _state["ready"] = True
+    logger.info(
+        f"Worker warm-up finished in {_state['duration_ms']}ms "
+        f"(snapshot loaded: {_state['snapshot_loaded']})"
+    )
+
+
+def is_ready() -> bool:
+    """
+    Whether this worker finished warm-up, workers that skip warm-up are always ready
+    """
+    return _state["ready"] or not settings.WARMUP_ON_STARTUP
+
+
+def get_warmup_state() -> dict:
+    return dict(_state, ready=is_ready())
@@ -0,0 +1,90 @@
+"""
+Gunicorn configuration: multi-process serving of project.asgi
+
+    gunicorn -c gunicorn.conf.py project.asgi:application
+
+Runs one uvicorn worker (uvloop event loop, httptools parser) per CPU core by
+default, so HTTP and WebSocket traffic is spread over every core instead of
+sharing daphne's single event loop. Daphne remains supported:
+
+    daphne -b 0.0.0.0 -p 8000 project.asgi:application
+
+but only the uvicorn workers push back on slow WebSocket clients, which the
+per-connection send queues of dashboard/consumers.py rely on to coalesce or
+drop updates (daphne buffers everything a slow client has not read).
+
+Workers share state only through Redis: the channel layer (WebSocket
+broadcasts reach sockets on every worker) and the cache (trending snapshot,
+throttles). The settings check in on_starting refuses to start several workers
+on per-process backends, where broadcasts and snapshots would silently stay
+inside one worker.
+
+Workers are recycled after GUNICORN_MAX_REQUESTS requests (with jitter, so
+they do not all restart together) to bound memory growth. A recycled worker
+stops accepting, finishes in-flight requests and closes its WebSockets within
+WS_GRACEFUL_SHUTDOWN seconds.
+
+Benchmark against daphne on the same host and settings, with Redis running
+and THROTTLE_ANON_RATE raised (e.g. 100000000/hour) so the load generator is
+not answered with 429s:
+
+    python manage.py loadtest_http --url http://127.0.0.1:8000/api/trending/ \\
+        --connections 200 --duration 30
+    python manage.py loadtest_websockets --layer redis \\
+        --url ws://127.0.0.1:8000/ws/dashboard/ --clients 5000
+
+and compare requests/s and latency, then WebSocket connect rate and broadcast
+delivery time. Pass --server-pid with the gunicorn master or daphne pid to
+record memory and CPU.
+"""
+
+import multiprocessing
+import os
+
+from decouple import config
+
+bind = config("GUNICORN_BIND", default="0.0.0.0:8000")
+
+# Async workers: one per core, not gunicorn's 2 x cores + 1 for sync workers
+workers = config("WEB_CONCURRENCY", default=multiprocessing.cpu_count(), cast=int)
+worker_class = "project.workers.DashboardUvicornWorker"
+
+max_requests = config("GUNICORN_MAX_REQUESTS", default=10000, cast=int)
+max_requests_jitter = config("GUNICORN_MAX_REQUESTS_JITTER", default=1000, cast=int)
+# Must exceed WS_GRACEFUL_SHUTDOWN so WebSockets close before the worker is killed
+graceful_timeout = config("GUNICORN_GRACEFUL_TIMEOUT", default=30, cast=int)
+timeout = config("GUNICORN_TIMEOUT", default=60, cast=int)
+keepalive = config("GUNICORN_KEEPALIVE", default=5, cast=int)
+
+# Not preloaded: each worker runs the warm-up in project/asgi.py and opens its
+# own Redis and upstream connections, which must not be shared across fork
+preload_app = False
+
+accesslog = config("GUNICORN_ACCESS_LOG", default="-")
+errorlog = "-"
+
+
+def on_starting(server):
+    """
+    Refuse to start several workers on process-local channel layer or cache
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    from django.conf import settings
+
+    if server.cfg.workers <= 1:
+        return
+
+    problems = []
+    layer = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+    if layer.endswith("InMemoryChannelLayer"):
+        problems.append(f"channel layer {layer}")
+    cache = settings.CACHES["default"]["BACKEND"]
+    if not cache.startswith("django_redis."):
+        problems.append(f"cache {cache}")
+
+    if problems:
+        raise RuntimeError(
+            f"{server.cfg.workers} workers need state shared through Redis, not a "
+            f"per-process {' or '.join(problems)}. Use production settings or set "
+            f"WEB_CONCURRENCY=1."
+        )
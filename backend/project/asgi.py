@@ -11,15 +11,30 @@ import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
-import dashboard.routing
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
 
+django_asgi_app = get_asgi_application()
+
+# Imported once apps are loaded: consumers read settings at import time
+import dashboard.routing  # noqa: E402
+
 application = ProtocolTypeRouter(
     {
-        "http": get_asgi_application(),
+        "http": django_asgi_app,
         "websocket": AuthMiddlewareStack(
             URLRouter(dashboard.routing.websocket_urlpatterns)
         ),
     }
 )
+
+# Preload the latest snapshot, upstream connections and the React shell before
+# serving traffic
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from dashboard.warmup import warm_up  # noqa: E402
+    from project.spa import spa_shell  # noqa: E402
+
+    warm_up()
+    spa_shell.warm_up()
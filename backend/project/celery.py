@@ -0,0 +1,18 @@
+"""
+Celery application running the refresh tasks of dashboard/tasks.py
+
+    celery -A project worker --beat
+
+Only the worker and beat import this module; the web processes never queue
+tasks, so Celery is not needed to serve the API.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+app = Celery("project")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -169,6 +169,12 @@ def get_security_settings():
 def get_redis_config():
     """Get Redis configuration based on environment"""
     env = get_environment()
+    # The pub/sub layer publishes each group message once per group, and every
+    # process fans it out to its local sockets
+    channel_layer_backend = config(
+        "CHANNEL_LAYER_BACKEND",
+        default="channels_redis.pubsub.RedisPubSubChannelLayer",
+    )
 
     if env == "production":
         return {
@@ -176,7 +182,7 @@ def get_redis_config():
             "RESULT_BACKEND": config("REDIS_URL", default="redis://localhost:6379"),
             "CHANNEL_LAYERS": {
                 "default": {
-                    "BACKEND": "channels_redis.core.RedisChannelLayer",
+                    "BACKEND": channel_layer_backend,
                     "CONFIG": {
                         "hosts": [
                             config("REDIS_URL", default="redis://localhost:6379")
@@ -191,7 +197,7 @@ def get_redis_config():
             "RESULT_BACKEND": "redis://localhost:6379",
             "CHANNEL_LAYERS": {
                 "default": {
-                    "BACKEND": "channels_redis.core.RedisChannelLayer",
+                    "BACKEND": channel_layer_backend,
                     "CONFIG": {
                         "hosts": [("127.0.0.1", 6379)],
                     },
@@ -205,9 +211,39 @@ def get_logging_config():
     env = get_environment()
 
     if env == "production":
+        log_file = "/var/log/cshub/django.log"
+        if config("LOG_QUEUE_ENABLED", default=True, cast=bool):
+            # Disk writes happen on a background thread behind a bounded queue
+            file_handler = {
+                "level": "INFO",
+                "class": "project.log_handlers.BackgroundFileHandler",
+                "filename": log_file,
+                "max_queue_size": config("LOG_QUEUE_SIZE", default=10000, cast=int),
+                "drop_policy": config("LOG_DROP_POLICY", default="drop_newest"),
+                "formatter": "verbose",
+                "filters": ["sample_client_info"],
+            }
+        else:
+            file_handler = {
+                "level": "INFO",
+                "class": "logging.FileHandler",
+                "filename": log_file,
+                "formatter": "verbose",
+                "filters": ["sample_client_info"],
+            }
+
         return {
             "version": 1,
             "disable_existing_loggers": False,
+            "filters": {
+                # Per-request INFO lines from the upstream API clients
+                "sample_client_info": {
+                    "()": "project.log_handlers.SamplingFilter",
+                    "name": "dashboard.api_clients",
+                    "rate": config("LOG_INFO_SAMPLE_RATE", default=1.0, cast=float),
+                    "max_level": "INFO",
+                },
+            },
             "formatters": {
                 "verbose": {
                     "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
@@ -219,12 +255,7 @@ def get_logging_config():
                 },
             },
             "handlers": {
-                "file": {
-                    "level": "INFO",
-                    "class": "logging.FileHandler",
-                    "filename": "/var/log/cshub/django.log",
-                    "formatter": "verbose",
-                },
+                "file": file_handler,
                 "console": {
                     "level": "ERROR",
                     "class": "logging.StreamHandler",
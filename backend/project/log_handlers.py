@@ -0,0 +1,139 @@
+"""
+Non-blocking logging handlers for CS Student Hub
+
+Request threads and the asyncio event loop only format records and push them
+onto a bounded in-memory queue; a background thread does the disk writes.
+"""
+
+import atexit
+import logging
+import queue
+import random
+import sys
+import threading
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+_STOP = object()
+
+
+class BackgroundFileHandler(logging.Handler):
+    """
+    File handler that writes from a background thread through a bounded queue
+
+    When the queue is full the record is dropped according to ``drop_policy``:
+    ``drop_newest`` discards the incoming record, ``drop_oldest`` discards the
+    oldest pending one. The number of dropped records is written to the log
+    file once the writer catches up.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_queue_size=10000,
+        drop_policy=DROP_NEWEST,
+        encoding=None,
+    ):
+        super().__init__()
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown log drop policy: {drop_policy}")
+
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self.filename = filename
+        self.encoding = encoding
+        self._stream = None
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._writer = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def emit(self, record):
+        try:
+            # Format on the calling thread so args and exc_info are captured now
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            if self.drop_policy == DROP_OLDEST:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(message)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            if message is _STOP:
+                break
+
+            # Drain whatever is already queued before flushing to disk
+            batch = [message]
+            try:
+                while len(batch) < 500:
+                    message = self._queue.get_nowait()
+                    if message is _STOP:
+                        self._write_batch(batch)
+                        return
+                    batch.append(message)
+            except queue.Empty:
+                pass
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        # emit() counts drops under the handler lock (Handler.handle holds it)
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            batch.append(f"WARNING log queue full, dropped {dropped} records")
+
+        try:
+            if self._stream is None:
+                self._stream = open(self.filename, "a", encoding=self.encoding)
+            self._stream.write("\n".join(batch) + "\n")
+            self._stream.flush()
+        except OSError as e:
+            # Never raise from the writer thread, report like logging does
+            sys.stderr.write(f"Log writer failed for {self.filename}: {e}\n")
+
+    def close(self):
+        if self._writer.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=1)
+            except queue.Full:
+                pass
+            self._writer.join(timeout=5)
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records at or below ``max_level``
+
+    Used to thin out the per-request INFO lines logged by the API clients,
+    warnings and errors always pass.
+    """
+
+    def __init__(self, rate=1.0, max_level="INFO", name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+        self.max_level = logging.getLevelName(max_level)
+
+    def filter(self, record):
+        if not super().filter(record):
+            return True
+        if record.levelno > self.max_level or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 import os
 from .environments import (
     get_database_config,
@@ -80,6 +80,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "dashboard.profiling.ProfilingMiddleware",  # On-demand view profiling
 ]
 
 ROOT_URLCONF = "project.urls"
@@ -189,38 +190,150 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "dashboard.throttling.GCRAAnonRateThrottle",
+        "dashboard.throttling.GCRAUserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "1000/hour", "user": "2000/hour"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": config("THROTTLE_ANON_RATE", default="1000/hour"),
+        "user": config("THROTTLE_USER_RATE", default="2000/hour"),
+    },
 }
 
+# Local fast path of the GCRA throttles (see dashboard/throttling.py): requests
+# a process may admit without Redis while a client is under HEADROOM of its burst
+THROTTLE_LOCAL_MAX_PENDING = config("THROTTLE_LOCAL_MAX_PENDING", default=10, cast=int)
+THROTTLE_LOCAL_SYNC_INTERVAL = config(
+    "THROTTLE_LOCAL_SYNC_INTERVAL", default=1.0, cast=float
+)
+THROTTLE_LOCAL_HEADROOM = config("THROTTLE_LOCAL_HEADROOM", default=0.5, cast=float)
+
 # Celery settings for background tasks
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+
+# Adaptive refresh of the upstream sources (see dashboard/scheduler.py): beat
+# only dispatches, each source runs at its own interval within these bounds
+REFRESH_TICK = config("REFRESH_TICK", default=60.0, cast=float)
 CELERY_BEAT_SCHEDULE = {
-    "refresh-github-data": {
-        "task": "dashboard.tasks.refresh_github_data",
-        "schedule": 3600.0,  # Every hour
-    },
-    "refresh-reddit-data": {
-        "task": "dashboard.tasks.refresh_reddit_data",
-        "schedule": 3600.0,  # Every hour
-    },
-    "refresh-hackernews-data": {
-        "task": "dashboard.tasks.refresh_hackernews_data",
-        "schedule": 3600.0,  # Every hour
+    "dispatch-refreshes": {
+        "task": "dashboard.tasks.dispatch_refreshes",
+        "schedule": REFRESH_TICK,
     },
 }
+REFRESH_SOURCES = {
+    "github": {"interval": 3600, "min_interval": 900, "max_interval": 7200},
+    "reddit": {"interval": 1800, "min_interval": 300, "max_interval": 3600},
+    "hackernews": {"interval": 600, "min_interval": 120, "max_interval": 1800},
+    "language_stats": {"interval": 3600, "min_interval": 3600, "max_interval": 86400},
+}
+# Share of items changed above which the interval shrinks, below which it grows
+REFRESH_FAST_CHANGE = config("REFRESH_FAST_CHANGE", default=0.3, cast=float)
+REFRESH_SLOW_CHANGE = config("REFRESH_SLOW_CHANGE", default=0.05, cast=float)
+REFRESH_SPEEDUP = 0.5
+REFRESH_SLOWDOWN = 1.5
+# Share of a rate limit left under which refreshes back off
+REFRESH_QUOTA_RESERVE = config("REFRESH_QUOTA_RESERVE", default=0.2, cast=float)
+# Beat owns the refreshes: /api/trending/ serves the snapshot they publish and
+# never fetches upstream itself. Off without a Celery worker (development)
+REFRESH_BY_BEAT = config("REFRESH_BY_BEAT", default=False, cast=bool)
 
 # API Configuration - External APIs
 GITHUB_TOKEN = config("GITHUB_TOKEN", default="")
+
+# GraphQL enrichment of repository details (enrich=1 on /api/github/repos/)
+GITHUB_GRAPHQL_URL = config(
+    "GITHUB_GRAPHQL_URL", default="https://api.github.com/graphql"
+)
+GITHUB_GRAPHQL_BATCH_SIZE = config("GITHUB_GRAPHQL_BATCH_SIZE", default=50, cast=int)
+GITHUB_ENRICH_TTL = config("GITHUB_ENRICH_TTL", default=3600, cast=int)
 REDDIT_CLIENT_ID = config("REDDIT_CLIENT_ID", default="")
 REDDIT_CLIENT_SECRET = config("REDDIT_CLIENT_SECRET", default="")
 REDDIT_USER_AGENT = config("REDDIT_USER_AGENT", default="cs-student-hub/1.0")
 
+# Per-connection WebSocket send queue bounds (see dashboard/consumers.py),
+# effective under the uvicorn workers, which wait for slow clients on send
+WS_MAX_PENDING_UPDATES = config("WS_MAX_PENDING_UPDATES", default=100, cast=int)
+WS_MAX_LAG_SECONDS = config("WS_MAX_LAG_SECONDS", default=30.0, cast=float)
+
+# Upstream HTTP connection pool size per API client
+UPSTREAM_POOL_MAXSIZE = config("UPSTREAM_POOL_MAXSIZE", default=10, cast=int)
+
+# Persistent upstream HTTP cache: off, on, record or replay (see dashboard/http_cache.py)
+HTTP_CACHE_MODE = config("HTTP_CACHE_MODE", default="off")
+HTTP_CACHE_PATH = config(
+    "HTTP_CACHE_PATH", default=os.path.join(BASE_DIR, "http_cache.sqlite3")
+)
+HTTP_CACHE_MAX_ENTRIES = config("HTTP_CACHE_MAX_ENTRIES", default=20000, cast=int)
+
+# Trending snapshot shared through the cache (see dashboard/snapshot.py), when
+# built by a request; the refresh tasks keep theirs longer (dashboard/tasks.py)
+TRENDING_SNAPSHOT_TTL = config("TRENDING_SNAPSHOT_TTL", default=300, cast=int)
+
+# Cross-platform ranking of /api/trending/ (see dashboard/ranking.py)
+TRENDING_RANKING = {
+    "limit": 15,
+    "max_per_platform": 8,
+    "platform_weights": {"GitHub": 1.0, "Reddit": 1.0, "Hacker News": 1.0},
+    "popularity_weight": 0.7,  # stars / points
+    "engagement_weight": 0.3,  # forks / comments
+    "half_life_hours": {"GitHub": 168.0, "Reddit": 12.0, "Hacker News": 8.0},
+}
+
+# Canonical URL index for cross-platform duplicates (see dashboard/dedup.py)
+CANONICAL_INDEX_MAX_ENTRIES = config(
+    "CANONICAL_INDEX_MAX_ENTRIES", default=50000, cast=int
+)
+
+# Trending keyword sketches (see dashboard/keywords.py)
+TRENDING_KEYWORDS = {
+    "window_seconds": config("KEYWORD_WINDOW_SECONDS", default=3600, cast=int),
+    "windows": config("KEYWORD_WINDOWS", default=24, cast=int),
+    "sketch_width": 4096,
+    "sketch_depth": 4,
+    "capacity": 500,  # heavy-hitter candidates kept per window
+}
+
+# In-memory full-text search over fetched items (see dashboard/search.py)
+SEARCH_INDEX_MAX_DOCUMENTS = config(
+    "SEARCH_INDEX_MAX_DOCUMENTS", default=50000, cast=int
+)
+
+# Repositories aggregated into /api/github/languages/ (one search call per 100)
+LANGUAGE_STATS_REPOS = config("LANGUAGE_STATS_REPOS", default=300, cast=int)
+
+# Search result pages fetched concurrently (search API allows 30 calls/minute)
+GITHUB_SEARCH_CONCURRENCY = config("GITHUB_SEARCH_CONCURRENCY", default=4, cast=int)
+
+# Subreddit listings read concurrently by RedditAPIClient.iter_listings
+REDDIT_LISTING_CONCURRENCY = config("REDDIT_LISTING_CONCURRENCY", default=4, cast=int)
+
+# Per-repository star history for sort=velocity (see dashboard/timeseries.py)
+STAR_HISTORY_MAX_REPOS = config("STAR_HISTORY_MAX_REPOS", default=20000, cast=int)
+STAR_HISTORY_WINDOW = config("STAR_HISTORY_WINDOW", default=48, cast=int)
+STAR_HISTORY_MIN_INTERVAL = config("STAR_HISTORY_MIN_INTERVAL", default=300, cast=int)
+STAR_HISTORY_MAX_AGE_HOURS = config(
+    "STAR_HISTORY_MAX_AGE_HOURS", default=72.0, cast=float
+)
+# Language filters sampled besides all languages; others read the history only
+STAR_HISTORY_LANGUAGES = config(
+    "STAR_HISTORY_LANGUAGES", default="python,javascript,typescript,go,rust", cast=Csv()
+)
+
+# Star history, search index, keyword sketches and URL index are built by
+# refreshes and shared through the cache (see dashboard/shared_state.py):
+# seconds between version checks, and the longest a refresh holds the lock
+SHARED_STATE_SYNC_INTERVAL = config(
+    "SHARED_STATE_SYNC_INTERVAL", default=2.0, cast=float
+)
+SHARED_STATE_LOCK_TIMEOUT = config("SHARED_STATE_LOCK_TIMEOUT", default=120, cast=int)
+
+# Worker warm-up before accepting traffic (see dashboard/warmup.py and the
+# SPA shell in project/spa.py)
+WARMUP_ON_STARTUP = config("WARMUP_ON_STARTUP", default=is_production(), cast=bool)
+WARMUP_CONNECTIONS = config("WARMUP_CONNECTIONS", default=True, cast=bool)
+
 # Cache configuration
 if is_production():
     CACHES = {
@@ -240,6 +353,16 @@ else:
         }
     }
 
+# Per-process tier in front of the shared cache (see dashboard/tiered_cache.py)
+LOCAL_CACHE_MAXSIZE = config("LOCAL_CACHE_MAXSIZE", default=256, cast=int)
+LOCAL_CACHE_TTL = config("LOCAL_CACHE_TTL", default=60.0, cast=float)
+
+# React shell served by the catch-all route (see project/spa.py); short shared
+# cache lifetime so a deploy reaches CDN users within minutes
+SPA_SHELL_CACHE_CONTROL = config(
+    "SPA_SHELL_CACHE_CONTROL", default="public, max-age=0, s-maxage=300"
+)
+
 # Session configuration
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
@@ -271,6 +394,16 @@ if is_production():
     # Use S3 for media files in production
     DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
 
+# Profiling of dashboard API views (see dashboard/profiling.py), off unless
+# DEBUG; staff users can then force a capture with the "X-Profile: 1" header
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=DEBUG, cast=bool)
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_DIR = config("PROFILING_DIR", default=os.path.join(BASE_DIR, "profiles"))
+PROFILING_MAX_CAPTURES = config("PROFILING_MAX_CAPTURES", default=50, cast=int)
+PROFILING_TRACEMALLOC_FRAMES = config(
+    "PROFILING_TRACEMALLOC_FRAMES", default=10, cast=int
+)
+
 # Health check endpoint
 HEALTH_CHECK_ENABLED = True
 
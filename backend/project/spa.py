@@ -0,0 +1,174 @@
+"""
+In-memory, precompressed serving of the React shell (index.html)
+
+Every URL not matched by the API or admin is a client-side route of the React
+app and gets the same index.html. It is read once, compressed once (gzip, and
+brotli when the ``brotli`` package is installed) and served from memory with
+strong ETags, so deep links cost no template render and no compression, and
+conditional requests from browsers and the CDN are answered with 304.
+
+The shell references content-hashed asset bundles, so it is cached briefly
+(SPA_SHELL_CACHE_CONTROL) and revalidated, which lets a deploy take effect
+without purging the CDN.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+SHELL_TEMPLATE = "index.html"
+
+
+class SPAShell:
+    """
+    index.html and its compressed variants, keyed by content coding
+    """
+
+    def __init__(self, template_name: str = SHELL_TEMPLATE):
+        self.template_name = template_name
+        self.path: Optional[str] = None
+        self.mtime: Optional[float] = None
+        # coding -> (body, etag), "identity" is the uncompressed file
+        self.variants: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Read the shell from the template directories and precompress it
+        """
+        # Same lookup as TemplateView, so the file served does not change
+        path = get_template(self.template_name).origin.name
+        with open(path, "rb") as f:
+            body = f.read()
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        variants = {"identity": (body, f'"{digest}"')}
+        variants["gzip"] = (gzip.compress(body, 9, mtime=0), f'"{digest}-gzip"')
+        if brotli is not None:
+            variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+        self.variants = variants
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        logger.info(
+            f"Loaded SPA shell {path}: "
+            + ", ".join(f"{coding} {len(b)}B" for coding, (b, _) in variants.items())
+        )
+
+    def warm_up(self) -> bool:
+        """
+        Load before serving traffic, warn when there is no frontend build
+
+        Called by the ASGI and WSGI entry points, so the shell is compressed at
+        startup rather than on the first page view.
+        """
+        try:
+            self.load()
+            return True
+        except (TemplateDoesNotExist, OSError) as e:
+            logger.warning(
+                "React build not found, client-side routes will answer 404 until "
+                f"`npm run build` is run in frontend/: {str(e)}"
+            )
+            return False
+
+    def ensure_loaded(self):
+        """
+        Load on first use; in DEBUG, reload when the build is rewritten
+        """
+        if self.variants and not settings.DEBUG:
+            return
+        with self._lock:
+            if self.variants and not self._changed():
+                return
+            try:
+                self.load()
+            except (TemplateDoesNotExist, OSError) as e:
+                self.variants = {}
+                raise Http404(
+                    "React build not found, run `npm run build` in frontend/"
+                ) from e
+
+    def _changed(self) -> bool:
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return True
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """
+        Best available content coding for an Accept-Encoding header
+        """
+        accepted = {}
+        for part in accept_encoding.split(","):
+            coding, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip().lower()] = quality
+
+        for coding in ("br", "gzip"):
+            if coding in self.variants and accepted.get(coding, 0) > 0:
+                return coding
+        return "identity"
+
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+
+spa_shell = SPAShell()
+
+
+def _matches(if_none_match: str, etags) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return bool(candidates & etags)
+
+
+@require_safe
+def serve_shell(request):
+    """
+    Catch-all view returning the React shell for client-side routes
+    """
+    spa_shell.ensure_loaded()
+    coding = spa_shell.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    body, etag = spa_shell.variants[coding]
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match and _matches(if_none_match, spa_shell.etags()):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            b"" if request.method == "HEAD" else body,
+            content_type="text/html; charset=utf-8",
+        )
+        response["Content-Length"] = str(len(body))
+        if coding != "identity":
+            response["Content-Encoding"] = coding
+
+    response["ETag"] = etag
+    response["Cache-Control"] = settings.SPA_SHELL_CACHE_CONTROL
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -5,10 +5,11 @@ URL configuration for project project.
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.http import JsonResponse
-from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .spa import serve_shell
+
 
 def api_status(request):
     """API status endpoint"""
@@ -38,10 +39,8 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("dashboard.urls")),
     path("api/status/", api_status, name="api_status"),
-    # Serve React static files in production
-    re_path(
-        r"^.*$", TemplateView.as_view(template_name="index.html"), name="react_app"
-    ),
+    # React shell for client-side routes, precompressed in memory (see spa.py)
+    re_path(r"^.*$", serve_shell, name="react_app"),
 ]
 
 # Serve static files in development
@@ -0,0 +1,32 @@
+"""
+Gunicorn worker class serving project.asgi with uvicorn, uvloop and httptools
+
+Used by gunicorn.conf.py. Only gunicorn imports this module, so the uvicorn
+dependency is not needed to run daphne or the development server.
+"""
+
+from decouple import config
+from uvicorn.workers import UvicornWorker
+
+
+class DashboardUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker with the fast event loop and parsers forced on
+
+    Django's ASGI handler does not implement the lifespan protocol, so it is
+    switched off instead of logging an error on every worker boot. Open
+    WebSockets get WS_GRACEFUL_SHUTDOWN seconds to close when a worker is
+    recycled; dashboard clients reconnect to another worker.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "ws": "websockets",
+        "lifespan": "off",
+        "proxy_headers": True,
+        "server_header": False,
+        "timeout_graceful_shutdown": config(
+            "WS_GRACEFUL_SHUTDOWN", default=20, cast=int
+        ),
+    }
@@ -14,3 +14,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
 
 application = get_wsgi_application()
+
+# Preload the latest snapshot, upstream connections and the React shell before
+# serving traffic
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from dashboard.warmup import warm_up  # noqa: E402
+    from project.spa import spa_shell  # noqa: E402
+
+    warm_up()
+    spa_shell.warm_up()